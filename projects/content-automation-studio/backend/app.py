@@ -31,32 +31,70 @@ def index():
 
 @app.route('/api/health')
 def health_check():
+    """의존성 상태 (백그라운드 확인 결과를 메모리에서 바로 응답)"""
+    from utils.health import get_health_monitor
+    monitor = get_health_monitor()
+    details = monitor.snapshot()
     return jsonify({
         'status': 'healthy',
-        'services': {
-            'webdav': check_webdav_connection(),
-            'google_ai': check_google_ai_connection()
-        }
+        'ready': monitor.ready(),
+        'services': {name: bool(status and status['ok']) for name, status in details.items()},
+        'details': details
     })
 
-def check_webdav_connection():
-    """WebDAV 연결 상태 확인"""
-    try:
-        from utils.webdav import WebDAVManager
-        webdav = WebDAVManager()
-        webdav.connect()
-        return True
-    except:
-        return False
-
-def check_google_ai_connection():
-    """Google AI 연결 상태 확인"""
-    try:
-        from utils.ai_client import AIClient
-        ai_client = AIClient()
-        return ai_client.test_connection()
-    except:
-        return False
+@app.route('/api/health/live')
+def liveness_check():
+    """프로세스 생존 확인 (의존성 확인 없음)"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/api/health/ready')
+def readiness_check():
+    """모든 의존성이 마지막 확인에서 정상이면 200, 아니면 503"""
+    from utils.health import get_health_monitor
+    monitor = get_health_monitor()
+    ready = monitor.ready()
+    return jsonify({
+        'status': 'ready' if ready else 'not_ready',
+        'details': monitor.snapshot()
+    }), 200 if ready else 503
+
+@app.route('/api/ai-cache/stats')
+def ai_cache_stats():
+    from utils.ai_cache import get_response_cache
+    cache = get_response_cache()
+    return jsonify({
+        'enabled': cache is not None,
+        'stats': cache.stats() if cache else None
+    })
+
+@app.route('/api/asset-cache/stats')
+def asset_cache_stats():
+    from utils.asset_cache import get_asset_cache
+    cache = get_asset_cache()
+    return jsonify({
+        'enabled': cache is not None,
+        'stats': cache.stats() if cache else None
+    })
+
+@app.route('/api/render-cache/stats')
+def render_cache_stats():
+    from utils.render_cache import get_render_cache
+    cache = get_render_cache()
+    return jsonify({
+        'enabled': cache is not None,
+        'stats': cache.stats() if cache else None
+    })
+
+@app.route('/api/render-queue/stats')
+def render_queue_stats():
+    """렌더 슬롯/대기열 상태와 최근 평균 대기·실행 시간"""
+    from utils.render_jobs import get_job_queue
+    return jsonify(get_job_queue(start_workers=False).stats())
+
+@app.route('/api/trend-cache/stats')
+def trend_cache_stats():
+    from utils.trend_store import get_trend_store
+    return jsonify(get_trend_store().stats())
 
 # API 라우트 임포트
 try:
@@ -82,6 +120,23 @@ except ImportError as e:
         publisher = None
         auth = None
 
+def start_render_workers():
+    """렌더 작업 워커 시작 (재시작 전에 대기 중이던 작업도 이어서 처리)"""
+    try:
+        from utils.render_jobs import get_job_queue
+        get_job_queue()
+    except Exception as e:
+        print(f"❌ 렌더 워커 시작 실패: {e}")
+
+start_render_workers()
+
+# 의존성 상태 백그라운드 확인 시작
+try:
+    from utils.health import get_health_monitor
+    get_health_monitor()
+except Exception as e:
+    print(f"❌ 상태 확인 시작 실패: {e}")
+
 if __name__ == '__main__':
     port = int(os.environ.get('PORT', 5000))
     app.run(debug=False, host='0.0.0.0', port=port)
\ No newline at end of file
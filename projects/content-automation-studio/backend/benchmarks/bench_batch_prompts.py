@@ -0,0 +1,87 @@
+"""배치 프롬프트 vs 세그먼트별 호출 벤치마크 (로컬 가짜 모델 사용)
+
+실행: cd backend && python benchmarks/bench_batch_prompts.py --segments 10 30 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.ai_client import AIClient
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeGenerativeModel:
+    """요청당 고정 지연 + 출력 토큰당 지연을 흉내내는 가짜 Gemini 모델"""
+
+    def __init__(self, request_latency=0.6, token_latency=0.004, tokens_per_item=60, corrupt_rate=0.0):
+        self.request_latency = request_latency
+        self.token_latency = token_latency
+        self.tokens_per_item = tokens_per_item
+        self.corrupt_rate = corrupt_rate
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None, request_options=None):
+        with self._lock:
+            self.calls += 1
+
+        marker = 'TASKS_JSON:'
+        if marker in prompt:
+            tasks = json.loads(prompt[prompt.index(marker) + len(marker):].strip())
+            items = []
+            for task in tasks:
+                if random.random() < self.corrupt_rate:
+                    items.append({'id': task['id'], 'text': ''})  # 파싱 실패 항목
+                else:
+                    items.append({'id': task['id'], 'text': f"A professional photograph of scene {task['id']}"})
+            text = json.dumps(items)
+            tokens = self.tokens_per_item * len(tasks)
+        else:
+            text = 'A professional photograph of a single scene'
+            tokens = self.tokens_per_item
+
+        time.sleep(self.request_latency + tokens * self.token_latency)
+        return FakeResponse(text)
+
+
+def run(mode, segment_count, corrupt_rate):
+    model = FakeGenerativeModel(corrupt_rate=corrupt_rate)
+    client = AIClient('fake-model', model=model)
+    prompts = [f"Scene {i + 1}/{segment_count} context: sample segment {i}" for i in range(segment_count)]
+
+    started = time.perf_counter()
+    if mode == 'batch':
+        results = client.generate_batch(prompts, max_length=200, use_cache=False)
+    else:
+        results = client.generate_texts(prompts, max_length=200, use_cache=False)
+    elapsed = time.perf_counter() - started
+
+    failed = sum(1 for result in results if not result['success'])
+    return elapsed, model.calls, failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--segments', type=int, nargs='+', default=[10, 30, 100])
+    parser.add_argument('--corrupt-rate', type=float, default=0.05)
+    args = parser.parse_args()
+
+    print(f"{'segments':>8} {'mode':>9} {'seconds':>9} {'requests':>9} {'failed':>7}")
+    for segment_count in args.segments:
+        for mode in ('parallel', 'batch'):
+            elapsed, calls, failed = run(mode, segment_count, args.corrupt_rate)
+            print(f"{segment_count:>8} {mode:>9} {elapsed:>9.2f} {calls:>9} {failed:>7}")
+
+
+if __name__ == '__main__':
+    main()
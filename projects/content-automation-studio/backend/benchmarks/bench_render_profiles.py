@@ -0,0 +1,77 @@
+"""렌더 프로필별 인코딩 속도 벤치마크 (출력 1분당 인코딩 초)
+
+샘플 자산(크기가 제각각인 이미지 + AAC(ADTS/M4A)/MP3 오디오)을 ffmpeg lavfi로 생성해 사용한다.
+실행: cd backend && python benchmarks/bench_render_profiles.py --images 12 --duration-per-image 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.render_profiles import RENDER_PROFILES, build_slideshow_command
+
+# 해상도가 섞인 입력 이미지
+SAMPLE_SIZES = ['1920x1080', '1080x1920', '800x600', '4000x3000', '640x640']
+
+
+def run(cmd):
+    subprocess.run(cmd, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+
+def make_samples(work_dir, image_count, audio_seconds, audio_format):
+    images = []
+    for i in range(image_count):
+        path = os.path.join(work_dir, f"sample_{i:03d}.jpg")
+        size = SAMPLE_SIZES[i % len(SAMPLE_SIZES)]
+        run(['ffmpeg', '-y', '-f', 'lavfi', '-i', f'testsrc2=size={size}:rate=1', '-frames:v', '1', path])
+        images.append(path)
+
+    audio_path = os.path.join(work_dir, f"sample_audio.{audio_format}")
+    codec = ['-c:a', 'aac'] if audio_format in ('aac', 'm4a') else ['-c:a', 'libmp3lame']
+    run(['ffmpeg', '-y', '-f', 'lavfi', '-i', f'sine=frequency=440:duration={audio_seconds}', *codec, audio_path])
+    return images, audio_path
+
+
+def output_duration(path):
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration',
+         '-of', 'default=noprint_wrappers=1:nokey=1', path],
+        capture_output=True, text=True
+    )
+    return float(result.stdout.strip() or 0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--images', type=int, default=12)
+    parser.add_argument('--duration-per-image', type=float, default=5)
+    parser.add_argument('--audio-format', choices=['aac', 'm4a', 'mp3'], default='aac')
+    parser.add_argument('--profiles', nargs='+', default=list(RENDER_PROFILES))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        audio_seconds = args.images * args.duration_per_image
+        images, audio_path = make_samples(work_dir, args.images, audio_seconds, args.audio_format)
+
+        print(f"{'profile':>9} {'encode s':>9} {'output s':>9} {'s/out-min':>10} {'MB':>7}")
+        for name in args.profiles:
+            output_path = os.path.join(work_dir, f"out_{name}.mp4")
+            cmd = build_slideshow_command(
+                images, audio_path, output_path, args.duration_per_image, RENDER_PROFILES[name], work_dir
+            )
+            started = time.perf_counter()
+            run(cmd)
+            elapsed = time.perf_counter() - started
+
+            duration = output_duration(output_path)
+            per_minute = elapsed / (duration / 60) if duration else float('nan')
+            size_mb = os.path.getsize(output_path) / (1024 * 1024)
+            print(f"{name:>9} {elapsed:>9.2f} {duration:>9.1f} {per_minute:>10.2f} {size_mb:>7.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""단일 프로세스 렌더링 vs 분할 병렬 렌더링 비교 (속도 + 결과 일치 검사)
+
+같은 샘플 자산으로 두 방식을 렌더링한 뒤 전체 길이, 영상/오디오 스트림 길이,
+프레임 수, 첫 오디오 패킷 시작 시각(A/V 싱크)을 ffprobe로 비교한다.
+차이가 한 프레임을 넘으면 종료 코드 1.
+실행: cd backend && python benchmarks/bench_segmented_render.py --images 12 --profile standard
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_render_profiles import make_samples, run
+from utils.render_profiles import RENDER_PROFILES, build_slideshow_command
+from utils.renderer import render_segmented
+
+
+def probe(path):
+    """스트림별 길이/프레임 수/시작 시각"""
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-count_packets', '-show_entries',
+         'format=duration:stream=codec_type,duration,start_time,nb_read_packets',
+         '-of', 'json', path],
+        capture_output=True, text=True, check=True
+    )
+    data = json.loads(result.stdout)
+    streams = {stream['codec_type']: stream for stream in data['streams']}
+    return {
+        'duration': float(data['format']['duration']),
+        'video_duration': float(streams['video']['duration']),
+        'video_frames': int(streams['video']['nb_read_packets']),
+        'audio_duration': float(streams['audio']['duration']),
+        'av_offset': float(streams['audio']['start_time']) - float(streams['video']['start_time'])
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--images', type=int, default=12)
+    parser.add_argument('--duration-per-image', type=float, default=5)
+    parser.add_argument('--audio-format', choices=['aac', 'm4a', 'mp3'], default='aac')
+    parser.add_argument('--profile', choices=list(RENDER_PROFILES), default='standard')
+    args = parser.parse_args()
+    profile = RENDER_PROFILES[args.profile]
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        audio_seconds = args.images * args.duration_per_image
+        images, audio_path = make_samples(work_dir, args.images, audio_seconds, args.audio_format)
+
+        single_path = os.path.join(work_dir, 'single.mp4')
+        started = time.perf_counter()
+        run(build_slideshow_command(images, audio_path, single_path, args.duration_per_image, profile, work_dir))
+        single_seconds = time.perf_counter() - started
+
+        segmented_path = os.path.join(work_dir, 'segmented.mp4')
+        started = time.perf_counter()
+        returncode, stderr, _ = render_segmented(
+            images, audio_path, segmented_path, args.duration_per_image, profile, work_dir
+        )
+        segmented_seconds = time.perf_counter() - started
+        if returncode != 0:
+            print(stderr[-2000:])
+            sys.exit(1)
+
+        single, segmented = probe(single_path), probe(segmented_path)
+        print(f"{'':>16} {'single':>10} {'segmented':>10}")
+        print(f"{'encode s':>16} {single_seconds:>10.2f} {segmented_seconds:>10.2f}")
+        for key in single:
+            print(f"{key:>16} {single[key]:>10.3f} {segmented[key]:>10.3f}")
+
+        tolerance = 1 / profile['fps']
+        mismatches = [
+            key for key in single
+            if key != 'video_frames' and abs(single[key] - segmented[key]) > tolerance
+        ]
+        if abs(single['video_frames'] - segmented['video_frames']) > 1:
+            mismatches.append('video_frames')
+        if mismatches:
+            print(f"❌ 불일치: {', '.join(mismatches)} (허용 오차 {tolerance:.3f}s)")
+            sys.exit(1)
+        print(f"✅ 일치 (허용 오차 {tolerance:.3f}s), 속도 향상 {single_seconds / segmented_seconds:.2f}x")
+
+
+if __name__ == '__main__':
+    main()
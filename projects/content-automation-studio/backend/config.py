@@ -10,10 +10,80 @@ class Config:
     GEMINI_API_KEY = os.getenv('GEMINI_API_KEY')
     VERTEX_AI_API_KEY = os.getenv('VERTEX_AI_API_KEY')
 
+    # AI 응답 캐시 설정
+    AI_CACHE_ENABLED = os.getenv('AI_CACHE_ENABLED', 'True').lower() == 'true'
+    AI_CACHE_TTL = int(os.getenv('AI_CACHE_TTL', 3600))  # 초
+    AI_CACHE_MAX_BYTES = int(os.getenv('AI_CACHE_MAX_BYTES', 32 * 1024 * 1024))  # 32MB
+    AI_CACHE_DB_PATH = os.getenv('AI_CACHE_DB_PATH', '')  # 비워두면 디스크 캐시 사용 안 함
+
+    # AI 동시 호출 설정
+    AI_FANOUT_CONCURRENCY = int(os.getenv('AI_FANOUT_CONCURRENCY', 8))
+    AI_CALL_TIMEOUT = float(os.getenv('AI_CALL_TIMEOUT', 20))  # 호출당 제한 시간 (초)
+    AI_BATCH_SIZE = int(os.getenv('AI_BATCH_SIZE', 10))  # 배치 요청 하나에 묶을 항목 수
+    AI_BATCH_MAX_OUTPUT_TOKENS = int(os.getenv('AI_BATCH_MAX_OUTPUT_TOKENS', 2048))
+    SLIDESHOW_PROMPT_MODE = os.getenv('SLIDESHOW_PROMPT_MODE', 'parallel')  # parallel, batch
+    SLIDESHOW_MAX_IMAGES = int(os.getenv('SLIDESHOW_MAX_IMAGES', 100))  # /generate-slideshow image_count 최대값
+    SLIDESHOW_MIN_SLIDE_SECONDS = float(os.getenv('SLIDESHOW_MIN_SLIDE_SECONDS', 1.0))  # 세그먼트 표시 시간 최소값 (빈 세그먼트 포함)
+    SLIDESHOW_MAX_SLIDE_SECONDS = float(os.getenv('SLIDESHOW_MAX_SLIDE_SECONDS', 600))  # create-video 이미지별 표시 시간 최대값
+    TTS_LANGUAGE = os.getenv('TTS_LANGUAGE', 'auto')  # 발화 시간 추정 언어: auto, ko, ja, zh, en
+    TTS_SPEAKING_RATE = float(os.getenv('TTS_SPEAKING_RATE', 1.0))  # TTS 말하기 속도 배율 (1.0 = 기본)
+
+    # 트렌드 데이터
+    TREND_PROVIDER = os.getenv('TREND_PROVIDER', 'simulated')  # simulated, file
+    TREND_DATA_DIR = os.getenv('TREND_DATA_DIR', 'data/trends')  # file 제공자: {geo}/{keyword}.csv
+    TREND_CACHE_TTL = int(os.getenv('TREND_CACHE_TTL', 3600))  # 초
+    TREND_CACHE_MAX_ENTRIES = int(os.getenv('TREND_CACHE_MAX_ENTRIES', 4096))
+    TREND_ROLLING_WINDOW = int(os.getenv('TREND_ROLLING_WINDOW', 7))  # 이동 평균 기간 (일)
+    TREND_BULK_MAX_KEYWORDS = int(os.getenv('TREND_BULK_MAX_KEYWORDS', 1000))  # /analyze/bulk 요청당 최대 키워드 수
+
+    # 렌더 작업 큐 설정
+    RENDER_WORKERS = int(os.getenv('RENDER_WORKERS', 0))  # 같은 작업 DB를 쓰는 모든 프로세스의 동시 렌더 수 (0이면 컨테이너 CPU 할당량 / RENDER_THREADS_PER_ENCODER, 값을 주면 그 수로 고정)
+    RENDER_THREADS_PER_ENCODER = int(os.getenv('RENDER_THREADS_PER_ENCODER', 2))  # 렌더 작업 하나가 쓰는 ffmpeg 인코더 스레드 수
+    RENDER_RESERVED_INTERACTIVE_SLOTS = int(os.getenv('RENDER_RESERVED_INTERACTIVE_SLOTS', 1))  # batch 작업이 쓸 수 없는 슬롯 수
+    RENDER_MAX_QUEUED = int(os.getenv('RENDER_MAX_QUEUED', 50))  # 대기 작업이 이만큼이면 429 (0이면 제한 없음)
+    RENDER_MAX_QUEUED_PER_USER = int(os.getenv('RENDER_MAX_QUEUED_PER_USER', 10))  # 사용자별 대기 작업 한도 (0이면 제한 없음)
+    RENDER_DEFAULT_RUN_SECONDS = int(os.getenv('RENDER_DEFAULT_RUN_SECONDS', 60))  # 완료 기록이 없을 때 Retry-After 추정용 렌더 시간
+    RENDER_WORKERS_IN_WEB = os.getenv('RENDER_WORKERS_IN_WEB', 'True').lower() == 'true'  # False면 render_worker.py로 별도 실행
+    RENDER_JOB_DB_PATH = os.getenv('RENDER_JOB_DB_PATH', 'data/render_jobs.sqlite3')
+    RENDER_JOB_STALE_SECONDS = int(os.getenv('RENDER_JOB_STALE_SECONDS', 60))  # 생존 신호가 끊긴 작업 재시도 기준
+    RENDER_DEFAULT_PROFILE = os.getenv('RENDER_DEFAULT_PROFILE', 'standard')  # draft, standard, high
+    RENDER_MODE = os.getenv('RENDER_MODE', 'auto')  # single, segmented, auto
+    RENDER_SEGMENT_WORKERS = int(os.getenv('RENDER_SEGMENT_WORKERS', 0))  # 분할 렌더링 동시 클립 수 (0이면 CPU 코어 수)
+    RENDER_SEGMENT_MIN_IMAGES = int(os.getenv('RENDER_SEGMENT_MIN_IMAGES', 6))  # auto 모드에서 분할 렌더링을 쓰는 최소 이미지 수
+    RENDER_PROGRESS_INTERVAL = float(os.getenv('RENDER_PROGRESS_INTERVAL', 1.0))  # 진행 상황 저장/스트림 간격 (초)
+    RENDER_PROGRESS_STREAM_MAX_SECONDS = float(os.getenv('RENDER_PROGRESS_STREAM_MAX_SECONDS', 300))  # 진행 상황 스트림 최대 유지 시간 (초, 넘으면 timeout 이벤트)
+    RENDER_PROGRESS_KEEPALIVE = float(os.getenv('RENDER_PROGRESS_KEEPALIVE', 15))  # 변화가 없을 때 keep-alive 주석 간격 (초)
+    RENDER_CACHE_ENABLED = os.getenv('RENDER_CACHE_ENABLED', 'True').lower() == 'true'  # 같은 입력/파라미터 재요청 시 렌더링 생략
+    RENDER_CACHE_DB_PATH = os.getenv('RENDER_CACHE_DB_PATH', 'data/render_cache.sqlite3')
+
+    # 렌더 자산 다운로드 설정
+    ASSET_DOWNLOAD_CONCURRENCY = int(os.getenv('ASSET_DOWNLOAD_CONCURRENCY', 8))
+    ASSET_DOWNLOAD_TIMEOUT = float(os.getenv('ASSET_DOWNLOAD_TIMEOUT', 30))  # 연결/읽기 제한 시간 (초)
+    ASSET_DOWNLOAD_RETRIES = int(os.getenv('ASSET_DOWNLOAD_RETRIES', 2))
+    ASSET_DOWNLOAD_CHUNK_SIZE = int(os.getenv('ASSET_DOWNLOAD_CHUNK_SIZE', 256 * 1024))
+
+    # 원격 자산 로컬 캐시 설정 (URL + ETag/Last-Modified 기준)
+    ASSET_CACHE_ENABLED = os.getenv('ASSET_CACHE_ENABLED', 'True').lower() == 'true'
+    ASSET_CACHE_DIR = os.getenv('ASSET_CACHE_DIR', 'data/asset_cache')
+    ASSET_CACHE_MAX_BYTES = int(os.getenv('ASSET_CACHE_MAX_BYTES', 1024 * 1024 * 1024))  # 1GB
+    ASSET_CACHE_REVALIDATE_AFTER = int(os.getenv('ASSET_CACHE_REVALIDATE_AFTER', 300))  # 응답에 max-age/no-cache가 없을 때 이 시간이 지나면 조건부 요청으로 재검증 (초)
+
     # WebDAV 설정
     WEBDAV_URL = os.getenv('WEBDAV_URL', 'https://rausu.infini-cloud.net/dav')
     WEBDAV_USERNAME = os.getenv('WEBDAV_USERNAME', 'hhtsta')
     WEBDAV_PASSWORD = os.getenv('WEBDAV_PASSWORD', 'RXYf3uYhCbL9Ezwa')
+    WEBDAV_POOL_SIZE = int(os.getenv('WEBDAV_POOL_SIZE', 10))  # keep-alive 연결 풀 크기
+    WEBDAV_TIMEOUT = float(os.getenv('WEBDAV_TIMEOUT', 10))  # 메타데이터 요청 제한 시간 (초)
+    WEBDAV_TRANSFER_TIMEOUT = float(os.getenv('WEBDAV_TRANSFER_TIMEOUT', 120))  # 업로드/다운로드 제한 시간 (초)
+    WEBDAV_DEDUP_ENABLED = os.getenv('WEBDAV_DEDUP_ENABLED', 'False').lower() == 'true'  # 내용 해시 기반 중복 제거 저장
+    WEBDAV_DEDUP_DB_PATH = os.getenv('WEBDAV_DEDUP_DB_PATH', 'data/content_index.sqlite3')
+    WEBDAV_OBJECTS_ROOT = os.getenv('WEBDAV_OBJECTS_ROOT', '/objects')
+    FILES_INDEX_DB_PATH = os.getenv('FILES_INDEX_DB_PATH', 'data/file_index.sqlite3')  # GET /files 메타데이터 색인
+    FILES_INDEX_TTL = int(os.getenv('FILES_INDEX_TTL', 300))  # 폴더 목록을 다시 PROPFIND 하는 주기 (초)
+
+    # 상태 확인 설정
+    HEALTH_CHECK_INTERVAL = float(os.getenv('HEALTH_CHECK_INTERVAL', 60))  # 백그라운드 확인 주기 (초)
+    HEALTH_CHECK_TIMEOUT = float(os.getenv('HEALTH_CHECK_TIMEOUT', 5))
 
     # Flask 설정
     SECRET_KEY = os.getenv('SECRET_KEY', 'dev-secret-key-change-in-production')
@@ -23,5 +93,11 @@ class Config:
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     UPLOAD_EXTENSIONS = ['.jpg', '.jpeg', '.png', '.gif', '.mp4', '.mov', '.avi']
 
+    # 재개 가능한 청크 업로드 설정 (청크 하나는 MAX_CONTENT_LENGTH 이하)
+    UPLOAD_CHUNK_DIR = os.getenv('UPLOAD_CHUNK_DIR', 'data/uploads')
+    UPLOAD_CHUNK_SIZE = int(os.getenv('UPLOAD_CHUNK_SIZE', 8 * 1024 * 1024))  # 8MB
+    UPLOAD_MAX_SIZE = int(os.getenv('UPLOAD_MAX_SIZE', 2 * 1024 * 1024 * 1024))  # 2GB
+    UPLOAD_SESSION_TTL = int(os.getenv('UPLOAD_SESSION_TTL', 24 * 3600))  # 미완료 세션 보관 시간 (초)
+
     # Railway 설정
     PORT = int(os.getenv('PORT', 5000))
\ No newline at end of file
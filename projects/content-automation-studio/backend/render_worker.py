@@ -0,0 +1,29 @@
+"""렌더 작업 전용 워커 프로세스
+
+웹 프로세스와 별도로 렌더 워커를 띄울 때 사용 (RENDER_WORKERS_IN_WEB=False).
+실행: cd backend && RENDER_WORKERS=4 python render_worker.py
+"""
+import signal
+import threading
+from config import Config
+from utils.render_jobs import get_job_queue
+
+
+def main():
+    queue = get_job_queue(start_workers=True)
+    stopped = threading.Event()
+
+    def stop(signum, frame):
+        queue.stop()
+        stopped.set()
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+
+    print(f"🎬 렌더 워커 시작 (slots={queue.workers}, threads/encoder={queue.threads_per_encoder}, db={Config.RENDER_JOB_DB_PATH})")
+    while not stopped.wait(1):
+        pass
+
+
+if __name__ == '__main__':
+    main()
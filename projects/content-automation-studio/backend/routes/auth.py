@@ -26,6 +26,20 @@ USERS = {
     }
 }
 
+def optional_user():
+    """Authorization 헤더의 유효한 토큰 사용자 이름 (토큰이 없거나 잘못되면 None, 401 응답 없음)"""
+    token = request.headers.get('Authorization')
+    if not token:
+        return None
+    if token.startswith('Bearer '):
+        token = token[7:]
+
+    try:
+        current_user = jwt.decode(token, SECRET_KEY, algorithms=['HS256'])['username']
+    except (jwt.InvalidTokenError, KeyError):
+        return None
+    return current_user if current_user in USERS else None
+
 def token_required(f):
     """JWT 토큰 검사 데코레이터"""
     @wraps(f)
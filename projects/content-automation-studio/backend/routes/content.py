@@ -1,8 +1,11 @@
-from flask import Blueprint, request, jsonify
-from utils.webdav import WebDAVManager
-from utils.ai_client import AIClient
-import tempfile
-import os
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from utils.webdav import get_webdav_manager
+from utils.ai_client import get_ai_client
+from utils.sse import format_sse, SSE_HEADERS
+from utils.chunked_upload import get_upload_store, UploadError
+from utils.file_index import get_file_index, SORT_COLUMNS
+from utils.multipart_stream import MultipartFileStream
+from config import Config
 
 content_bp = Blueprint('content', __name__)
 
@@ -16,21 +19,24 @@ def generate_blog():
 
     topic = data['topic']
     keywords = data.get('keywords', [])
+    use_cache = data.get('use_cache', True)
 
     try:
         # AI 클라이언트 초기화
-        ai_client = AIClient()
+        ai_client = get_ai_client()
 
-        # 블로그 글 생성
-        blog_result = ai_client.generate_blog_post(topic, keywords)
-
-        if not blog_result['success']:
-            return jsonify({'error': blog_result['error']}), 500
-
-        blog_content = blog_result['text']
+        # 블로그 글 생성 (본문 앞부분이 나오면 이미지 프롬프트 생성을 병행)
+        meta = {}
+        parts = []
+        image_prompt = None
+        for kind, value in ai_client.stream_blog_post_with_image_prompt(
+                topic, keywords, use_cache=use_cache, meta=meta):
+            if kind == 'token':
+                parts.append(value)
+            else:
+                image_prompt = value
 
-        # 이미지 프롬프트 생성
-        image_prompt = ai_client.generate_image_prompt(blog_content)
+        blog_content = ''.join(parts)
 
         # 결과 반환
         return jsonify({
@@ -38,72 +44,243 @@ def generate_blog():
             'blog_content': blog_content,
             'image_prompt': image_prompt,
             'topic': topic,
-            'keywords': keywords
+            'keywords': keywords,
+            'cached': meta.get('cached', False),
+            'timings': meta.get('timings', {})
         })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-@content_bp.route('/upload-file', methods=['POST'])
+@content_bp.route('/generate-blog/stream', methods=['POST'])
+def generate_blog_stream():
+    """블로그 글 생성 API (SSE 스트리밍)
+
+    이벤트 순서: token(여러 번) → image_prompt → done, 실패 시 error
+    """
+    data = request.get_json()
+
+    if not data or 'topic' not in data:
+        return jsonify({'error': 'Topic is required'}), 400
+
+    topic = data['topic']
+    keywords = data.get('keywords', [])
+    use_cache = data.get('use_cache', True)
+    ai_client = get_ai_client()
+
+    def events():
+        meta = {}
+        length = 0
+        try:
+            for kind, value in ai_client.stream_blog_post_with_image_prompt(
+                    topic, keywords, use_cache=use_cache, meta=meta):
+                if kind == 'token':
+                    length += len(value)
+                    yield format_sse('token', {'text': value})
+                else:
+                    yield format_sse('image_prompt', {'image_prompt': value})
+        except Exception as e:
+            yield format_sse('error', {'error': str(e)})
+            return
+
+        yield format_sse('done', {
+            'success': True,
+            'topic': topic,
+            'keywords': keywords,
+            'length': length,
+            'cached': meta.get('cached', False),
+            'timings': meta.get('timings', {})
+        })
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+@content_bp.route('/upload-file', methods=['POST', 'PUT'])
 def upload_file():
-    """파일 업로드 API"""
-    if 'file' not in request.files:
-        return jsonify({'error': 'No file provided'}), 400
+    """파일 업로드 API (임시 파일 없이 WebDAV로 바로 전송)
 
-    file = request.files['file']
-    if file.filename == '':
-        return jsonify({'error': 'No file selected'}), 400
+    multipart/form-data의 file 필드, 또는 요청 본문 자체(filename 쿼리 파라미터/X-Filename 헤더)를 받는다.
+    multipart는 request.files를 거치지 않고 요청 스트림에서 바로 읽으므로, file 필드 앞에 size 필드(바이트)를
+    보내면 Content-Length로 전송하고 없으면 chunked로 전송한다. 크기를 미리 알아야 하는 서버에는
+    원본 본문 업로드를 사용한다.
+    """
+    if request.mimetype == 'multipart/form-data':
+        try:
+            stream = MultipartFileStream(request.stream, request.content_type)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+
+        if not stream.filename:
+            return jsonify({'error': 'No file selected'}), 400
+        filename = stream.filename
+        content_length = stream.expected_size
+    else:
+        # 원본 본문 업로드: 요청 스트림을 그대로 WebDAV PUT 본문으로 사용
+        filename = request.args.get('filename') or request.headers.get('X-Filename')
+        if not filename:
+            return jsonify({'error': 'No file provided'}), 400
+        stream = request.stream
+        content_length = request.content_length
 
     try:
-        # 임시 파일 저장
-        with tempfile.NamedTemporaryFile(delete=False) as tmp_file:
-            file.save(tmp_file.name)
-
-            # WebDAV에 업로드
-            webdav = WebDAVManager()
-            upload_result = webdav.upload_file(tmp_file.name)
-
-            # 임시 파일 삭제
-            os.unlink(tmp_file.name)
-
-            if upload_result['success']:
-                return jsonify({
-                    'success': True,
-                    'url': upload_result['url'],
-                    'remote_path': upload_result['remote_path'],
-                    'filename': file.filename,
-                    'size': os.path.getsize(tmp_file.name)
-                })
-            else:
-                return jsonify({'error': upload_result['error']}), 500
+        webdav = get_webdav_manager()
+        upload_result = webdav.upload_stream(
+            stream, filename, content_length=content_length,
+            expected_sha256=request.headers.get('X-Content-SHA256')
+        )
+
+        if upload_result['success']:
+            return jsonify({
+                'success': True,
+                'url': upload_result['url'],
+                'remote_path': upload_result['remote_path'],
+                'filename': filename,
+                'size': upload_result['size'],
+                'sha256': upload_result['sha256'],
+                'deduplicated': upload_result.get('deduplicated', False)
+            })
+        else:
+            return jsonify({'error': upload_result['error']}), upload_result.get('status', 500)
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+@content_bp.route('/uploads', methods=['POST'])
+def init_chunked_upload():
+    """재개 가능한 청크 업로드 시작 (filename, size, chunk_size 선택)"""
+    data = request.get_json()
+
+    if not data or 'filename' not in data or 'size' not in data:
+        return jsonify({'error': 'Filename and size are required'}), 400
+
+    try:
+        upload = get_upload_store().create(data['filename'], data['size'], data.get('chunk_size'))
+        return jsonify({'success': True, 'upload': upload}), 201
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@content_bp.route('/uploads/<upload_id>', methods=['GET'])
+def get_chunked_upload(upload_id):
+    """업로드 상태 조회 (받은/빠진 청크 목록)"""
+    try:
+        return jsonify({'success': True, 'upload': get_upload_store().status(upload_id)})
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+
+@content_bp.route('/uploads/<upload_id>/chunks/<int:index>', methods=['PUT'])
+def put_upload_chunk(upload_id, index):
+    """청크 N 업로드 (요청 본문 = 청크 바이트, 여러 청크 동시 전송 가능)"""
+    try:
+        chunk = get_upload_store().write_chunk(
+            upload_id, index, request.stream, expected_sha256=request.headers.get('X-Chunk-SHA256')
+        )
+        return jsonify({'success': True, 'chunk': chunk})
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@content_bp.route('/uploads/<upload_id>/commit', methods=['POST'])
+def commit_chunked_upload(upload_id):
+    """청크를 순서대로 이어 WebDAV에 업로드하고 세션 정리"""
+    store = get_upload_store()
+    try:
+        upload, stream = store.open_assembled(upload_id)
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+
+    try:
+        # 중복 제거 모드면 로컬 청크로 먼저 해시를 구해 이미 있는 내용은 전송 생략
+        digest = store.sha256(upload_id) if Config.WEBDAV_DEDUP_ENABLED else None
+        upload_result = get_webdav_manager().upload_stream(
+            stream, upload['filename'], content_length=upload['size'], digest=digest
+        )
+    finally:
+        stream.close()
+
+    if not upload_result['success']:
+        # 청크는 남겨두므로 commit만 다시 시도하면 됨
+        return jsonify({'error': upload_result['error']}), 500
+
+    store.delete(upload_id)
+    return jsonify({
+        'success': True,
+        'url': upload_result['url'],
+        'remote_path': upload_result['remote_path'],
+        'filename': upload['filename'],
+        'size': upload_result['size'],
+        'sha256': upload_result['sha256'],
+        'deduplicated': upload_result.get('deduplicated', False)
+    })
+
+@content_bp.route('/uploads/<upload_id>', methods=['DELETE'])
+def abort_chunked_upload(upload_id):
+    """업로드 취소 (받은 청크 삭제)"""
+    try:
+        store = get_upload_store()
+        store.manifest(upload_id)
+        store.delete(upload_id)
+        return jsonify({'success': True})
+    except UploadError as e:
+        return jsonify({'error': str(e)}), e.status
+
 @content_bp.route('/files', methods=['GET'])
 def list_files():
-    """파일 목록 조회 API"""
+    """파일 목록 조회 API (메타데이터 색인에서 정렬/필터/커서 페이지네이션)
+
+    쿼리: path, prefix, sort(name|size|modified), order(asc|desc), limit, cursor, refresh
+    """
     path = request.args.get('path', '/uploads')
+    prefix = request.args.get('prefix')
+    sort = request.args.get('sort', 'name')
+    order = request.args.get('order', 'asc')
+    cursor = request.args.get('cursor')
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
 
+    if sort not in SORT_COLUMNS:
+        return jsonify({'error': f'Sort must be one of: {", ".join(SORT_COLUMNS)}'}), 400
     try:
-        webdav = WebDAVManager()
-        files = webdav.list_files(path)
-
-        file_list = []
-        for item in files:
-            file_list.append({
-                'name': getattr(item, 'name', 'Unknown'),
-                'size': getattr(item, 'size', 0),
-                'modified': getattr(item, 'modified', None),
-                'is_directory': getattr(item, 'is_dir', lambda: False)(),
-                'path': getattr(item, 'path', item.name if hasattr(item, 'name') else 'Unknown')
-            })
+        limit = min(max(int(request.args.get('limit', 100)), 1), 1000)
+    except ValueError:
+        return jsonify({'error': 'Limit must be an integer'}), 400
+
+    try:
+        index = get_file_index()
+        cached = not refresh and index.is_fresh(path)
+        if not cached:
+            get_webdav_manager().list_entries(path)
+
+        file_list, next_cursor = index.list(
+            path, prefix=prefix, sort=sort, order=order, limit=limit, cursor=cursor
+        )
 
         return jsonify({
             'success': True,
             'files': file_list,
-            'current_path': path
+            'current_path': path,
+            'next_cursor': next_cursor,
+            'cached': cached
         })
 
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
\ No newline at end of file
+        return jsonify({'error': str(e)}), 500
+
+@content_bp.route('/files', methods=['DELETE'])
+def delete_file():
+    """파일 삭제 API (중복 제거 저장 객체는 참조 수가 0이 될 때만 실제 삭제)"""
+    path = request.args.get('path')
+    if not path:
+        return jsonify({'error': 'Path is required'}), 400
+
+    try:
+        result = get_webdav_manager().release_file(path)
+        if result['success']:
+            return jsonify({'success': True, 'path': path, 'deleted': result['deleted']})
+        else:
+            return jsonify({'error': 'Failed to delete file'}), 500
+
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
@@ -1,10 +1,24 @@
-from flask import Blueprint, request, jsonify
-import requests
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from datetime import datetime
 import json
-from datetime import datetime, timedelta
+import numpy as np
+from config import Config
+from utils.trend_store import get_trend_store
 
 trends_bp = Blueprint('trends', __name__)
 
+# 현재값이 평균의 1.2배 초과면 상승, 0.8배 미만이면 하락
+RISING_RATIO = 1.2
+FALLING_RATIO = 0.8
+TREND_STATUS_LABELS = {
+    'rising': '상승 추세',
+    'falling': '하락 추세',
+    'stable': '안정적'
+}
+
+# 벌크 분석 정렬 기준 (값이 큰 순)
+BULK_SORT_KEYS = ('current', 'momentum', 'slope', 'average', 'peak')
+
 @trends_bp.route('/analyze', methods=['POST'])
 def analyze_trends():
     """Google Trends 분석 API"""
@@ -18,61 +32,85 @@ def analyze_trends():
     geo = data.get('geo', 'KR')  # 기본 한국
 
     try:
-        # Google Trends API 호출 (pytrends 대신 직접 구현)
+        # 트렌드 시계열 + 집계값 (같은 키워드/기간/지역은 TTL 동안 메모리에서 조회)
         trends_data = fetch_google_trends(keyword, timeframe, geo)
 
-        if trends_data:
-            # 분석 결과 생성
-            analysis = analyze_trends_data(trends_data, keyword)
-
-            return jsonify({
-                'success': True,
-                'keyword': keyword,
-                'trends_data': trends_data,
-                'analysis': analysis,
-                'recommendations': generate_recommendations(analysis, keyword)
-            })
-        else:
-            # 실시간 트렌드 대체 데이터
-            fallback_data = generate_fallback_trends(keyword)
-            return jsonify({
-                'success': True,
-                'keyword': keyword,
-                'trends_data': fallback_data,
-                'analysis': '실시간 트렌드 데이터를 생성했습니다.',
-                'recommendations': generate_recommendations(fallback_data, keyword)
-            })
+        # 분석 결과 생성
+        analysis = analyze_trends_data(trends_data, keyword)
+
+        return jsonify({
+            'success': True,
+            'keyword': keyword,
+            'trends_data': trends_data,
+            'analysis': analysis,
+            'recommendations': generate_recommendations(analysis, keyword)
+        })
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def fetch_google_trends(keyword, timeframe, geo):
-    """Google Trends 데이터 가져오기"""
+@trends_bp.route('/analyze/bulk', methods=['POST'])
+def analyze_trends_bulk():
+    """여러 키워드 트렌드 일괄 분석 (순위표)
+
+    요청: keywords(목록), timeframe, geo, sort(current/momentum/slope/average/peak), limit
+    Accept: application/x-ndjson 또는 format=ndjson이면 한 줄에 한 행씩 스트리밍하고 마지막 줄에 요약
+    """
+    data = request.get_json()
+
+    if not data or not isinstance(data.get('keywords'), list) or not data['keywords']:
+        return jsonify({'error': 'Keywords list is required'}), 400
+
+    # 순서를 유지하며 중복 제거
+    keywords = list(dict.fromkeys(str(keyword).strip() for keyword in data['keywords'] if str(keyword).strip()))
+    if len(keywords) > Config.TREND_BULK_MAX_KEYWORDS:
+        return jsonify({'error': f"At most {Config.TREND_BULK_MAX_KEYWORDS} keywords are allowed"}), 400
+
+    timeframe = data.get('timeframe', 'today 3-m')
+    geo = data.get('geo', 'KR')
+    sort = data.get('sort', 'current')
+    if sort not in BULK_SORT_KEYS:
+        return jsonify({'error': f"Sort must be one of: {', '.join(BULK_SORT_KEYS)}"}), 400
+    limit = data.get('limit')
+    if limit is not None and (not isinstance(limit, int) or limit < 1):
+        return jsonify({'error': 'Limit must be a positive integer'}), 400
+    stream = data.get('format') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', '')
+
     try:
-        # 간단한 HTTP 요청으로 트렌드 데이터 시뮬레이션
-        # 실제 프로덕션에서는 pytrends 라이브러리나 Google API 사용 필요
-
-        # 시뮬레이션 데이터
-        dates = []
-        values = []
-
-        for i in range(30):  # 최근 30일 데이터
-            date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-            dates.append(date)
-            # 시뮬레이션된 트렌드 값 (실제로는 API 호출 필요)
-            import random
-            values.append(random.randint(20, 100))
-
-        return {
-            'dates': dates[::-1],  # 최신순으로 정렬
-            'values': values[::-1],
-            'average': sum(values) / len(values),
-            'peak': max(values),
-            'current': values[-1]
+        rows = rank_trends(get_trend_store().get_many(keywords, timeframe, geo), sort)
+        # 상태별 개수는 limit 적용 전 전체 기준
+        counts = {status: sum(1 for row in rows if row['status'] == status) for status in TREND_STATUS_LABELS}
+        if limit:
+            rows = rows[:limit]
+        summary = {
+            'total': len(keywords),
+            'returned': len(rows),
+            'timeframe': timeframe,
+            'geo': geo,
+            'sort': sort,
+            'counts': counts
         }
+
+        if stream:
+            def lines():
+                for row in rows:
+                    yield json.dumps({'type': 'row', **row}, ensure_ascii=False) + '\n'
+                yield json.dumps({'type': 'summary', **summary}, ensure_ascii=False) + '\n'
+
+            return Response(stream_with_context(lines()), mimetype='application/x-ndjson',
+                            headers={'X-Accel-Buffering': 'no'})
+
+        return jsonify({'success': True, 'summary': summary, 'rows': rows})
+
     except Exception as e:
-        print(f"Google Trends API 호출 실패: {e}")
-        return None
+        return jsonify({'error': str(e)}), 500
+
+def fetch_google_trends(keyword, timeframe, geo):
+    """트렌드 데이터 가져오기 (제공자에 데이터가 없으면 시뮬레이션 데이터)
+
+    반환값: dates, values, average, peak, current, rolling_average, slope, source
+    """
+    return get_trend_store().get(keyword, timeframe, geo)['payload']
 
 def analyze_trends_data(data, keyword):
     """트렌드 데이터 분석"""
@@ -82,46 +120,60 @@ def analyze_trends_data(data, keyword):
     current_trend = data['current']
     average_trend = data['average']
     peak_trend = data['peak']
-
-    if current_trend > average_trend * 1.2:
-        trend_status = "상승 추세"
-    elif current_trend < average_trend * 0.8:
-        trend_status = "하락 추세"
-    else:
-        trend_status = "안정적"
+    trend_status = TREND_STATUS_LABELS[classify_trends([current_trend], [average_trend])[0]]
 
     analysis = f"""
     '{keyword}' 키워드 트렌드 분석 결과:
 
-    현재 트렌드 점수: {current_trend}
+    현재 트렌드 점수: {current_trend:g}
     평균 트렌드 점수: {average_trend:.1f}
-    최고 트렌드 점수: {peak_trend}
+    최고 트렌드 점수: {peak_trend:g}
     트렌드 상태: {trend_status}
     """
 
     return analysis.strip()
 
-def generate_fallback_trends(keyword):
-    """실시간 트렌드 대체 데이터 생성"""
-    import random
-
-    dates = []
-    values = []
-
-    for i in range(30):
-        date = (datetime.now() - timedelta(days=i)).strftime('%Y-%m-%d')
-        dates.append(date)
-        # 최근일수록 높은 값을 갖는 경향성 시뮬레이션
-        base_value = 30 + (30 - i) * 2 + random.randint(-10, 10)
-        values.append(min(100, max(10, base_value)))
-
-    return {
-        'dates': dates[::-1],
-        'values': values[::-1],
-        'average': sum(values) / len(values),
-        'peak': max(values),
-        'current': values[-1]
+def classify_trends(current, average):
+    """현재값/평균 배열 → 'rising', 'falling', 'stable' 배열 (analyze_trends_data와 같은 기준)"""
+    current = np.asarray(current, dtype=float)
+    average = np.asarray(average, dtype=float)
+    return np.select(
+        [current > average * RISING_RATIO, current < average * FALLING_RATIO],
+        ['rising', 'falling'],
+        default='stable'
+    )
+
+def rank_trends(series_list, sort='current'):
+    """시계열 목록을 집계값 행렬로 모아 분류하고 sort 기준 내림차순 순위표 생성"""
+    if not series_list:
+        return []
+
+    current = np.array([series['current'] for series in series_list])
+    average = np.array([series['mean'] for series in series_list])
+    columns = {
+        'current': current,
+        'average': average,
+        'peak': np.array([series['peak'] for series in series_list]),
+        'slope': np.array([series['slope'] for series in series_list]),
+        # 평균 대비 현재 비율 (평균이 0이면 0)
+        'momentum': np.divide(current, average, out=np.zeros_like(current), where=average > 0)
     }
+    statuses = classify_trends(current, average)
+    # 동점이면 입력 순서 유지
+    order = np.argsort(-columns[sort], kind='stable')
+
+    return [{
+        'rank': rank,
+        'keyword': series_list[i]['keyword'],
+        'status': str(statuses[i]),
+        'status_label': TREND_STATUS_LABELS[str(statuses[i])],
+        'current': round(float(columns['current'][i]), 2),
+        'average': round(float(columns['average'][i]), 2),
+        'peak': round(float(columns['peak'][i]), 2),
+        'momentum': round(float(columns['momentum'][i]), 3),
+        'slope': round(float(columns['slope'][i]), 4),
+        'source': series_list[i]['source']
+    } for rank, i in enumerate(order.tolist(), start=1)]
 
 def generate_recommendations(analysis, keyword):
     """콘텐츠 추천 생성"""
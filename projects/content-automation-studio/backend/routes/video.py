@@ -1,9 +1,14 @@
-from flask import Blueprint, request, jsonify
-from utils.webdav import WebDAVManager
-from utils.ai_client import AIClient
-import tempfile
-import os
-import subprocess
+from flask import Blueprint, Response, request, jsonify, stream_with_context, url_for
+from routes.auth import optional_user
+from utils.ai_client import get_ai_client
+from utils.render_jobs import get_job_queue, get_job_store, QueueFullError, PRIORITIES, SUCCEEDED, FINISHED_STATES
+from utils.render_profiles import RENDER_PROFILES
+from utils.script_segmenter import segment_script
+from utils.speech_duration import estimate_durations, segment_timings, LANGUAGES
+from utils.sse import format_sse, SSE_HEADERS, SSE_KEEPALIVE
+from config import Config
+import math
+import time
 
 video_bp = Blueprint('video', __name__)
 
@@ -17,17 +22,21 @@ def generate_video_script():
 
     content = data['content']
     style = data.get('style', 'informative')  # informative, casual, professional
+    use_cache = data.get('use_cache', True)
+    language = data.get('language', Config.TTS_LANGUAGE)  # auto, ko, ja, zh, en
+    if language != 'auto' and language not in LANGUAGES:
+        return jsonify({'error': f"Language must be one of: auto, {', '.join(LANGUAGES)}"}), 400
 
     try:
-        ai_client = AIClient()
-        result = ai_client.generate_tts_script(content)
+        ai_client = get_ai_client()
+        result = ai_client.generate_tts_script(content, use_cache=use_cache)
 
         if result['success']:
             return jsonify({
                 'success': True,
                 'script': result['text'],
                 'style': style,
-                'estimated_duration': estimate_duration(result['text'])
+                'estimated_duration': estimate_duration(result['text'], language)
             })
         else:
             return jsonify({'error': result['error']}), 500
@@ -44,16 +53,24 @@ def generate_slideshow():
         return jsonify({'error': 'Script and image count are required'}), 400
 
     script = data['script']
-    image_count = data['image_count']
+    image_count = parse_image_count(data['image_count'])
+    if image_count is None:
+        return jsonify({'error': f'Image count must be an integer between 1 and {Config.SLIDESHOW_MAX_IMAGES}'}), 400
     topic = data.get('topic', 'AI generated content')
+    use_cache = data.get('use_cache', True)
+    prompt_mode = data.get('prompt_mode', Config.SLIDESHOW_PROMPT_MODE)  # parallel, batch
+    language = data.get('language', Config.TTS_LANGUAGE)  # auto, ko, ja, zh, en
+    if language != 'auto' and language not in LANGUAGES:
+        return jsonify({'error': f"Language must be one of: auto, {', '.join(LANGUAGES)}"}), 400
 
     try:
-        # 스크립트를 세그먼트로 분할
-        script_segments = divide_script_into_segments(script, image_count)
+        # 스크립트를 발화 시간 기준으로 고르게 분할 (세그먼트별 예상 시간은 이미지 표시 시간으로 사용)
+        segments = divide_script_into_segments(script, image_count, language)
+        script_segments = [segment['text'] for segment in segments]
 
-        # 각 세그먼트에 대한 이미지 생성 프롬프트 생성
-        image_prompts = []
-        ai_client = AIClient()
+        # 각 세그먼트에 대한 이미지 생성 프롬프트 생성 (동시 호출)
+        ai_client = get_ai_client()
+        prompts = []
 
         for i, segment in enumerate(script_segments):
             prompt = f"""
@@ -70,18 +87,31 @@ def generate_slideshow():
 
             Format: A professional photograph of...
             """
+            prompts.append(prompt)
+
+        if prompt_mode == 'batch':
+            results = ai_client.generate_batch(prompts, max_length=200, use_cache=use_cache)
+        else:
+            results = ai_client.generate_texts(prompts, max_length=200, use_cache=use_cache)
 
-            result = ai_client.generate_text(prompt, max_length=200)
+        image_prompts = []
+        for result in results:
             if result['success']:
                 image_prompts.append(result['text'].strip())
             else:
                 image_prompts.append(f"Professional image related to {topic}")
 
+        # 빈 세그먼트(글자가 이미지보다 적을 때)도 create-video에 그대로 넘길 수 있도록 최소 표시 시간 적용
+        durations = [max(segment['duration'], Config.SLIDESHOW_MIN_SLIDE_SECONDS) for segment in segments]
         return jsonify({
             'success': True,
             'script_segments': script_segments,
+            'segment_durations': durations,
+            # create-video의 segment_timings로 그대로 넘기면 이미지가 내레이션에 맞춰 바뀐다
+            'segment_timings': segment_timings(durations),
             'image_prompts': image_prompts,
-            'total_segments': len(script_segments)
+            'total_segments': len(script_segments),
+            'prompt_mode': prompt_mode
         })
 
     except Exception as e:
@@ -89,149 +119,213 @@ def generate_slideshow():
 
 @video_bp.route('/create-video', methods=['POST'])
 def create_video():
-    """FFmpeg로 영상 생성"""
+    """FFmpeg 영상 생성 작업 등록 (렌더링은 작업 큐에서 비동기로 실행)"""
     data = request.get_json()
 
     if not data or 'image_urls' not in data or 'audio_url' not in data:
         return jsonify({'error': 'Image URLs and audio URL are required'}), 400
 
-    image_urls = data['image_urls']
-    audio_url = data['audio_url']
-    output_filename = data.get('filename', f"video_{int(os.times()[4])}.mp4")
-    duration_per_image = data.get('duration_per_image', 5)  # 초
+    profile = data.get('profile', Config.RENDER_DEFAULT_PROFILE)  # draft, standard, high
+    if profile not in RENDER_PROFILES:
+        return jsonify({'error': f"Profile must be one of: {', '.join(RENDER_PROFILES)}"}), 400
+
+    if data.get('render_mode', Config.RENDER_MODE) not in ('single', 'segmented', 'auto'):
+        return jsonify({'error': 'Render mode must be one of: single, segmented, auto'}), 400
 
     try:
-        # 이미지 파일 다운로드
-        webdav = WebDAVManager()
-        image_files = []
-
-        with tempfile.TemporaryDirectory() as temp_dir:
-            for i, url in enumerate(image_urls):
-                # 이미지 다운로드
-                response = requests.get(url)
-                if response.status_code == 200:
-                    image_path = os.path.join(temp_dir, f"image_{i:03d}.jpg")
-                    with open(image_path, 'wb') as f:
-                        f.write(response.content)
-                    image_files.append(image_path)
-
-            # 오디오 다운로드
-            audio_response = requests.get(audio_url)
-            audio_path = os.path.join(temp_dir, "audio.mp3")
-            if audio_response.status_code == 200:
-                with open(audio_path, 'wb') as f:
-                    f.write(audio_response.content)
-            else:
-                return jsonify({'error': 'Failed to download audio'}), 400
-
-            # FFmpeg 명령어 생성
-            output_path = os.path.join(temp_dir, output_filename)
-
-            # 이미지들을 비디오로 변환
-            ffmpeg_cmd = [
-                'ffmpeg',
-                '-y',  # 기존 파일 덮어쓰기
-                '-loop', '1',
-                '-framerate', '1/5',  # 5초당 1프레임
-                '-i', image_files[0],  # 첫 번째 이미지
-                '-i', audio_path,
-                '-c:v', 'libx264',
-                '-c:a', 'aac',
-                '-shortest',
-                '-pix_fmt', 'yuv420p',
-                output_path
-            ]
-
-            # 여러 이미지가 있는 경우
-            if len(image_files) > 1:
-                # 이미지 목록 파일 생성
-                concat_list_path = os.path.join(temp_dir, "image_list.txt")
-                with open(concat_list_path, 'w') as f:
-                    for img_file in image_files:
-                        duration = duration_per_image
-                        f.write(f"file '{img_file}'\n")
-                        f.write(f"duration {duration}\n")
-
-                ffmpeg_cmd = [
-                    'ffmpeg',
-                    '-y',
-                    '-f', 'concat',
-                    '-safe', '0',
-                    '-i', concat_list_path,
-                    '-i', audio_path,
-                    '-c:v', 'libx264',
-                    '-c:a', 'aac',
-                    '-shortest',
-                    '-pix_fmt', 'yuv420p',
-                    output_path
-                ]
-
-            # FFmpeg 실행
-            result = subprocess.run(ffmpeg_cmd, capture_output=True, text=True)
-
-            if result.returncode == 0:
-                # 생성된 비디오를 WebDAV에 업로드
-                upload_result = webdav.upload_file(output_path)
-
-                if upload_result['success']:
-                    return jsonify({
-                        'success': True,
-                        'video_url': upload_result['url'],
-                        'filename': output_filename,
-                        'duration': get_video_duration(output_path)
-                    })
-                else:
-                    return jsonify({'error': 'Failed to upload video'}), 500
-            else:
-                return jsonify({
-                    'error': 'FFmpeg execution failed',
-                    'details': result.stderr
-                }), 500
+        durations = parse_durations(data, len(data['image_urls']))
+        duration_per_image = parse_seconds(data.get('duration_per_image', 5))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    # draft 미리보기는 기본적으로 interactive (batch보다 먼저 실행)
+    priority = data.get('priority', 'interactive' if profile == 'draft' else 'batch')
+    if priority not in PRIORITIES:
+        return jsonify({'error': f"Priority must be one of: {', '.join(PRIORITIES)}"}), 400
+    # 공정 분배/사용자별 한도 기준: 검증된 토큰 사용자, 없으면 접속 주소 (클라이언트가 정한 값은 쓰지 않음)
+    user = optional_user()
+    owner = f"user:{user}" if user else f"ip:{request.remote_addr or ''}"
+
+    params = {
+        'image_urls': data['image_urls'],
+        'audio_url': data['audio_url'],
+        'filename': data.get('filename', f"video_{int(time.time())}.mp4"),
+        'duration_per_image': duration_per_image,  # 초
+        'durations': durations,  # 이미지별 표시 시간 (없으면 duration_per_image)
+        'profile': profile,
+        'render_mode': data.get('render_mode', Config.RENDER_MODE)  # single, segmented, auto
+    }
+
+    try:
+        job = get_job_queue().submit('render_video', params, priority=priority, owner=owner)
+        return jsonify({
+            'success': True,
+            'job_id': job['id'],
+            'status': job['status'],
+            'status_url': url_for('video.get_job_status', job_id=job['id']),
+            'progress_url': url_for('video.stream_job_progress', job_id=job['id'])
+        }), 202
+
+    except QueueFullError as e:
+        response = jsonify({'error': str(e), 'retry_after': e.retry_after})
+        response.headers['Retry-After'] = str(e.retry_after)
+        return response, 429
 
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def divide_script_into_segments(script, segment_count):
-    """스크립트를 지정된 수의 세그먼트로 분할"""
-    sentences = script.split('.')
-    segments = []
-    sentences_per_segment = max(1, len(sentences) // segment_count)
-
-    for i in range(0, len(sentences), sentences_per_segment):
-        segment = '.'.join(sentences[i:i + sentences_per_segment]).strip()
-        if segment:
-            segments.append(segment)
-
-    # 정확한 개수 맞추기
-    while len(segments) < segment_count:
-        # 마지막 세그먼트 분할
-        if segments:
-            last_segment = segments[-1]
-            mid = len(last_segment) // 2
-            segments[-1] = last_segment[:mid].strip()
-            segments.insert(len(segments), last_segment[mid:].strip())
-
-    return segments[:segment_count]
-
-def estimate_duration(script):
-    """스크립트 음성 길이 추정 (분당 150단어 기준)"""
-    word_count = len(script.split())
-    duration_seconds = (word_count / 150) * 60
-    return round(duration_seconds, 1)
-
-def get_video_duration(video_path):
-    """비디오 길이 가져오기"""
+@video_bp.route('/jobs/<job_id>', methods=['GET'])
+def get_job_status(job_id):
+    """렌더 작업 상태 조회"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    return jsonify({'success': True, 'job': job_summary(job)})
+
+@video_bp.route('/jobs/<job_id>/progress', methods=['GET'])
+def stream_job_progress(job_id):
+    """렌더 진행 상황 스트림 (SSE)
+
+    이벤트: progress(percent, fps, speed, out_time 변할 때마다) → done(최종 상태), 작업이 없으면 404
+    RENDER_PROGRESS_STREAM_MAX_SECONDS가 지나면 timeout 이벤트로 끝나며, 클라이언트는 다시 연결하면 된다.
+    변화가 없는 동안에는 keep-alive 주석을 보내 끊긴 연결을 감지한다.
+    """
+    store = get_job_store()
+    if store.get(job_id) is None:
+        return jsonify({'error': 'Job not found'}), 404
+    reconnect_url = url_for('video.stream_job_progress', job_id=job_id)
+
+    def events():
+        last = None
+        started = last_sent = time.monotonic()
+        # 클라이언트가 끊으면 yield에서 GeneratorExit가 발생해 반복이 끝난다
+        while True:
+            job = store.get(job_id)
+            if job is None:
+                yield format_sse('error', {'error': 'Job not found'})
+                return
+            now = time.monotonic()
+            snapshot = {'status': job['status'], 'progress': job['progress']}
+            if snapshot != last:
+                yield format_sse('progress', snapshot)
+                last = snapshot
+                last_sent = now
+            if job['status'] in FINISHED_STATES:
+                yield format_sse('done', {
+                    'status': job['status'],
+                    'error': job['error'],
+                    'duration': (job['result'] or {}).get('duration')
+                })
+                return
+            if now - started >= Config.RENDER_PROGRESS_STREAM_MAX_SECONDS:
+                # 웹 워커를 오래 붙잡지 않도록 끊고 다시 연결하게 함
+                yield format_sse('timeout', {'status': job['status'], 'reconnect_url': reconnect_url})
+                return
+            if now - last_sent >= Config.RENDER_PROGRESS_KEEPALIVE:
+                yield SSE_KEEPALIVE
+                last_sent = now
+            time.sleep(Config.RENDER_PROGRESS_INTERVAL)
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream', headers=SSE_HEADERS)
+
+@video_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def get_job_result(job_id):
+    """렌더 작업 결과 조회 (완료 전에는 409)"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+
+    if job['status'] != SUCCEEDED:
+        return jsonify({
+            'error': job['error'] or f"Job is {job['status']}",
+            'details': (job['result'] or {}).get('details'),
+            'status': job['status']
+        }), 409
+
+    result = job['result']
+    return jsonify({
+        'success': True,
+        'video_url': result['video_url'],
+        'filename': result['filename'],
+        'profile': result.get('profile'),
+        'duration': result['duration']
+    })
+
+@video_bp.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """렌더 작업 취소 (대기 중이면 즉시, 실행 중이면 ffmpeg 중단)"""
+    job = get_job_store().get(job_id)
+    if job is None:
+        return jsonify({'error': 'Job not found'}), 404
+    if job['status'] in FINISHED_STATES:
+        return jsonify({'error': f"Job is already {job['status']}", 'status': job['status']}), 409
+
+    job = get_job_queue().cancel(job_id)
+    return jsonify({'success': True, 'job': job_summary(job)})
+
+def job_summary(job):
+    """API 응답용 작업 정보"""
+    return {
+        'id': job['id'],
+        'status': job['status'],
+        'priority': job['priority'],
+        'cancel_requested': job['cancel_requested'],
+        'progress': job['progress'],
+        'error': job['error'],
+        'created_at': job['created_at'],
+        'started_at': job['started_at'],
+        'finished_at': job['finished_at'],
+        'queue_wait': job['queue_wait'],
+        'run_time': job['run_time']
+    }
+
+def parse_image_count(value):
+    """image_count 검증 (1 ~ SLIDESHOW_MAX_IMAGES 정수 또는 정수 문자열), 잘못된 값이면 None"""
+    if isinstance(value, str):
+        try:
+            value = int(value.strip())
+        except ValueError:
+            return None
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value if 1 <= value <= Config.SLIDESHOW_MAX_IMAGES else None
+
+def divide_script_into_segments(script, segment_count, language=None):
+    """스크립트를 발화 시간이 고르게 나뉘도록 segment_count개 세그먼트로 분할 (세그먼트별 예상 시간 포함)"""
+    return segment_script(script, segment_count, language=language)
+
+def estimate_duration(script, language=None):
+    """스크립트 음성 길이 추정 (언어별 음절/글자 발화 속도 + 문장부호 쉼)"""
+    return round(float(estimate_durations([script], language)[0]), 1)
+
+def parse_durations(data, image_count):
+    """create-video의 이미지별 표시 시간 (durations 숫자 목록 또는 segment_timings), 없으면 None
+
+    잘못된 값이면 ValueError
+    """
+    if data.get('segment_timings') is not None:
+        if not isinstance(data['segment_timings'], list):
+            raise ValueError('Segment timings must be a list')
+        values = [timing.get('duration') if isinstance(timing, dict) else None for timing in data['segment_timings']]
+    elif data.get('durations') is not None:
+        values = data['durations']
+    else:
+        return None
+
+    if not isinstance(values, list) or len(values) != image_count:
+        raise ValueError('Durations must have one entry per image')
+    return [parse_seconds(value) for value in values]
+
+def parse_seconds(value):
+    """표시 시간(초) 검증 (0 < 값 <= SLIDESHOW_MAX_SLIDE_SECONDS인 유한한 숫자), 잘못된 값이면 ValueError"""
+    if isinstance(value, bool):
+        raise ValueError('Durations must be numbers (seconds)')
     try:
-        cmd = [
-            'ffprobe',
-            '-v', 'error',
-            '-show_entries', 'format=duration',
-            '-of', 'default=noprint_wrappers=1:nokey=1',
-            video_path
-        ]
-        result = subprocess.run(cmd, capture_output=True, text=True)
-        if result.returncode == 0:
-            return float(result.stdout.strip())
-    except:
-        pass
-    return 0
\ No newline at end of file
+        seconds = float(value)
+    except (TypeError, ValueError):
+        raise ValueError('Durations must be numbers (seconds)')
+    # json.loads는 NaN/Infinity도 받아들인다
+    if not math.isfinite(seconds) or not 0 < seconds <= Config.SLIDESHOW_MAX_SLIDE_SECONDS:
+        raise ValueError(f'Durations must be positive and at most {Config.SLIDESHOW_MAX_SLIDE_SECONDS:g} seconds')
+    return seconds
@@ -0,0 +1,9 @@
+"""백엔드 테스트 공통 설정
+
+실행: cd backend && python -m pytest -q
+"""
+import os
+import sys
+
+# 앱과 같은 방식(backend 폴더 기준)으로 config, utils, routes를 가져온다
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
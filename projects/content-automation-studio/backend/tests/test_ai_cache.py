@@ -0,0 +1,119 @@
+import threading
+
+import pytest
+
+from utils.ai_cache import ResponseCache, make_cache_key
+
+
+def run_concurrently(count, target):
+    results = [None] * count
+    errors = [None] * count
+
+    def run(index):
+        try:
+            results[index] = target()
+        except Exception as e:
+            errors[index] = e
+
+    threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+    return results, errors
+
+
+def wait_for_waiters(cache, count):
+    """다른 스레드들이 진행 중인 호출에 합류할 때까지 대기"""
+    for _ in range(500):
+        if cache.stats()['coalesced'] >= count:
+            return
+        threading.Event().wait(0.01)
+    raise AssertionError('waiters did not join')
+
+
+def test_make_cache_key_depends_on_all_parameters():
+    base = make_cache_key('m', 'prompt', 100, 0.7)
+    assert base == make_cache_key('m', 'prompt', 100, 0.7)
+    assert len({base, make_cache_key('n', 'prompt', 100, 0.7), make_cache_key('m', 'other', 100, 0.7),
+                make_cache_key('m', 'prompt', 200, 0.7), make_cache_key('m', 'prompt', 100, 0.2)}) == 5
+
+
+def test_concurrent_misses_share_one_upstream_call():
+    cache = ResponseCache(max_bytes=1024 * 1024, ttl=60)
+    release = threading.Event()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        release.wait(5)
+        return {'success': True, 'text': 'answer'}
+
+    leader = threading.Thread(target=lambda: cache.get_or_compute('k', compute))
+    leader.start()
+    while not calls:
+        threading.Event().wait(0.01)
+
+    def follower():
+        return cache.get_or_compute('k', compute)
+
+    waiting = []
+    thread = threading.Thread(target=lambda: waiting.append(run_concurrently(4, follower)))
+    thread.start()
+    wait_for_waiters(cache, 4)
+    release.set()
+    thread.join(5)
+    leader.join(5)
+
+    (results, errors), = waiting
+    assert len(calls) == 1
+    assert errors == [None] * 4
+    assert all(result == ({'success': True, 'text': 'answer'}, False) for result in results)
+    # 완료 후에는 캐시 히트
+    assert cache.get_or_compute('k', compute) == ({'success': True, 'text': 'answer'}, True)
+
+
+def test_failed_result_is_shared_but_not_cached():
+    cache = ResponseCache(max_bytes=1024 * 1024, ttl=60)
+    result, hit = cache.get_or_compute('k', lambda: {'success': False, 'error': 'quota'})
+    assert result == {'success': False, 'error': 'quota'} and hit is False
+    assert cache.get('k') is None
+
+
+def test_leader_exception_reaches_waiters():
+    cache = ResponseCache(max_bytes=1024 * 1024, ttl=60)
+    flight, leader = cache.join('k')
+    assert leader
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(run_concurrently(2, lambda: cache.get_or_compute(
+        'k', lambda: pytest.fail('waiters must not call upstream')))))
+    thread.start()
+    wait_for_waiters(cache, 2)
+    cache.finish('k', flight, error=RuntimeError('upstream down'))
+    thread.join(5)
+
+    (_, errors), = results
+    assert all(isinstance(error, RuntimeError) for error in errors)
+    # 끝난 호출은 목록에서 빠져 다음 요청이 새로 시작한다
+    assert cache.join('k')[1] is True
+
+
+def test_join_and_finish_for_streaming_callers():
+    cache = ResponseCache(max_bytes=1024 * 1024, ttl=60)
+    flight, leader = cache.join('k')
+    other, other_leader = cache.join('k')
+    assert leader and not other_leader and other is flight
+
+    cache.finish('k', flight, {'success': True, 'text': 'streamed'})
+    assert flight.event.is_set()
+    assert other.result['text'] == 'streamed'
+    assert cache.get('k') == 'streamed'
+
+
+def test_disk_tier_survives_memory_clear(tmp_path):
+    cache = ResponseCache(max_bytes=1024 * 1024, ttl=60, db_path=str(tmp_path / 'cache.sqlite3'))
+    cache.set('k', 'value')
+    cache.clear()
+    assert cache.get('k') == 'value'
+    assert cache.stats()['disk_hits'] == 1
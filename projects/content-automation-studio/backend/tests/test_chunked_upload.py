@@ -0,0 +1,115 @@
+import hashlib
+import io
+import os
+import time
+
+import pytest
+
+from config import Config
+from utils.chunked_upload import ChunkedUploadStore, UploadError
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ChunkedUploadStore(str(tmp_path / 'uploads'), chunk_size=4, max_size=100, ttl=3600)
+
+
+def status_code(excinfo):
+    return excinfo.value.status
+
+
+@pytest.mark.parametrize('filename, size, chunk_size, status', [
+    ('video.exe', 10, None, 400),
+    ('video.mp4', 0, None, 400),
+    ('video.mp4', '10', None, 400),
+    ('video.mp4', 101, None, 413),
+    ('video.mp4', 10, 0, 400),
+    ('video.mp4', 10, 2.5, 400),
+])
+def test_create_validation(store, filename, size, chunk_size, status):
+    with pytest.raises(UploadError) as excinfo:
+        store.create(filename, size, chunk_size)
+    assert status_code(excinfo) == status
+
+
+def test_create_strips_directories_from_filename(store):
+    upload = store.create('../../etc/photo.PNG', 10)
+    assert upload['filename'] == 'photo.PNG'
+    assert upload['total_chunks'] == 3
+    assert upload['missing_chunks'] == [0, 1, 2]
+    assert os.listdir(store.root) == [upload['id']]
+
+
+def test_chunk_size_is_capped_by_request_limit(store):
+    store.max_size = Config.MAX_CONTENT_LENGTH * 2
+    upload = store.create('big.mp4', Config.MAX_CONTENT_LENGTH * 2, Config.MAX_CONTENT_LENGTH * 4)
+    assert upload['chunk_size'] == Config.MAX_CONTENT_LENGTH
+
+
+@pytest.mark.parametrize('upload_id', ['', '../etc', 'ABCDEF', 'a/b', '..', 'x' * 32])
+def test_rejects_ids_outside_store(store, upload_id):
+    with pytest.raises(UploadError) as excinfo:
+        store.status(upload_id)
+    assert status_code(excinfo) == 404
+
+
+def test_unknown_upload(store):
+    with pytest.raises(UploadError) as excinfo:
+        store.status('0' * 32)
+    assert status_code(excinfo) == 404
+
+
+def test_chunk_size_and_index_validation(store):
+    upload_id = store.create('clip.mp4', 10)['id']
+    with pytest.raises(UploadError):
+        store.write_chunk(upload_id, 3, io.BytesIO(b'xx'))
+    with pytest.raises(UploadError):
+        store.write_chunk(upload_id, 0, io.BytesIO(b'xxx'))
+    with pytest.raises(UploadError):
+        store.write_chunk(upload_id, 0, io.BytesIO(b'xxxxx'))
+    # 마지막 청크는 남은 크기만큼
+    with pytest.raises(UploadError):
+        store.write_chunk(upload_id, 2, io.BytesIO(b'xxxx'))
+    with pytest.raises(UploadError):
+        store.write_chunk(upload_id, 0, io.BytesIO(b'abcd'), expected_sha256='0' * 64)
+
+    assert store.status(upload_id)['received_chunks'] == []
+    # 실패한 청크의 임시 파일이 남지 않는다
+    assert sorted(os.listdir(os.path.join(store.root, upload_id))) == ['manifest.json']
+
+
+def test_out_of_order_chunks_assemble_in_order(store):
+    data = b'0123456789'
+    upload_id = store.create('clip.mp4', len(data))['id']
+    for index in (2, 0):
+        store.write_chunk(upload_id, index, io.BytesIO(data[index * 4:index * 4 + 4]))
+
+    assert store.status(upload_id)['missing_chunks'] == [1]
+    with pytest.raises(UploadError) as excinfo:
+        store.open_assembled(upload_id)
+    assert status_code(excinfo) == 409
+
+    chunk = store.write_chunk(
+        upload_id, 1, io.BytesIO(data[4:8]), expected_sha256=hashlib.sha256(data[4:8]).hexdigest().upper()
+    )
+    assert chunk == {'index': 1, 'size': 4, 'sha256': hashlib.sha256(data[4:8]).hexdigest()}
+
+    upload, stream = store.open_assembled(upload_id)
+    try:
+        assert b''.join(iter(lambda: stream.read(3), b'')) == data
+    finally:
+        stream.close()
+    assert upload['missing_chunks'] == []
+    assert store.sha256(upload_id) == hashlib.sha256(data).hexdigest()
+
+    store.delete(upload_id)
+    with pytest.raises(UploadError):
+        store.status(upload_id)
+
+
+def test_cleanup_expired_sessions(store):
+    upload_id = store.create('clip.mp4', 10)['id']
+    old = time.time() - store.ttl - 1
+    os.utime(os.path.join(store.root, upload_id), (old, old))
+    store.cleanup_expired()
+    assert os.listdir(store.root) == []
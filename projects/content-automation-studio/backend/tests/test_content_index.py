@@ -0,0 +1,61 @@
+import pytest
+
+from utils.content_index import ContentIndex
+
+DIGEST = 'a' * 64
+PATH = '/objects/aa/' + DIGEST + '.png'
+
+
+@pytest.fixture
+def index(tmp_path):
+    return ContentIndex(str(tmp_path / 'content.sqlite3'))
+
+
+def test_insert_then_duplicate_insert_adds_a_reference(index):
+    entry = index.insert(DIGEST, PATH, 10)
+    assert entry['refcount'] == 1
+    assert entry['remote_path'] == PATH
+
+    # 같은 내용을 다른 경로로 다시 올려도 기존 객체를 가리킨다
+    again = index.insert(DIGEST, '/objects/other.png', 10)
+    assert again['refcount'] == 2
+    assert again['remote_path'] == PATH
+
+
+def test_add_ref_only_for_known_digest(index):
+    assert index.add_ref(DIGEST) is None
+    index.insert(DIGEST, PATH, 10)
+    assert index.add_ref(DIGEST)['refcount'] == 2
+    assert index.get_by_path(PATH)['digest'] == DIGEST
+
+
+def test_release_deletes_only_on_last_reference(index):
+    index.insert(DIGEST, PATH, 10)
+    index.add_ref(DIGEST)
+    index.add_ref(DIGEST)
+
+    assert index.release(PATH) is False
+    assert index.release(PATH) is False
+    assert index.get(DIGEST)['refcount'] == 1
+    assert index.release(PATH) is True
+    assert index.get(DIGEST) is None
+
+
+def test_release_unknown_path(index):
+    assert index.release('/uploads/not-deduplicated.png') is None
+
+
+def test_forget_removes_entry(index):
+    index.insert(DIGEST, PATH, 10)
+    index.forget(DIGEST)
+    assert index.get(DIGEST) is None
+    assert index.add_ref(DIGEST) is None
+
+
+def test_refcounts_shared_between_instances(tmp_path):
+    db_path = str(tmp_path / 'content.sqlite3')
+    first, second = ContentIndex(db_path), ContentIndex(db_path)
+    first.insert(DIGEST, PATH, 10)
+    second.add_ref(DIGEST)
+    assert first.release(PATH) is False
+    assert second.release(PATH) is True
@@ -0,0 +1,67 @@
+from utils.ffmpeg_progress import ProgressParser
+
+
+def feed_block(parser, lines):
+    """한 블록을 넣고 마지막 줄(progress=)의 결과 반환 (앞 줄은 모두 None이어야 함)"""
+    *body, last = lines
+    for line in body:
+        assert parser.feed(line) is None
+    return parser.feed(last)
+
+
+def test_snapshot_per_block_with_percent():
+    parser = ProgressParser(expected_duration=10)
+    snapshot = feed_block(parser, [
+        'frame=50\n', 'fps=25.0\n', 'total_size=1024\n', 'out_time_us=2500000\n', 'speed=1.5x\n',
+        'progress=continue\n'
+    ])
+    assert snapshot == {
+        'out_time': 2.5,
+        'frame': 50,
+        'fps': 25.0,
+        'speed': 1.5,
+        'total_size': 1024,
+        'percent': 25.0,
+        'done': False
+    }
+    assert parser.last is snapshot
+
+
+def test_out_time_ms_is_microseconds():
+    parser = ProgressParser(expected_duration=4)
+    snapshot = feed_block(parser, ['out_time_ms=1000000', 'progress=continue'])
+    assert snapshot['out_time'] == 1.0
+    assert snapshot['percent'] == 25.0
+
+
+def test_percent_capped_until_end():
+    parser = ProgressParser(expected_duration=2)
+    assert feed_block(parser, ['out_time_us=5000000', 'progress=continue'])['percent'] == 99.9
+    final = feed_block(parser, ['out_time_us=5000000', 'progress=end'])
+    assert final['percent'] == 100.0
+    assert final['done'] is True
+
+
+def test_unknown_values_and_missing_out_time():
+    parser = ProgressParser(expected_duration=10)
+    feed_block(parser, ['out_time_us=3000000', 'progress=continue'])
+    # N/A 값은 None, out_time이 없으면 직전 값 유지
+    snapshot = feed_block(parser, ['fps=N/A', 'speed=N/A', 'out_time_us=N/A', 'progress=continue'])
+    assert snapshot['fps'] is None
+    assert snapshot['speed'] is None
+    assert snapshot['out_time'] == 3.0
+    assert snapshot['percent'] == 30.0
+
+
+def test_negative_out_time_and_no_expected_duration():
+    parser = ProgressParser()
+    snapshot = feed_block(parser, ['out_time_us=-9223372036854775807', 'progress=continue'])
+    assert snapshot['out_time'] is None
+    assert snapshot['percent'] is None
+
+
+def test_ignores_lines_without_key_value():
+    parser = ProgressParser()
+    assert parser.feed('') is None
+    assert parser.feed('garbage line') is None
+    assert parser.last is None
@@ -0,0 +1,75 @@
+import pytest
+
+from utils.file_index import FileIndex, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = FileIndex(str(tmp_path / 'files.sqlite3'), ttl=60)
+    # 크기가 같은 항목을 섞어 정렬 값이 겹칠 때 path로 이어지는지 확인
+    index.replace_folder('/uploads', [
+        {'path': '/uploads', 'is_directory': True},
+        {'path': '/uploads/b.png', 'size': 20, 'modified': '2024-01-02T00:00:00+00:00'},
+        {'path': '/uploads/a.png', 'size': 10, 'modified': '2024-01-03T00:00:00+00:00'},
+        {'path': '/uploads/c.png', 'size': 10, 'modified': '2024-01-01T00:00:00+00:00'},
+        {'path': '/uploads/d.jpg', 'size': 30, 'modified': '2024-01-04T00:00:00+00:00'},
+        {'path': '/uploads/e.png', 'size': 10, 'modified': '2024-01-05T00:00:00+00:00'},
+    ])
+    return index
+
+
+def collect(index, limit, **kwargs):
+    """커서를 따라 모든 페이지의 이름 목록"""
+    pages = []
+    cursor = None
+    while True:
+        items, cursor = index.list('/uploads', limit=limit, cursor=cursor, **kwargs)
+        pages.append([item['name'] for item in items])
+        if cursor is None:
+            return pages
+
+
+def test_folder_itself_is_not_listed(index):
+    items, cursor = index.list('/uploads/')
+    assert [item['name'] for item in items] == ['a.png', 'b.png', 'c.png', 'd.jpg', 'e.png']
+    assert cursor is None
+
+
+@pytest.mark.parametrize('limit', [1, 2, 3, 5])
+def test_pages_cover_every_entry_once(index, limit):
+    pages = collect(index, limit)
+    names = [name for page in pages for name in page]
+    assert names == ['a.png', 'b.png', 'c.png', 'd.jpg', 'e.png']
+    assert all(len(page) <= limit for page in pages)
+
+
+def test_paging_by_size_with_ties(index):
+    assert collect(index, 2, sort='size') == [['a.png', 'c.png'], ['e.png', 'b.png'], ['d.jpg']]
+    assert collect(index, 2, sort='size', order='desc') == [['d.jpg', 'b.png'], ['e.png', 'c.png'], ['a.png']]
+
+
+def test_paging_by_modified_with_prefix(index):
+    index.upsert({'path': '/uploads/ab.png', 'size': 1, 'modified': '2024-01-06T00:00:00+00:00'})
+    assert collect(index, 1, sort='modified', prefix='a') == [['a.png'], ['ab.png']]
+
+
+def test_entries_added_behind_the_cursor_are_not_repeated(index):
+    items, cursor = index.list('/uploads', limit=2)
+    index.record_file('/uploads/0-first.png', 5)
+    rest, _ = index.list('/uploads', limit=10, cursor=cursor)
+    assert [item['name'] for item in items + rest] == ['a.png', 'b.png', 'c.png', 'd.jpg', 'e.png']
+
+
+def test_remove_deletes_folder_subtree(index):
+    index.replace_folder('/uploads/sub', [{'path': '/uploads/sub/x.png', 'size': 1}])
+    index.upsert({'path': '/uploads/sub', 'is_directory': True})
+    index.remove('/uploads/sub')
+    assert index.list('/uploads/sub')[0] == []
+    assert not index.is_fresh('/uploads/sub')
+    assert 'sub' not in [item['name'] for item in index.list('/uploads')[0]]
+
+
+def test_cursor_round_trip_and_invalid_cursor(index):
+    assert decode_cursor(encode_cursor('파일.png', '/uploads/파일.png')) == ('파일.png', '/uploads/파일.png')
+    with pytest.raises(ValueError):
+        index.list('/uploads', cursor='not-a-cursor')
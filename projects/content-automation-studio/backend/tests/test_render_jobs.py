@@ -0,0 +1,115 @@
+import threading
+
+import pytest
+
+from utils.render_jobs import (
+    JobStore, QueueFullError, render_slots, CANCELLED, QUEUED, RUNNING, SUCCEEDED
+)
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs.sqlite3'))
+
+
+def submit(store, owner, priority='batch', count=1):
+    return [store.create('render_video', {'n': i}, priority=priority, owner=owner)['id'] for i in range(count)]
+
+
+def claim_owners(store, count, **kwargs):
+    owners = []
+    for i in range(count):
+        job = store.claim_next(f'worker-{i}', **kwargs)
+        owners.append(job and job['owner'])
+    return owners
+
+
+def test_interactive_jobs_run_first(store):
+    submit(store, 'a', count=2)
+    interactive, = submit(store, 'b', priority='interactive')
+    job = store.claim_next('w')
+    assert job['id'] == interactive
+    assert job['status'] == RUNNING
+    assert job['priority'] == 'interactive'
+
+
+def test_owners_take_turns(store):
+    # a가 먼저 여러 개를 넣어도 실행 중 작업이 적은 사용자부터
+    submit(store, 'a', count=3)
+    submit(store, 'b', count=2)
+    submit(store, 'c')
+    assert claim_owners(store, 6) == ['a', 'b', 'c', 'a', 'b', 'a']
+    assert store.claim_next('w') is None
+
+
+def test_fairness_counts_jobs_already_running(store):
+    submit(store, 'a')
+    store.claim_next('w')
+    submit(store, 'a')
+    submit(store, 'b')
+    assert claim_owners(store, 2) == ['b', 'a']
+
+
+def test_slot_limit_and_reserved_interactive_slot(store):
+    submit(store, 'a', count=3)
+    # 슬롯 3개 중 1개 예약: batch는 2개까지만
+    assert claim_owners(store, 3, max_running=3, reserved_interactive=1) == ['a', 'a', None]
+    submit(store, 'b', priority='interactive', count=2)
+    assert claim_owners(store, 2, max_running=3, reserved_interactive=1) == ['b', None]
+    assert store.count(RUNNING) == 3
+
+
+def test_finished_jobs_free_slots(store):
+    first, second = submit(store, 'a', count=2)
+    assert store.claim_next('w', max_running=1)['id'] == first
+    assert store.claim_next('w', max_running=1) is None
+    store.finish(first, SUCCEEDED, result={'success': True})
+    assert store.claim_next('w', max_running=1)['id'] == second
+
+
+def test_concurrent_claims_respect_slot_limit(tmp_path):
+    db_path = str(tmp_path / 'jobs.sqlite3')
+    submit(JobStore(db_path), 'a', count=10)
+    claimed = []
+    lock = threading.Lock()
+
+    def worker(i):
+        # 프로세스마다 저장소 객체가 따로 있는 상황
+        job = JobStore(db_path).claim_next(f'w{i}', max_running=4)
+        with lock:
+            claimed.append(job)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(10)
+    ids = [job['id'] for job in claimed if job is not None]
+    assert len(ids) == len(set(ids)) == 4
+
+
+def test_queue_limits_total_and_per_owner(store):
+    submit(store, 'a', count=2)
+    with pytest.raises(QueueFullError) as excinfo:
+        store.create('render_video', {}, owner='a', max_queued_per_owner=2)
+    assert excinfo.value.queued == 2
+    store.create('render_video', {}, owner='b', max_queued=3, max_queued_per_owner=2)
+    with pytest.raises(QueueFullError):
+        store.create('render_video', {}, owner='c', max_queued=3)
+    assert store.count(QUEUED) == 3
+
+
+def test_cancel_queued_and_requeue_stale(store):
+    queued, running = submit(store, 'a', count=2)
+    store.request_cancel(queued)
+    assert store.get(queued)['status'] == CANCELLED
+
+    assert store.claim_next('w')['id'] == running
+    assert store.requeue_stale(max_age=-1) == 1
+    assert store.get(running)['status'] == QUEUED
+
+
+def test_render_slots():
+    assert render_slots(2, cpu_count=8) == 4
+    assert render_slots(4, cpu_count=2) == 1
+    assert render_slots(0, cpu_count=3) == 3
@@ -0,0 +1,94 @@
+import random
+
+import pytest
+
+from utils.script_segmenter import partition, segment_script, split_sentences
+
+
+def prefix_sums(values):
+    prefix = [0]
+    for value in values:
+        prefix.append(prefix[-1] + value)
+    return prefix
+
+
+def best_max_sum(values, k):
+    """완전 탐색으로 구한 구간 합 최댓값의 최솟값 (작은 입력 검증용)"""
+    n = len(values)
+    best = None
+
+    def search(start, remaining, current):
+        nonlocal best
+        if remaining == 1:
+            candidate = max(current, sum(values[start:]))
+            best = candidate if best is None else min(best, candidate)
+            return
+        for end in range(start + 1, n - remaining + 2):
+            search(end, remaining - 1, max(current, sum(values[start:end])))
+
+    search(0, k, 0)
+    return best
+
+
+def group_sums(prefix, bounds):
+    return [prefix[end] - prefix[start] for start, end in zip(bounds, bounds[1:])]
+
+
+def test_partition_returns_k_non_empty_groups():
+    prefix = prefix_sums([3, 1, 4, 1, 5, 9, 2, 6])
+    bounds = partition(prefix, 3)
+    assert bounds[0] == 0 and bounds[-1] == 8
+    assert len(bounds) == 4
+    assert all(start < end for start, end in zip(bounds, bounds[1:]))
+
+
+@pytest.mark.parametrize('seed', range(20))
+def test_partition_minimizes_largest_group(seed):
+    rng = random.Random(seed)
+    values = [rng.randint(1, 50) for _ in range(rng.randint(1, 9))]
+    k = rng.randint(1, len(values))
+    prefix = prefix_sums(values)
+    bounds = partition(prefix, k)
+    assert len(bounds) == k + 1
+    assert max(group_sums(prefix, bounds)) == best_max_sum(values, k)
+
+
+def test_partition_prefers_even_cuts_under_the_limit():
+    # 최댓값(10)은 어떻게 나눠도 같지만 나머지는 남은 평균에 가깝게 자른다
+    prefix = prefix_sums([10, 1, 1, 1, 1, 1, 1])
+    assert group_sums(prefix, partition(prefix, 3)) == [10, 3, 3]
+
+
+def test_partition_clamps_group_count():
+    prefix = prefix_sums([1, 2])
+    assert partition(prefix, 5) == [0, 1, 2]
+    assert partition(prefix, 0) == [0, 2]
+
+
+def test_split_sentences_keeps_closing_quotes():
+    script = '첫 문장입니다. "두 번째!" 세 번째?\n마지막'
+    sentences = [script[start:end] for start, end in split_sentences(script)]
+    assert sentences == ['첫 문장입니다.', '"두 번째!"', '세 번째?', '마지막']
+
+
+def test_segment_script_cuts_on_sentence_boundaries():
+    script = 'One two. Three four. Five six. Seven eight.'
+    segments = segment_script(script, 2, estimate=lambda texts: [len(text) for text in texts])
+    assert [segment['text'] for segment in segments] == ['One two. Three four.', 'Five six. Seven eight.']
+    assert segments[0]['duration'] == pytest.approx(8 + 11)
+
+
+def test_segment_script_falls_back_to_words_and_pads():
+    estimate = lambda texts: [1.0] * len(texts)
+    assert [s['text'] for s in segment_script('alpha beta gamma', 3, estimate=estimate)] == ['alpha', 'beta', 'gamma']
+
+    segments = segment_script('ab', 4, estimate=estimate)
+    assert [s['text'] for s in segments] == ['a', 'b', '', '']
+    assert segments[-1]['duration'] == 0.0
+
+
+def test_segment_script_empty_inputs():
+    assert segment_script('anything', 0) == []
+    assert segment_script('   ', 2, estimate=lambda texts: []) == [
+        {'text': '', 'duration': 0.0}, {'text': '', 'duration': 0.0}
+    ]
@@ -0,0 +1,66 @@
+import math
+
+import pytest
+
+# routes.video는 AI 클라이언트(google-generativeai)를 가져온다
+pytest.importorskip('google.generativeai')
+
+from config import Config  # noqa: E402
+from routes.video import parse_durations, parse_image_count, parse_seconds  # noqa: E402
+
+
+@pytest.mark.parametrize('value, expected', [
+    (3, 3.0),
+    (2.5, 2.5),
+    ('4', 4.0),
+    (Config.SLIDESHOW_MAX_SLIDE_SECONDS, float(Config.SLIDESHOW_MAX_SLIDE_SECONDS)),
+])
+def test_parse_seconds_accepts_positive_numbers(value, expected):
+    assert parse_seconds(value) == expected
+
+
+@pytest.mark.parametrize('value', [
+    0, -1, True, False, None, 'abc', [], {},
+    math.nan, math.inf, -math.inf, 'NaN', 'Infinity',
+    Config.SLIDESHOW_MAX_SLIDE_SECONDS + 1,
+])
+def test_parse_seconds_rejects_invalid_values(value):
+    with pytest.raises(ValueError):
+        parse_seconds(value)
+
+
+@pytest.mark.parametrize('value, expected', [
+    (1, 1),
+    (5, 5),
+    (' 7 ', 7),
+    ('12', 12),
+    (Config.SLIDESHOW_MAX_IMAGES, Config.SLIDESHOW_MAX_IMAGES),
+])
+def test_parse_image_count_accepts_counts_in_range(value, expected):
+    assert parse_image_count(value) == expected
+
+
+@pytest.mark.parametrize('value', [
+    0, -3, True, 2.0, '2.5', '', 'ten', None, [3],
+    Config.SLIDESHOW_MAX_IMAGES + 1, str(Config.SLIDESHOW_MAX_IMAGES + 1),
+])
+def test_parse_image_count_rejects_invalid_values(value):
+    assert parse_image_count(value) is None
+
+
+def test_parse_durations_sources():
+    assert parse_durations({}, 2) is None
+    assert parse_durations({'durations': [1, '2.5']}, 2) == [1.0, 2.5]
+    assert parse_durations({'segment_timings': [{'duration': 3}, {'duration': 4}]}, 2) == [3.0, 4.0]
+
+
+@pytest.mark.parametrize('data', [
+    {'durations': [1]},
+    {'durations': 3},
+    {'segment_timings': 5},
+    {'segment_timings': [{'duration': 1}, {'start': 0}]},
+    {'segment_timings': [1, 2]},
+])
+def test_parse_durations_rejects_invalid_input(data):
+    with pytest.raises(ValueError):
+        parse_durations(data, 2)
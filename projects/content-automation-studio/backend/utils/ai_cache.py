@@ -0,0 +1,241 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from config import Config
+
+
+def make_cache_key(model, prompt, max_output_tokens, temperature):
+    """(모델, 프롬프트, 최대 토큰, temperature) 기준 캐시 키 생성"""
+    raw = f"{model}\x00{max_output_tokens}\x00{temperature}\x00{prompt}"
+    return hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+class _InFlight:
+    """동일 키에 대한 진행 중인 업스트림 호출"""
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class ResponseCache:
+    """AI 응답 캐시 (메모리 LRU + 선택적 SQLite 디스크 계층)"""
+
+    def __init__(self, max_bytes, ttl, db_path=None):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.db_path = db_path
+        self._entries = OrderedDict()  # key -> (text, expires_at, size)
+        self._bytes = 0
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'evictions': 0,
+            'expirations': 0
+        }
+
+        if self.db_path:
+            self._init_db()
+
+    def _init_db(self):
+        """디스크 계층 테이블 생성"""
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, text TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    def get(self, key):
+        """캐시 조회 (메모리 → 디스크 순)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                text, expires_at, _ = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats['memory_hits'] += 1
+                    return text
+                self._remove(key)
+                self._stats['expirations'] += 1
+
+        text = self._disk_get(key, now)
+        with self._lock:
+            if text is not None:
+                self._stats['disk_hits'] += 1
+                self._store(key, text, now)
+            else:
+                self._stats['misses'] += 1
+        return text
+
+    def set(self, key, text):
+        """캐시 저장"""
+        now = time.time()
+        with self._lock:
+            self._store(key, text, now)
+        self._disk_set(key, text, now)
+
+    def get_or_compute(self, key, compute):
+        """캐시 조회 후 없으면 compute() 실행 (동일 키 동시 요청은 업스트림 호출 1회로 합침)
+
+        compute()는 generate_text 형식의 결과 dict를 반환하며 성공한 결과만 저장된다.
+        반환값은 (결과 dict, 캐시 히트 여부) 이다.
+        """
+        text = self.get(key)
+        if text is not None:
+            return {'success': True, 'text': text}, True
+
+        flight, leader = self.join(key)
+        if not leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.result, False
+
+        result = error = None
+        try:
+            result = compute()
+            return result, False
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            self.finish(key, flight, result, error)
+
+    def join(self, key):
+        """같은 키로 진행 중인 업스트림 호출에 합류 → (_InFlight, leader 여부)
+
+        leader면 직접 호출한 뒤 finish()를 불러야 하고, 아니면 flight.event를 기다린다.
+        """
+        with self._lock:
+            flight = self._inflight.get(key)
+            if flight is None:
+                flight = _InFlight()
+                self._inflight[key] = flight
+                return flight, True
+            self._stats['coalesced'] += 1
+            return flight, False
+
+    def finish(self, key, flight, result=None, error=None):
+        """leader 호출 종료 (성공한 결과는 저장하고 기다리던 요청을 깨움)"""
+        try:
+            if result is not None and result.get('success'):
+                self.set(key, result['text'])
+            flight.result = result
+            flight.error = error
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            flight.event.set()
+
+    def stats(self):
+        """히트/미스/축출 카운터"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._bytes
+            stats['max_bytes'] = self.max_bytes
+            stats['disk_enabled'] = bool(self.db_path)
+        lookups = stats['memory_hits'] + stats['disk_hits'] + stats['misses']
+        stats['hit_ratio'] = round((stats['memory_hits'] + stats['disk_hits']) / lookups, 4) if lookups else 0.0
+        return stats
+
+    def clear(self):
+        """메모리 계층 비우기"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _store(self, key, text, now):
+        # self._lock을 잡은 상태에서 호출
+        size = len(text.encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = (text, now + self.ttl, size)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self._stats['evictions'] += 1
+
+    def _remove(self, key):
+        # self._lock을 잡은 상태에서 호출
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _disk_get(self, key, now):
+        if not self.db_path:
+            return None
+        try:
+            with self._connect() as conn:
+                row = conn.execute(
+                    'SELECT text, expires_at FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None:
+                    return None
+                if row[1] <= now:
+                    conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                    return None
+                return row[0]
+        except sqlite3.Error as e:
+            print(f"❌ AI 캐시 디스크 조회 실패: {e}")
+            return None
+
+    def _disk_set(self, key, text, now):
+        if not self.db_path:
+            return
+        try:
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, text, expires_at) VALUES (?, ?, ?)',
+                    (key, text, now + self.ttl)
+                )
+        except sqlite3.Error as e:
+            print(f"❌ AI 캐시 디스크 저장 실패: {e}")
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_response_cache():
+    """프로세스 공유 응답 캐시 (비활성화 시 None)"""
+    global _cache
+    if not Config.AI_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ResponseCache(
+                    max_bytes=Config.AI_CACHE_MAX_BYTES,
+                    ttl=Config.AI_CACHE_TTL,
+                    db_path=Config.AI_CACHE_DB_PATH or None
+                )
+    return _cache
+
+
+def _reset_after_fork():
+    global _cache, _cache_lock
+    # 부모의 진행 중 호출/락 상태를 물려받지 않도록 새로 생성
+    _cache_lock = threading.Lock()
+    _cache = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
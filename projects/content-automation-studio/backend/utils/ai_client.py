@@ -1,14 +1,126 @@
 import google.generativeai as genai
 import json
+import math
+import os
+import threading
+import time
 import requests
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from google.cloud import aiplatform
 from config import Config
+from utils.ai_cache import get_response_cache, make_cache_key
+
+# 이미지 프롬프트 생성에 사용하는 본문 앞부분 길이
+IMAGE_PROMPT_CONTEXT_CHARS = 500
+
+# 프로세스 전역 클라이언트 풀 (모델명 + 생성 설정 기준)
+_clients = {}
+_clients_lock = threading.Lock()
+_genai_lock = threading.Lock()
+_genai_configured = False
+# 여러 프롬프트 동시 생성에 쓰는 프로세스 공유 스레드 풀 (요청마다 새로 만들지 않음)
+_fanout_executor = None
+_fanout_lock = threading.Lock()
+
+
+def _configure_genai():
+    """genai.configure는 프로세스당 한 번만 호출"""
+    global _genai_configured
+    with _genai_lock:
+        if not _genai_configured:
+            genai.configure(api_key=Config.GEMINI_API_KEY)
+            _genai_configured = True
+
+
+def get_ai_client(model_name='gemini-pro', **generation_config):
+    """공유 AIClient 반환 (최초 호출 시 생성)"""
+    key = (model_name, tuple(sorted(generation_config.items())))
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = AIClient(model_name, generation_config or None)
+                _clients[key] = client
+    return client
+
+
+def get_fanout_executor():
+    """동시 생성용 공유 스레드 풀 (AI_FANOUT_CONCURRENCY개로 제한)"""
+    global _fanout_executor
+    if _fanout_executor is None:
+        with _fanout_lock:
+            if _fanout_executor is None:
+                _fanout_executor = ThreadPoolExecutor(
+                    max_workers=max(1, Config.AI_FANOUT_CONCURRENCY), thread_name_prefix='ai-fanout'
+                )
+    return _fanout_executor
+
+
+def reset_ai_clients():
+    """공유 클라이언트 초기화 (gunicorn fork 이후 gRPC 채널 재생성용)"""
+    global _clients_lock, _genai_lock, _genai_configured, _fanout_executor, _fanout_lock
+    # fork 시점에 다른 스레드가 잡고 있던 락을 물려받지 않도록 새로 만든다
+    _clients_lock = threading.Lock()
+    _genai_lock = threading.Lock()
+    _clients.clear()
+    _genai_configured = False
+    # 스레드 풀의 워커 스레드는 fork 되지 않으므로 자식 프로세스에서 새로 만든다
+    _fanout_lock = threading.Lock()
+    _fanout_executor = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=reset_ai_clients)
+
+
+def build_batch_prompt(prompts):
+    """여러 작업을 JSON 배열 하나로 답하도록 묶은 프롬프트 생성"""
+    tasks = [{'id': i, 'task': prompt.strip()} for i, prompt in enumerate(prompts)]
+    return f"""
+    You will receive {len(tasks)} independent tasks as a JSON array.
+    Complete each task separately and answer with ONLY a JSON array of exactly {len(tasks)} objects
+    in the form {{"id": <task id>, "text": "<answer>"}}, in the same order. Do not add any other text.
+
+    TASKS_JSON: {json.dumps(tasks, ensure_ascii=False)}
+    """
+
+
+def parse_batch_response(text, expected_count):
+    """배치 응답을 {위치: 텍스트} 로 파싱 (잘못된 항목은 제외)"""
+    text = (text or '').strip()
+    start, end = text.find('['), text.rfind(']')
+    if start == -1 or end <= start:
+        return {}
+    try:
+        items = json.loads(text[start:end + 1])
+    except ValueError:
+        return {}
+    if not isinstance(items, list):
+        return {}
+
+    parsed = {}
+    for position, item in enumerate(items):
+        if isinstance(item, dict):
+            index = item.get('id', position)
+            value = item.get('text')
+        else:
+            index, value = position, item
+        if (isinstance(index, int) and 0 <= index < expected_count and index not in parsed
+                and isinstance(value, str) and value.strip()):
+            parsed[index] = value.strip()
+    return parsed
+
 
 class AIClient:
-    def __init__(self):
-        # Gemini API 설정
-        genai.configure(api_key=Config.GEMINI_API_KEY)
-        self.gemini_model = genai.GenerativeModel('gemini-pro')
+    def __init__(self, model_name='gemini-pro', generation_config=None, model=None):
+        # Gemini API 설정 (model을 넘기면 해당 객체 사용 - 벤치마크용 가짜 모델 등)
+        self.model_name = model_name
+        if model is not None:
+            self.gemini_model = model
+        else:
+            _configure_genai()
+            self.gemini_model = genai.GenerativeModel(model_name, generation_config=generation_config)
 
         # Vertex AI 설정
         self.project_id = Config.GOOGLE_PROJECT_ID
@@ -25,20 +137,151 @@ class AIClient:
             print(f"Google AI 연결 실패: {e}")
             return False
 
-    def generate_text(self, prompt, max_length=1000):
-        """텍스트 생성 (Gemini)"""
+    def ping(self):
+        """모델 메타데이터 조회로 연결 확인 (생성 호출을 하지 않아 할당량 소모 없음)"""
+        name = self.model_name if self.model_name.startswith('models/') else f'models/{self.model_name}'
+        return genai.get_model(name) is not None
+
+    def generate_text(self, prompt, max_length=1000, temperature=0.7, use_cache=True, timeout=None):
+        """텍스트 생성 (Gemini, 응답 캐시 사용, timeout: 호출 제한 시간 초 - 기본값 AI_CALL_TIMEOUT)"""
+        cache = get_response_cache() if use_cache else None
+        if cache is None:
+            return self._generate_text_uncached(prompt, max_length, temperature, timeout)
+
+        key = make_cache_key(self.model_name, prompt, max_length, temperature)
+        result, hit = cache.get_or_compute(
+            key, lambda: self._generate_text_uncached(prompt, max_length, temperature, timeout)
+        )
+        if not result['success']:
+            return result
+        return {
+            'success': True,
+            'text': result['text'],
+            'model': self.model_name,
+            'cached': hit
+        }
+
+    def generate_texts(self, prompts, max_length=1000, max_workers=None, timeout=None, use_cache=True):
+        """여러 프롬프트 동시 생성 (입력 순서 유지, 호출별 제한 시간 초과 시 해당 항목만 실패)"""
+        if not prompts:
+            return []
+
+        max_workers = max(1, min(max_workers or Config.AI_FANOUT_CONCURRENCY, len(prompts)))
+        timeout = timeout or Config.AI_CALL_TIMEOUT
+        results = [None] * len(prompts)
+        started = {}
+
+        def run(index, prompt):
+            started[index] = time.monotonic()
+            # SDK에도 제한 시간을 넘겨 시간 초과된 호출이 공유 스레드를 계속 잡고 있지 않게 한다
+            return self.generate_text(prompt, max_length=max_length, use_cache=use_cache, timeout=timeout)
+
+        executor = get_fanout_executor()
+        waiting = list(enumerate(prompts))[::-1]
+        futures = {}
+        pending = set()
+        # 공유 풀이 다른 요청으로 가득 차 시작되지 못하는 경우를 위한 전체 상한
+        hard_deadline = time.monotonic() + timeout * math.ceil(len(prompts) / max_workers)
+
+        try:
+            while pending or waiting:
+                # 이 요청의 동시 호출은 max_workers개까지만 풀에 넣는다
+                while waiting and len(pending) < max_workers:
+                    index, prompt = waiting.pop()
+                    future = executor.submit(run, index, prompt)
+                    futures[future] = index
+                    pending.add(future)
+
+                now = time.monotonic()
+                for future in list(pending):
+                    index = futures[future]
+                    if future.done():
+                        pending.discard(future)
+                        try:
+                            results[index] = future.result()
+                        except Exception as e:
+                            results[index] = {'success': False, 'error': str(e)}
+                    elif now >= hard_deadline or (index in started and now - started[index] >= timeout):
+                        pending.discard(future)
+                        future.cancel()
+                        results[index] = {'success': False, 'error': f'Timed out after {timeout}s'}
+
+                if now >= hard_deadline:
+                    for index, _ in waiting:
+                        results[index] = {'success': False, 'error': f'Timed out after {timeout}s'}
+                    waiting = []
+
+                if not pending:
+                    continue
+
+                deadlines = [started[futures[f]] + timeout for f in pending if futures[f] in started]
+                next_deadline = min(deadlines + [hard_deadline])
+                # 새로 시작된 호출의 마감도 반영되도록 짧게 끊어서 대기
+                wait(pending, timeout=min(max(0, next_deadline - now), 0.25), return_when=FIRST_COMPLETED)
+        finally:
+            # 아직 시작하지 않은 호출은 취소, 시간 초과된 호출은 SDK 제한 시간 안에 끝나도록 두고 바로 반환
+            for future in pending:
+                future.cancel()
+
+        return results
+
+    def generate_batch(self, prompts, max_length=200, batch_size=None, use_cache=True):
+        """여러 프롬프트를 JSON 배열 응답 요청 하나로 묶어 생성
+
+        파싱에 실패한 항목만 개별 호출로 다시 생성한다.
+        """
+        if not prompts:
+            return []
+
+        batch_size = max(1, batch_size or Config.AI_BATCH_SIZE)
+        chunks = [list(range(start, min(start + batch_size, len(prompts))))
+                  for start in range(0, len(prompts), batch_size)]
+        batch_prompts = [build_batch_prompt([prompts[i] for i in chunk]) for chunk in chunks]
+        # 배치 응답 길이 = 항목당 길이 * 항목 수 + JSON 여유분
+        batch_results = self.generate_texts(
+            batch_prompts,
+            max_length=min(max_length * batch_size + 256, Config.AI_BATCH_MAX_OUTPUT_TOKENS),
+            use_cache=use_cache
+        )
+
+        results = [None] * len(prompts)
+        for chunk, batch_result in zip(chunks, batch_results):
+            items = parse_batch_response(batch_result['text'], len(chunk)) if batch_result['success'] else {}
+            for position, index in enumerate(chunk):
+                if position in items:
+                    results[index] = {
+                        'success': True,
+                        'text': items[position],
+                        'model': self.model_name,
+                        'batched': True
+                    }
+
+        retry_indexes = [i for i, result in enumerate(results) if result is None]
+        if retry_indexes:
+            retried = self.generate_texts(
+                [prompts[i] for i in retry_indexes], max_length=max_length, use_cache=use_cache
+            )
+            for index, result in zip(retry_indexes, retried):
+                result['batched'] = False
+                results[index] = result
+
+        return results
+
+    def _generate_text_uncached(self, prompt, max_length, temperature, timeout=None):
+        """Gemini 직접 호출 (timeout 초가 지나면 SDK가 요청을 중단)"""
         try:
             response = self.gemini_model.generate_content(
                 prompt,
                 generation_config=genai.types.GenerationConfig(
                     max_output_tokens=max_length,
-                    temperature=0.7,
-                )
+                    temperature=temperature,
+                ),
+                request_options={'timeout': timeout or Config.AI_CALL_TIMEOUT}
             )
             return {
                 'success': True,
                 'text': response.text,
-                'model': 'gemini-pro'
+                'model': self.model_name
             }
         except Exception as e:
             return {
@@ -46,8 +289,63 @@ class AIClient:
                 'error': str(e)
             }
 
-    def generate_blog_post(self, topic, keywords=None):
-        """블로그 글 생성"""
+    def stream_text(self, prompt, max_length=1000, temperature=0.7, use_cache=True, meta=None):
+        """텍스트 스트리밍 생성 (Gemini가 만드는 대로 조각을 yield, 캐시 히트 시 전체 텍스트 한 번에)
+
+        같은 프롬프트를 이미 생성 중인 요청이 있으면 그 결과를 기다렸다가 전체 텍스트를 한 번에 yield 한다.
+        meta dict를 넘기면 캐시 히트 여부가 meta['cached'] 에 기록된다.
+        """
+        meta = meta if meta is not None else {}
+        meta['cached'] = False
+        cache = get_response_cache() if use_cache else None
+        key = make_cache_key(self.model_name, prompt, max_length, temperature)
+        flight = None
+        if cache is not None:
+            text = cache.get(key)
+            if text is not None:
+                meta['cached'] = True
+                yield text
+                return
+
+            flight, leader = cache.join(key)
+            if not leader:
+                flight.event.wait()
+                if flight.error is not None:
+                    raise flight.error
+                if flight.result is not None and flight.result.get('success'):
+                    yield flight.result['text']
+                    return
+                # 먼저 시작한 스트림이 중간에 끊긴 경우 직접 호출
+                flight = None
+
+        parts = []
+        result = error = None
+        try:
+            response = self.gemini_model.generate_content(
+                prompt,
+                generation_config=genai.types.GenerationConfig(
+                    max_output_tokens=max_length,
+                    temperature=temperature,
+                ),
+                stream=True
+            )
+            for chunk in response:
+                text = chunk.text
+                if text:
+                    parts.append(text)
+                    yield text
+            # 끝까지 받은 응답만 캐시에 저장
+            if parts:
+                result = {'success': True, 'text': ''.join(parts)}
+        except Exception as e:
+            error = e
+            raise
+        finally:
+            if flight is not None:
+                cache.finish(key, flight, result, error)
+
+    def _blog_post_prompt(self, topic, keywords=None):
+        """블로그 글 생성 프롬프트"""
         base_prompt = f"""
         다음 주제에 대한 전문적이고 흥미로운 블로그 글을 작성해주세요:
 
@@ -73,14 +371,73 @@ class AIClient:
         [본문 내용]
         """
 
-        return self.generate_text(base_prompt, max_length=2000)
+        return base_prompt
+
+    def generate_blog_post(self, topic, keywords=None, use_cache=True):
+        """블로그 글 생성"""
+        return self.generate_text(self._blog_post_prompt(topic, keywords), max_length=2000, use_cache=use_cache)
+
+    def stream_blog_post(self, topic, keywords=None, use_cache=True, meta=None):
+        """블로그 글 스트리밍 생성 (텍스트 조각 yield)"""
+        return self.stream_text(
+            self._blog_post_prompt(topic, keywords), max_length=2000, use_cache=use_cache, meta=meta
+        )
+
+    def stream_blog_post_with_image_prompt(self, topic, keywords=None, use_cache=True, meta=None):
+        """블로그 글 스트리밍 + 이미지 프롬프트 병행 생성
+
+        본문이 IMAGE_PROMPT_CONTEXT_CHARS 자에 도달하는 즉시 이미지 프롬프트 생성을 시작해
+        나머지 본문 생성과 겹쳐 실행한다. ('token', 조각) 을 yield 하고 마지막에
+        ('image_prompt', 프롬프트) 를 yield 한다. meta dict를 넘기면 캐시 히트 여부(cached)와
+        구간별 소요 시간(timings, ms)이 기록된다.
+        """
+        meta = meta if meta is not None else {}
+        timings = meta['timings'] = {}
+        started = time.monotonic()
+
+        def elapsed_ms():
+            return round((time.monotonic() - started) * 1000, 1)
+
+        executor = ThreadPoolExecutor(max_workers=1)
+        image_future = None
+        length = 0
+        parts = []
+
+        def image_prompt_task(content):
+            task_started = time.monotonic()
+            prompt = self.generate_image_prompt(content, use_cache=use_cache)
+            timings['image_prompt_ms'] = round((time.monotonic() - task_started) * 1000, 1)
+            return prompt
+
+        try:
+            for text in self.stream_blog_post(topic, keywords, use_cache=use_cache, meta=meta):
+                if 'first_token_ms' not in timings:
+                    timings['first_token_ms'] = elapsed_ms()
+                parts.append(text)
+                length += len(text)
+                if image_future is None and length >= IMAGE_PROMPT_CONTEXT_CHARS:
+                    timings['image_prompt_started_ms'] = elapsed_ms()
+                    image_future = executor.submit(image_prompt_task, ''.join(parts))
+                yield 'token', text
+            timings['blog_ms'] = elapsed_ms()
+
+            # 본문이 짧아 끝날 때까지 기준 길이에 못 미친 경우
+            if image_future is None:
+                timings['image_prompt_started_ms'] = elapsed_ms()
+                image_future = executor.submit(image_prompt_task, ''.join(parts))
+
+            image_prompt = image_future.result()
+            timings['total_ms'] = elapsed_ms()
+            yield 'image_prompt', image_prompt
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
 
-    def generate_image_prompt(self, content):
+    def generate_image_prompt(self, content, use_cache=True):
         """이미지 생성 프롬프트 생성"""
         prompt = f"""
         다음 블로그 내용에 어울리는 전문적인 이미지를 생성하기 위한 프롬프트를 영어로 작성해주세요:
 
-        내용: {content[:500]}...
+        내용: {content[:IMAGE_PROMPT_CONTEXT_CHARS]}...
 
         요구사항:
         1. 구체적이고 시각적인 묘사
@@ -93,13 +450,13 @@ class AIClient:
         A professional photograph of [주요 대상], [스타일], [조명], [배경], [구도]
         """
 
-        result = self.generate_text(prompt, max_length=300)
+        result = self.generate_text(prompt, max_length=300, use_cache=use_cache)
         if result['success']:
             return result['text'].strip()
         else:
             return "A professional photograph related to the topic, clean and modern style"
 
-    def generate_tts_script(self, content):
+    def generate_tts_script(self, content, use_cache=True):
         """TTS용 스크립트 생성"""
         prompt = f"""
         다음 블로그 내용을 영상 narration용으로 자연스럽게 읽을 수 있는 스크립트로 변환해주세요:
@@ -117,4 +474,4 @@ class AIClient:
         [자연스러운 구어체 스크립트]
         """
 
-        return self.generate_text(prompt, max_length=500)
\ No newline at end of file
+        return self.generate_text(prompt, max_length=500, use_cache=use_cache)
\ No newline at end of file
@@ -0,0 +1,248 @@
+import hashlib
+import os
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+from config import Config
+
+
+def parse_cache_control(value):
+    """Cache-Control 헤더를 {지시어: 값} 으로 (값 없는 지시어는 None, 소문자 키)"""
+    directives = {}
+    for part in (value or '').split(','):
+        name, _, argument = part.strip().partition('=')
+        if name:
+            directives[name.lower()] = argument.strip().strip('"') or None
+    return directives
+
+
+def is_storable(headers):
+    """응답을 캐시에 저장해도 되는지 (no-store, private이면 False)"""
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    # 여러 렌더 작업이 함께 쓰는 공유 캐시이므로 private 응답도 저장하지 않는다
+    return 'no-store' not in directives and 'private' not in directives
+
+
+def freshness_lifetime(headers, default=None):
+    """응답을 재검증 없이 쓸 수 있는 시간 (초)
+
+    no-cache면 0 (매번 재검증), s-maxage/max-age가 있으면 그 값, 없으면 default.
+    """
+    directives = parse_cache_control(headers.get('Cache-Control'))
+    if 'no-cache' in directives:
+        return 0
+    for name in ('s-maxage', 'max-age'):
+        if name in directives:
+            try:
+                return max(0, int(directives[name]))
+            except (TypeError, ValueError):
+                return 0
+    return default
+
+
+class AssetCache:
+    """원격 자산(URL) 로컬 디스크 캐시 (ETag/Last-Modified 조건부 재검증, 용량 기준 LRU 축출)
+
+    download(url, tmp_path, headers)는 (HTTP 상태, 응답 헤더, 받은 바이트 수)를 반환해야 하며
+    200이면 tmp_path에 본문을 저장한다. 304면 캐시된 파일을 그대로 쓴다.
+    응답의 Cache-Control을 따른다 (no-store/private은 저장 안 함, max-age 동안 재검증 생략,
+    no-cache는 매번 재검증, 지시어가 없으면 revalidate_after초).
+    """
+
+    EXTRA_COLUMNS = {
+        'max_age': 'REAL'
+    }
+
+    def __init__(self, root, max_bytes, revalidate_after):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.revalidate_after = revalidate_after
+        self.db_path = os.path.join(root, 'index.sqlite3')
+        self._lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'revalidated': 0,
+            'misses': 0,
+            'evictions': 0,
+            'bytes_saved': 0,
+            'bytes_downloaded': 0
+        }
+        os.makedirs(self.root, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS assets ('
+                'key TEXT PRIMARY KEY, url TEXT NOT NULL, etag TEXT, last_modified TEXT, '
+                'size INTEGER NOT NULL, validated_at REAL NOT NULL, accessed_at REAL NOT NULL)'
+            )
+            # 이전 버전에서 만든 파일에 없는 열 추가
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(assets)')}
+            for name, definition in self.EXTRA_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f'ALTER TABLE assets ADD COLUMN {name} {definition}')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key)
+
+    def fetch(self, url, dest_path, download):
+        """URL 내용을 dest_path에 준비 (캐시 히트면 네트워크 전송 없음)
+
+        반환값: {'success': bool, 'path', 'bytes', 'cache': 'hit'|'revalidated'|'miss'|None} 또는 {'success': False, 'error'}
+        (None: 저장하면 안 되는 응답이라 캐시를 거치지 않음)
+        """
+        key = hashlib.sha256(url.encode('utf-8')).hexdigest()
+        path = self._path(key)
+        entry = self._get(key)
+        if entry is not None and not os.path.exists(path):
+            self._delete(key)
+            entry = None
+
+        now = time.time()
+        if entry is not None and now - entry['validated_at'] < self._max_age(entry):
+            return self._serve(key, entry, dest_path, 'hit')
+
+        headers = {}
+        if entry is not None:
+            if entry['etag']:
+                headers['If-None-Match'] = entry['etag']
+            if entry['last_modified']:
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        try:
+            status, response_headers, size = download(url, tmp_path, headers)
+            if status == 304 and entry is not None:
+                # 304에 Cache-Control이 없으면 저장된 응답의 값을 그대로 쓴다
+                if not is_storable(response_headers):
+                    result = self._serve(key, entry, dest_path, 'revalidated')
+                    self._delete(key)
+                    return result
+                max_age = entry['max_age']
+                if response_headers.get('Cache-Control'):
+                    max_age = freshness_lifetime(response_headers)
+                with self._connect() as conn:
+                    conn.execute(
+                        'UPDATE assets SET validated_at = ?, max_age = ? WHERE key = ?', (now, max_age, key)
+                    )
+                return self._serve(key, entry, dest_path, 'revalidated')
+            if status != 200:
+                return {'success': False, 'error': f"HTTP {status}", 'status': status}
+
+            with self._lock:
+                self._stats['misses'] += 1
+                self._stats['bytes_downloaded'] += size
+
+            if not is_storable(response_headers):
+                # 저장 금지 응답: 이전에 저장한 내용도 지우고 대상 경로로 바로 이동
+                if entry is not None:
+                    self._delete(key)
+                os.replace(tmp_path, dest_path)
+                return {'success': True, 'path': dest_path, 'bytes': size, 'cache': None}
+
+            # 원자적 교체: 읽는 쪽은 항상 완성된 파일만 본다
+            os.replace(tmp_path, path)
+            with self._connect() as conn:
+                conn.execute(
+                    'INSERT OR REPLACE INTO assets '
+                    '(key, url, etag, last_modified, size, validated_at, accessed_at, max_age) '
+                    'VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                    (key, url, response_headers.get('ETag'), response_headers.get('Last-Modified'),
+                     size, now, now, freshness_lifetime(response_headers))
+                )
+            self._evict()
+            _copy_or_link(path, dest_path)
+            return {'success': True, 'path': dest_path, 'bytes': size, 'cache': 'miss'}
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+    def _max_age(self, entry):
+        """저장된 항목의 신선도 유지 시간 (응답에 지시어가 없었으면 revalidate_after)"""
+        return self.revalidate_after if entry['max_age'] is None else entry['max_age']
+
+    def _serve(self, key, entry, dest_path, kind):
+        _copy_or_link(self._path(key), dest_path)
+        with self._connect() as conn:
+            conn.execute('UPDATE assets SET accessed_at = ? WHERE key = ?', (time.time(), key))
+        with self._lock:
+            self._stats['hits' if kind == 'hit' else 'revalidated'] += 1
+            self._stats['bytes_saved'] += entry['size']
+        return {'success': True, 'path': dest_path, 'bytes': entry['size'], 'cache': kind}
+
+    def _get(self, key):
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM assets WHERE key = ?', (key,)).fetchone()
+        return dict(row) if row else None
+
+    def _delete(self, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM assets WHERE key = ?', (key,))
+        try:
+            os.unlink(self._path(key))
+        except FileNotFoundError:
+            pass
+
+    def _evict(self):
+        """용량 예산을 넘으면 가장 오래 안 쓴 항목부터 삭제"""
+        with self._connect() as conn:
+            total = conn.execute('SELECT COALESCE(SUM(size), 0) FROM assets').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            rows = conn.execute('SELECT key, size FROM assets ORDER BY accessed_at').fetchall()
+
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            self._delete(key)
+            total -= size
+            with self._lock:
+                self._stats['evictions'] += 1
+
+    def stats(self):
+        """히트율과 절약한 전송량"""
+        with self._lock:
+            stats = dict(self._stats)
+        with self._connect() as conn:
+            stats['entries'], stats['bytes'] = conn.execute(
+                'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM assets'
+            ).fetchone()
+        stats['max_bytes'] = self.max_bytes
+        lookups = stats['hits'] + stats['revalidated'] + stats['misses']
+        stats['hit_ratio'] = round((stats['hits'] + stats['revalidated']) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def _copy_or_link(source, dest):
+    """캐시 파일을 대상 경로에 하드 링크 (다른 파일 시스템이면 복사)"""
+    if os.path.exists(dest):
+        os.unlink(dest)
+    try:
+        os.link(source, dest)
+    except OSError:
+        shutil.copyfile(source, dest)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_asset_cache():
+    """프로세스 공유 자산 캐시 (비활성화 시 None)"""
+    global _cache
+    if not Config.ASSET_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AssetCache(
+                    Config.ASSET_CACHE_DIR,
+                    max_bytes=Config.ASSET_CACHE_MAX_BYTES,
+                    revalidate_after=Config.ASSET_CACHE_REVALIDATE_AFTER
+                )
+    return _cache
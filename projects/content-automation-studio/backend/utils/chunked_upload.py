@@ -0,0 +1,201 @@
+import hashlib
+import json
+import math
+import os
+import shutil
+import time
+import uuid
+from config import Config
+
+COPY_BUFFER_SIZE = 256 * 1024
+
+
+class UploadError(Exception):
+    """청크 업로드 요청 오류 (status는 응답 HTTP 코드)"""
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.status = status
+
+
+class ConcatReader:
+    """청크 파일들을 순서대로 이어 읽는 파일 객체 (조립 파일 없이 업로드 본문으로 사용)"""
+
+    def __init__(self, paths):
+        self.paths = list(paths)
+        self._current = None
+
+    def read(self, size=-1):
+        while self.paths or self._current:
+            if self._current is None:
+                self._current = open(self.paths.pop(0), 'rb')
+            data = self._current.read(size)
+            if data:
+                return data
+            self._current.close()
+            self._current = None
+        return b''
+
+    def close(self):
+        if self._current:
+            self._current.close()
+            self._current = None
+
+
+class ChunkedUploadStore:
+    """재개 가능한 청크 업로드 세션 저장소 (로컬 디스크, 업로드별 폴더 + manifest.json)
+
+    청크는 chunk_000000 형식 파일로 저장되며 완성된 청크만 이름이 바뀌므로
+    같은 업로드의 청크를 여러 요청이 동시에 보내도 안전하다.
+    """
+
+    def __init__(self, root, chunk_size, max_size, ttl):
+        self.root = root
+        self.chunk_size = chunk_size
+        self.max_size = max_size
+        self.ttl = ttl
+        os.makedirs(self.root, exist_ok=True)
+
+    def _dir(self, upload_id):
+        # 경로 조작 방지: uuid hex만 허용
+        if not upload_id or not all(c in '0123456789abcdef' for c in upload_id):
+            raise UploadError('Upload not found', 404)
+        return os.path.join(self.root, upload_id)
+
+    def _chunk_path(self, upload_id, index):
+        return os.path.join(self._dir(upload_id), f"chunk_{index:06d}")
+
+    def create(self, filename, size, chunk_size=None):
+        """업로드 세션 생성"""
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in Config.UPLOAD_EXTENSIONS:
+            raise UploadError(f'Unsupported file type: {ext}')
+        if not isinstance(size, int) or size <= 0:
+            raise UploadError('Size must be a positive integer')
+        if size > self.max_size:
+            raise UploadError(f'File is larger than {self.max_size} bytes', 413)
+        if chunk_size is not None and (not isinstance(chunk_size, int) or chunk_size <= 0):
+            raise UploadError('Chunk size must be a positive integer')
+
+        # 한 청크가 요청 본문 제한을 넘지 않도록 제한
+        chunk_size = min(chunk_size or self.chunk_size, Config.MAX_CONTENT_LENGTH)
+        self.cleanup_expired()
+
+        upload_id = uuid.uuid4().hex
+        os.makedirs(self._dir(upload_id))
+        manifest = {
+            'id': upload_id,
+            'filename': os.path.basename(filename),
+            'size': size,
+            'chunk_size': chunk_size,
+            'total_chunks': math.ceil(size / chunk_size),
+            'created_at': time.time()
+        }
+        with open(os.path.join(self._dir(upload_id), 'manifest.json'), 'w') as f:
+            json.dump(manifest, f)
+        return self.status(upload_id)
+
+    def manifest(self, upload_id):
+        try:
+            with open(os.path.join(self._dir(upload_id), 'manifest.json')) as f:
+                return json.load(f)
+        except FileNotFoundError:
+            raise UploadError('Upload not found', 404)
+
+    def status(self, upload_id):
+        """세션 정보 + 받은 청크 목록 (재개 시 빠진 청크만 다시 보내면 됨)"""
+        manifest = self.manifest(upload_id)
+        received = self.received_chunks(upload_id)
+        received_set = set(received)
+        manifest['received_chunks'] = received
+        manifest['missing_chunks'] = [i for i in range(manifest['total_chunks']) if i not in received_set]
+        return manifest
+
+    def received_chunks(self, upload_id):
+        names = os.listdir(self._dir(upload_id))
+        return sorted(int(name[6:]) for name in names if name.startswith('chunk_') and name[6:].isdigit())
+
+    def write_chunk(self, upload_id, index, stream, expected_sha256=None):
+        """청크 N 저장 (같은 청크를 다시 보내면 덮어씀)"""
+        manifest = self.manifest(upload_id)
+        if not 0 <= index < manifest['total_chunks']:
+            raise UploadError(f"Chunk index must be between 0 and {manifest['total_chunks'] - 1}")
+
+        last = index == manifest['total_chunks'] - 1
+        expected_size = manifest['size'] - index * manifest['chunk_size'] if last else manifest['chunk_size']
+
+        path = self._chunk_path(upload_id, index)
+        tmp_path = f"{path}.{uuid.uuid4().hex[:8]}.part"
+        digest = hashlib.sha256()
+        size = 0
+        try:
+            with open(tmp_path, 'wb') as f:
+                while True:
+                    data = stream.read(COPY_BUFFER_SIZE)
+                    if not data:
+                        break
+                    size += len(data)
+                    if size > expected_size:
+                        raise UploadError(f'Chunk {index} is larger than {expected_size} bytes')
+                    digest.update(data)
+                    f.write(data)
+
+            if size != expected_size:
+                raise UploadError(f'Chunk {index} must be {expected_size} bytes, got {size}')
+            if expected_sha256 and digest.hexdigest() != expected_sha256.lower():
+                raise UploadError(f'Chunk {index} checksum mismatch')
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+
+        return {'index': index, 'size': size, 'sha256': digest.hexdigest()}
+
+    def open_assembled(self, upload_id):
+        """모든 청크가 있으면 (manifest, 이어 읽기 스트림) 반환"""
+        status = self.status(upload_id)
+        if status['missing_chunks']:
+            raise UploadError(f"Missing chunks: {status['missing_chunks'][:20]}", 409)
+        paths = [self._chunk_path(upload_id, i) for i in range(status['total_chunks'])]
+        return status, ConcatReader(paths)
+
+    def sha256(self, upload_id):
+        """모든 청크를 이은 내용의 SHA-256 (로컬 디스크에서 계산)"""
+        _, stream = self.open_assembled(upload_id)
+        digest = hashlib.sha256()
+        try:
+            for data in iter(lambda: stream.read(COPY_BUFFER_SIZE), b''):
+                digest.update(data)
+        finally:
+            stream.close()
+        return digest.hexdigest()
+
+    def delete(self, upload_id):
+        shutil.rmtree(self._dir(upload_id), ignore_errors=True)
+
+    def cleanup_expired(self):
+        """TTL이 지난 미완료 세션 삭제"""
+        cutoff = time.time() - self.ttl
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                pass
+
+
+_store = None
+
+
+def get_upload_store():
+    """프로세스 공유 청크 업로드 저장소"""
+    global _store
+    if _store is None:
+        _store = ChunkedUploadStore(
+            Config.UPLOAD_CHUNK_DIR,
+            chunk_size=Config.UPLOAD_CHUNK_SIZE,
+            max_size=Config.UPLOAD_MAX_SIZE,
+            ttl=Config.UPLOAD_SESSION_TTL
+        )
+    return _store
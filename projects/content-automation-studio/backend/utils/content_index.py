@@ -0,0 +1,98 @@
+import os
+import sqlite3
+import threading
+import time
+from config import Config
+
+
+class ContentIndex:
+    """내용 해시(SHA-256) → WebDAV 원격 경로 색인 (참조 수 포함, SQLite)"""
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS objects ('
+                'digest TEXT PRIMARY KEY, remote_path TEXT NOT NULL UNIQUE, size INTEGER NOT NULL, '
+                'refcount INTEGER NOT NULL, created_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def get(self, digest):
+        """해시로 조회 (없으면 None)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM objects WHERE digest = ?', (digest,)).fetchone()
+        return dict(row) if row else None
+
+    def get_by_path(self, remote_path):
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM objects WHERE remote_path = ?', (remote_path,)).fetchone()
+        return dict(row) if row else None
+
+    def add_ref(self, digest):
+        """참조 수 +1 후 항목 반환 (없으면 None)"""
+        with self._connect() as conn:
+            cursor = conn.execute('UPDATE objects SET refcount = refcount + 1 WHERE digest = ?', (digest,))
+        return self.get(digest) if cursor.rowcount else None
+
+    def insert(self, digest, remote_path, size):
+        """새 객체 등록 (참조 수 1), 이미 있으면 참조 수 +1 하고 기존 항목 반환"""
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT INTO objects (digest, remote_path, size, refcount, created_at) VALUES (?, ?, ?, 1, ?) '
+                'ON CONFLICT(digest) DO UPDATE SET refcount = refcount + 1',
+                (digest, remote_path, size, time.time())
+            )
+        return self.get(digest)
+
+    def release(self, remote_path):
+        """참조 수 -1, 0이 되면 항목을 지우고 True 반환 (원격 객체도 지워야 함)
+
+        색인에 없는 경로면 None.
+        """
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            row = conn.execute('SELECT refcount FROM objects WHERE remote_path = ?', (remote_path,)).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            if row[0] <= 1:
+                conn.execute('DELETE FROM objects WHERE remote_path = ?', (remote_path,))
+                released = True
+            else:
+                conn.execute('UPDATE objects SET refcount = refcount - 1 WHERE remote_path = ?', (remote_path,))
+                released = False
+            conn.execute('COMMIT')
+            return released
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def forget(self, digest):
+        """원격 객체가 사라진 항목 제거"""
+        with self._connect() as conn:
+            conn.execute('DELETE FROM objects WHERE digest = ?', (digest,))
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_content_index():
+    """프로세스 공유 내용 해시 색인"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = ContentIndex(Config.WEBDAV_DEDUP_DB_PATH)
+    return _index
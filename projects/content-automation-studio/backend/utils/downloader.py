@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from config import Config
+from utils.asset_cache import get_asset_cache
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_http_session():
+    """프로세스 공유 keep-alive HTTP 세션 (연결 풀 재사용)"""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=Config.ASSET_DOWNLOAD_CONCURRENCY,
+                    pool_maxsize=Config.ASSET_DOWNLOAD_CONCURRENCY
+                )
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                _session = session
+    return _session
+
+
+def download_to_file(url, path, timeout=None, retries=None, chunk_size=None, use_cache=True, session=None):
+    """URL을 청크 단위로 파일에 저장 (메모리 사용량 고정, 실패 시 재시도, 자산 캐시 사용)
+
+    반환값: {'success': bool, 'path', 'bytes', 'cache'} 또는 {'success': False, 'error'}
+    """
+    timeout = timeout or Config.ASSET_DOWNLOAD_TIMEOUT
+    retries = Config.ASSET_DOWNLOAD_RETRIES if retries is None else retries
+    chunk_size = chunk_size or Config.ASSET_DOWNLOAD_CHUNK_SIZE
+    session = session or get_http_session()
+    cache = get_asset_cache() if use_cache else None
+
+    def download(url, tmp_path, headers):
+        return _download_once(session, url, tmp_path, headers, timeout, chunk_size)
+
+    error = None
+    for attempt in range(retries + 1):
+        if attempt:
+            time.sleep(min(2 ** (attempt - 1) * 0.5, 5))
+        try:
+            if cache is not None:
+                result = cache.fetch(url, path, download)
+            else:
+                result = _download_direct(url, path, download)
+            if result['success']:
+                return result
+
+            error = result['error']
+            status = result.get('status', 0)
+            # 4xx는 다시 시도해도 결과가 같음
+            if 400 <= status < 500 and status != 429:
+                break
+        except (requests.RequestException, OSError) as e:
+            error = str(e)
+
+    print(f"❌ 다운로드 실패 ({url}): {error}")
+    return {'success': False, 'error': error}
+
+
+def _download_direct(url, path, download):
+    """캐시 없이 임시 파일로 받은 뒤 원자적으로 이름 변경"""
+    tmp_path = f"{path}.part"
+    try:
+        status, _, size = download(url, tmp_path, {})
+        if status != 200:
+            return {'success': False, 'error': f"HTTP {status}", 'status': status}
+        os.replace(tmp_path, path)
+        return {'success': True, 'path': path, 'bytes': size, 'cache': None}
+    finally:
+        if os.path.exists(tmp_path):
+            os.unlink(tmp_path)
+
+
+def _download_once(session, url, tmp_path, headers, timeout, chunk_size):
+    """GET 한 번 (200이면 tmp_path에 저장) → (상태 코드, 응답 헤더, 바이트 수)"""
+    with session.get(url, headers=headers, stream=True, timeout=timeout) as response:
+        if response.status_code != 200:
+            return response.status_code, response.headers, 0
+
+        size = 0
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=chunk_size):
+                f.write(chunk)
+                size += len(chunk)
+        return 200, response.headers, size
+
+
+def download_all(items, max_workers=None, **kwargs):
+    """(url, path) 목록을 동시에 다운로드 (입력 순서대로 결과 반환)"""
+    if not items:
+        return []
+    max_workers = max(1, min(max_workers or Config.ASSET_DOWNLOAD_CONCURRENCY, len(items)))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(download_to_file, url, path, **kwargs) for url, path in items]
+        return [future.result() for future in futures]
+
+
+def _reset_after_fork():
+    global _session, _session_lock
+    # 부모의 소켓을 자식이 같이 쓰지 않도록 세션을 새로 만든다
+    _session_lock = threading.Lock()
+    _session = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,57 @@
+class ProgressParser:
+    """ffmpeg -progress 출력(key=value 줄) 파서
+
+    progress=continue|end 줄로 블록이 끝날 때마다 스냅샷을 반환한다.
+    expected_duration(초)을 주면 out_time 기준 진행률(%)도 계산한다.
+    """
+
+    def __init__(self, expected_duration=None):
+        self.expected_duration = expected_duration
+        self._block = {}
+        self.last = None
+
+    def feed(self, line):
+        """한 줄 처리 → 블록이 끝났으면 스냅샷 dict, 아니면 None"""
+        key, sep, value = line.strip().partition('=')
+        if not sep:
+            return None
+        if key != 'progress':
+            self._block[key] = value
+            return None
+
+        block, self._block = self._block, {}
+        done = value == 'end'
+        out_time = _microseconds(block.get('out_time_us', block.get('out_time_ms')))
+        if out_time is None and self.last is not None:
+            out_time = self.last['out_time']
+
+        percent = None
+        if done:
+            percent = 100.0
+        elif self.expected_duration and out_time is not None:
+            percent = round(min(99.9, out_time / self.expected_duration * 100), 1)
+
+        self.last = {
+            'out_time': out_time,
+            'frame': _number(block.get('frame'), int),
+            'fps': _number(block.get('fps'), float),
+            'speed': _number((block.get('speed') or '').rstrip('x'), float),
+            'total_size': _number(block.get('total_size'), int),
+            'percent': percent,
+            'done': done
+        }
+        return self.last
+
+
+def _microseconds(value):
+    # out_time_ms도 실제 단위는 마이크로초
+    number = _number(value, int)
+    return round(number / 1_000_000, 3) if number is not None and number >= 0 else None
+
+
+def _number(value, cast):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        # 'N/A' 또는 빈 값
+        return None
@@ -0,0 +1,178 @@
+import base64
+import json
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from config import Config
+
+SORT_COLUMNS = {
+    'name': 'name',
+    'size': 'size',
+    'modified': 'modified'
+}
+
+
+def _normalize(path):
+    return posixpath.normpath('/' + (path or '').strip('/'))
+
+
+class FileIndex:
+    """WebDAV 파일 메타데이터 색인 (SQLite)
+
+    폴더 목록은 Depth:1 PROPFIND 한 번으로 채우고, 이 서비스의 업로드/삭제가 바로 반영한다.
+    """
+
+    def __init__(self, db_path, ttl):
+        self.db_path = db_path
+        self.ttl = ttl
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS entries ('
+                'path TEXT PRIMARY KEY, parent TEXT NOT NULL, name TEXT NOT NULL, '
+                'size INTEGER NOT NULL, modified TEXT NOT NULL, is_directory INTEGER NOT NULL, etag TEXT)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS entries_parent_name ON entries (parent, name)')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS folders (path TEXT PRIMARY KEY, listed_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def is_fresh(self, folder):
+        """TTL 안에 목록을 받아둔 폴더인지"""
+        with self._connect() as conn:
+            row = conn.execute('SELECT listed_at FROM folders WHERE path = ?', (_normalize(folder),)).fetchone()
+        return row is not None and row[0] > time.time() - self.ttl
+
+    def replace_folder(self, folder, entries):
+        """PROPFIND 결과로 폴더의 하위 항목 전체 교체"""
+        folder = _normalize(folder)
+        rows = [self._row(entry) for entry in entries if _normalize(entry['path']) != folder]
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            conn.execute('DELETE FROM entries WHERE parent = ?', (folder,))
+            conn.executemany('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)', rows)
+            conn.execute('INSERT OR REPLACE INTO folders VALUES (?, ?)', (folder, time.time()))
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+
+    def upsert(self, entry):
+        """업로드/폴더 생성 결과 반영"""
+        with self._connect() as conn:
+            conn.execute('INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?)', self._row(entry))
+
+    def record_file(self, remote_path, size, is_directory=False):
+        self.upsert({
+            'path': remote_path,
+            'size': size,
+            'modified': datetime.now(timezone.utc).isoformat(),
+            'is_directory': is_directory,
+            'etag': None
+        })
+
+    def remove(self, remote_path):
+        """삭제 반영 (폴더면 하위 항목까지)"""
+        path = _normalize(remote_path)
+        children = path.rstrip('/') + '/'
+        with self._connect() as conn:
+            for table in ('entries', 'folders'):
+                conn.execute(
+                    f'DELETE FROM {table} WHERE path = ? OR substr(path, 1, ?) = ?',
+                    (path, len(children), children)
+                )
+
+    def list(self, folder, prefix=None, sort='name', order='asc', limit=100, cursor=None):
+        """폴더 하위 항목 조회 (정렬, 이름 접두어 필터, 커서 페이지네이션)
+
+        반환값: (항목 목록, 다음 커서 또는 None)
+        """
+        column = SORT_COLUMNS.get(sort, 'name')
+        descending = order == 'desc'
+        compare = '<' if descending else '>'
+        direction = 'DESC' if descending else 'ASC'
+
+        where = ['parent = ?']
+        params = [_normalize(folder)]
+        if prefix:
+            where.append('substr(name, 1, ?) = ?')
+            params += [len(prefix), prefix]
+        if cursor:
+            last_value, last_path = decode_cursor(cursor)
+            where.append(f'({column} {compare} ? OR ({column} = ? AND path {compare} ?))')
+            params += [last_value, last_value, last_path]
+
+        sql = (
+            f"SELECT path, name, size, modified, is_directory, etag FROM entries "
+            f"WHERE {' AND '.join(where)} ORDER BY {column} {direction}, path {direction} LIMIT ?"
+        )
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            rows = conn.execute(sql, params + [limit + 1]).fetchall()
+
+        items = [{
+            'name': row['name'],
+            'size': row['size'],
+            'modified': row['modified'] or None,
+            'is_directory': bool(row['is_directory']),
+            'path': row['path'],
+            'etag': row['etag']
+        } for row in rows[:limit]]
+
+        next_cursor = None
+        if len(rows) > limit:
+            last = rows[limit - 1]
+            next_cursor = encode_cursor(last[column], last['path'])
+        return items, next_cursor
+
+    @staticmethod
+    def _row(entry):
+        path = _normalize(entry['path'])
+        return (
+            path,
+            posixpath.dirname(path),
+            posixpath.basename(path),
+            entry.get('size') or 0,
+            entry.get('modified') or '',
+            1 if entry.get('is_directory') else 0,
+            entry.get('etag')
+        )
+
+
+def encode_cursor(value, path):
+    raw = json.dumps([value, path], ensure_ascii=False).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii')
+
+
+def decode_cursor(cursor):
+    try:
+        value, path = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return value, path
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+
+
+_index = None
+_index_lock = threading.Lock()
+
+
+def get_file_index():
+    """프로세스 공유 파일 메타데이터 색인"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FileIndex(Config.FILES_INDEX_DB_PATH, ttl=Config.FILES_INDEX_TTL)
+    return _index
@@ -0,0 +1,108 @@
+import os
+import threading
+import time
+from config import Config
+
+
+class HealthMonitor:
+    """외부 의존성 상태를 백그라운드에서 주기적으로 확인하고 메모리에 보관"""
+
+    def __init__(self, checks, interval):
+        self.checks = checks  # 이름 -> 인자 없는 함수 (True/False 반환, 예외는 실패)
+        self.interval = interval
+        self._status = {name: None for name in checks}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.started_at = time.time()
+
+    def start(self):
+        """백그라운드 확인 스레드 시작"""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._loop, name='health-monitor', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def refresh(self):
+        """모든 의존성 한 번 확인"""
+        for name, check in self.checks.items():
+            started = time.monotonic()
+            error = None
+            try:
+                if not check():
+                    error = 'Check returned False'
+            except Exception as e:
+                error = str(e)
+            latency_ms = round((time.monotonic() - started) * 1000, 1)
+
+            with self._lock:
+                previous = self._status[name] or {}
+                self._status[name] = {
+                    'ok': error is None,
+                    'latency_ms': latency_ms,
+                    'checked_at': time.time(),
+                    'last_error': error or previous.get('last_error'),
+                    'last_error_at': time.time() if error else previous.get('last_error_at')
+                }
+
+    def snapshot(self):
+        """마지막 확인 결과 (확인 전인 항목은 None)"""
+        with self._lock:
+            return {name: dict(status) if status else None for name, status in self._status.items()}
+
+    def ready(self):
+        """모든 의존성이 마지막 확인에서 정상이었는지"""
+        with self._lock:
+            return all(status and status['ok'] for status in self._status.values())
+
+    def _loop(self):
+        while True:
+            self.refresh()
+            if self._stop.wait(self.interval):
+                return
+
+
+def check_webdav():
+    """WebDAV 연결 확인 (실패하면 check_connection이 기록한 원인으로 WebDAVError)"""
+    from utils.webdav import get_webdav_manager, WebDAVError
+    manager = get_webdav_manager()
+    if not manager.check_connection(timeout=Config.HEALTH_CHECK_TIMEOUT):
+        raise WebDAVError(manager.last_check['error'])
+    return True
+
+
+def check_google_ai():
+    from utils.ai_client import get_ai_client
+    return get_ai_client().ping()
+
+
+_monitor = None
+_monitor_lock = threading.Lock()
+
+
+def get_health_monitor():
+    """프로세스 공유 상태 모니터 (최초 호출 시 백그라운드 확인 시작)"""
+    global _monitor
+    if _monitor is None:
+        with _monitor_lock:
+            if _monitor is None:
+                _monitor = HealthMonitor(
+                    {'webdav': check_webdav, 'google_ai': check_google_ai},
+                    interval=Config.HEALTH_CHECK_INTERVAL
+                )
+                _monitor.start()
+    return _monitor
+
+
+def _reset_after_fork():
+    global _monitor, _monitor_lock
+    # 확인 스레드는 fork 되지 않으므로 자식 프로세스에서 새로 시작
+    _monitor_lock = threading.Lock()
+    _monitor = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
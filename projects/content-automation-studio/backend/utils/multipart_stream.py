@@ -0,0 +1,100 @@
+from werkzeug.http import parse_options_header
+from werkzeug.sansio.multipart import Data, Epilogue, Field, File, MultipartDecoder, NeedData
+
+# 파일 필드 앞 일반 필드 값의 최대 크기 (메모리에 모음)
+MAX_FIELD_BYTES = 64 * 1024
+
+
+class MultipartFileStream:
+    """multipart/form-data 요청 본문에서 파일 필드 하나를 임시 파일 없이 읽는 스트림
+
+    request.files는 본문 전체를 임시 파일로 받아 두므로, 요청 스트림을 직접 파싱해
+    파일 내용이 도착하는 대로 read()로 넘긴다. 파일 필드 앞의 일반 필드는 fields에 모으고
+    (size 필드가 있으면 expected_size), 파일 필드 뒤의 내용은 읽지 않는다.
+    """
+
+    def __init__(self, stream, content_type, field='file', chunk_size=64 * 1024):
+        mimetype, options = parse_options_header(content_type)
+        boundary = options.get('boundary')
+        if mimetype != 'multipart/form-data' or not boundary:
+            raise ValueError('Invalid multipart body')
+        self.stream = stream
+        self.field = field
+        self.chunk_size = chunk_size
+        self.fields = {}
+        self.filename = None
+        self.size = 0
+        self._decoder = MultipartDecoder(boundary.encode('latin-1'))
+        self._eof = False
+        self._pending = bytearray()
+        self._done = False
+        self._find_file()
+        self.expected_size = self._parse_size(self.fields.get('size'))
+
+    @staticmethod
+    def _parse_size(value):
+        if value is None:
+            return None
+        try:
+            size = int(value)
+        except ValueError:
+            raise ValueError('Size must be an integer')
+        if size < 0:
+            raise ValueError('Size must be an integer')
+        return size
+
+    def _next_event(self):
+        event = self._decoder.next_event()
+        while isinstance(event, NeedData):
+            if self._eof:
+                raise ValueError('Unexpected end of multipart body')
+            data = self.stream.read(self.chunk_size)
+            self._eof = not data
+            self._decoder.receive_data(data or None)
+            event = self._decoder.next_event()
+        return event
+
+    def _find_file(self):
+        """파일 필드 시작까지 읽기 (앞의 일반 필드는 fields에 저장)"""
+        name = None
+        value = bytearray()
+        while True:
+            event = self._next_event()
+            if isinstance(event, Epilogue):
+                raise ValueError('No file provided')
+            if isinstance(event, File):
+                if event.name == self.field:
+                    self.filename = event.filename
+                    return
+                name = None  # 다른 파일 필드는 건너뜀
+            elif isinstance(event, Field):
+                name = event.name
+                value = bytearray()
+            elif isinstance(event, Data) and name is not None:
+                value += event.data
+                if len(value) > MAX_FIELD_BYTES:
+                    raise ValueError(f'Form field too large: {name}')
+                if not event.more_data:
+                    self.fields[name] = value.decode('utf-8', 'replace')
+
+    def read(self, size=-1):
+        """파일 내용 읽기 (끝나면 b'', size 필드와 실제 크기가 다르면 ValueError)"""
+        while not self._done and (size < 0 or len(self._pending) < size):
+            event = self._next_event()
+            if not isinstance(event, Data):
+                self._done = True
+                break
+            self._pending += event.data
+            self.size += len(event.data)
+            if self.expected_size is not None and self.size > self.expected_size:
+                raise ValueError('File is larger than the size field')
+            if not event.more_data:
+                self._done = True
+        if self._done and self.expected_size is not None and self.size != self.expected_size:
+            raise ValueError('File is smaller than the size field')
+
+        if size < 0:
+            size = len(self._pending)
+        chunk = bytes(self._pending[:size])
+        del self._pending[:size]
+        return chunk
@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import posixpath
+import sqlite3
+import threading
+import time
+from config import Config
+
+
+def render_cache_key(image_digests, audio_digest, durations, profile):
+    """입력 내용 해시 + 렌더 파라미터로 캐시 키 생성
+
+    파일 이름과 렌더 방식(single/segmented)은 결과 영상 내용에 영향이 없으므로 키에 넣지 않는다.
+    """
+    payload = json.dumps({
+        'images': list(image_digests),
+        'audio': audio_digest,
+        'durations': [round(float(duration), 3) for duration in durations],
+        'profile': profile
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class RenderCache:
+    """렌더 결과 캐시 (키 → 업로드된 영상 원격 경로/URL/길이, SQLite)
+
+    원격 객체가 사라진 항목은 조회 시 exists(remote_path) 확인에서 걸러 지운다.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS renders ('
+                'key TEXT PRIMARY KEY, remote_path TEXT NOT NULL, video_url TEXT NOT NULL, '
+                'duration REAL NOT NULL, profile TEXT NOT NULL, created_at REAL NOT NULL, used_at REAL NOT NULL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS renders_remote_path ON renders (remote_path)')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def get(self, key, exists=None):
+        """캐시 조회 (없거나 원격 객체가 사라졌으면 None)
+
+        exists(remote_path)는 객체가 있으면 True, 없으면(404) False를 반환하고
+        확인할 수 없으면 예외를 던진다 (이 경우 항목은 지우지 않고 미스로 처리).
+        """
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM renders WHERE key = ?', (key,)).fetchone()
+        entry = dict(row) if row else None
+
+        if entry is not None and exists is not None:
+            try:
+                if not exists(entry['remote_path']):
+                    self.forget(key)
+                    with self._lock:
+                        self._stats['evictions'] += 1
+                    entry = None
+            except Exception as e:
+                print(f"⚠️ 렌더 캐시 원격 확인 실패: {e}")
+                entry = None
+
+        with self._lock:
+            self._stats['hits' if entry else 'misses'] += 1
+        if entry is None:
+            return None
+
+        with self._connect() as conn:
+            conn.execute('UPDATE renders SET used_at = ? WHERE key = ?', (time.time(), key))
+        return entry
+
+    def put(self, key, remote_path, video_url, duration, profile):
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO renders VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (key, remote_path, video_url, duration, profile, now, now)
+            )
+
+    def forget(self, key):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM renders WHERE key = ?', (key,))
+
+    def forget_path(self, remote_path):
+        """원격 삭제 반영 (폴더면 하위 경로의 항목까지)"""
+        path = posixpath.normpath('/' + remote_path.strip('/'))
+        children = path.rstrip('/') + '/'
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'DELETE FROM renders WHERE remote_path = ? OR substr(remote_path, 1, ?) = ?',
+                (path, len(children), children)
+            )
+        if cursor.rowcount:
+            with self._lock:
+                self._stats['evictions'] += cursor.rowcount
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+        with self._connect() as conn:
+            stats['entries'] = conn.execute('SELECT COUNT(*) FROM renders').fetchone()[0]
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_render_cache():
+    """프로세스 공유 렌더 결과 캐시 (비활성화 시 None)"""
+    global _cache
+    if not Config.RENDER_CACHE_ENABLED:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = RenderCache(Config.RENDER_CACHE_DB_PATH)
+    return _cache
@@ -0,0 +1,520 @@
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from config import Config
+
+# 작업 상태
+QUEUED = 'queued'
+RUNNING = 'running'
+SUCCEEDED = 'succeeded'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (SUCCEEDED, FAILED, CANCELLED)
+
+# 우선순위 (작을수록 먼저 실행)
+PRIORITIES = {
+    'interactive': 0,  # 미리보기 등 사용자가 기다리는 작업
+    'batch': 1
+}
+
+
+class QueueFullError(Exception):
+    """대기열이 가득 참 (retry_after: 다시 시도할 때까지 예상 대기 초, queued: 거부 시점의 대기 작업 수)"""
+
+    def __init__(self, message, retry_after=None, queued=None):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.queued = queued
+
+
+def available_cpus():
+    """이 프로세스가 실제로 쓸 수 있는 CPU 수 (cgroup CPU 할당량, CPU affinity 반영)
+
+    os.cpu_count()는 호스트 전체 코어 수라 컨테이너에서는 할당량보다 훨씬 클 수 있다.
+    """
+    if hasattr(os, 'sched_getaffinity'):
+        count = len(os.sched_getaffinity(0))
+    else:
+        count = os.cpu_count() or 1
+    quota = _cgroup_cpu_quota()
+    if quota:
+        count = min(count, max(1, int(quota)))
+    return max(1, count)
+
+
+def _cgroup_cpu_quota():
+    """cgroup CPU 할당량 (코어 수, 제한이 없거나 읽을 수 없으면 None)"""
+    try:
+        # cgroup v2: "<quota> <period>" 또는 "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        return None if quota == 'max' else int(quota) / int(period)
+    except (OSError, ValueError):
+        pass
+    try:
+        # cgroup v1: 할당량 -1이면 제한 없음
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        return quota / period if quota > 0 and period > 0 else None
+    except (OSError, ValueError):
+        return None
+
+
+def render_slots(threads_per_encoder, cpu_count=None):
+    """사용 가능한 CPU 수 / 인코더당 스레드 수로 동시 렌더 수 계산"""
+    cpu_count = cpu_count or available_cpus()
+    return max(1, cpu_count // max(1, threads_per_encoder))
+
+
+class JobStore:
+    """렌더 작업 저장소 (SQLite, 재시작 후에도 대기 작업 유지)
+
+    여러 프로세스(웹 워커, 별도 렌더 워커)가 같은 파일을 공유할 수 있다.
+    """
+
+    EXTRA_COLUMNS = {
+        'progress': 'TEXT',
+        'priority': 'INTEGER NOT NULL DEFAULT 1',
+        'owner': "TEXT NOT NULL DEFAULT ''"
+    }
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        folder = os.path.dirname(self.db_path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                'id TEXT PRIMARY KEY, kind TEXT NOT NULL, status TEXT NOT NULL, '
+                'params TEXT NOT NULL, result TEXT, error TEXT, '
+                'cancel_requested INTEGER NOT NULL DEFAULT 0, worker TEXT, '
+                'created_at REAL NOT NULL, started_at REAL, finished_at REAL, heartbeat_at REAL)'
+            )
+            conn.execute('CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, created_at)')
+            # 이전 버전에서 만든 파일에 없는 열 추가
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(jobs)')}
+            for name, definition in self.EXTRA_COLUMNS.items():
+                if name not in columns:
+                    conn.execute(f'ALTER TABLE jobs ADD COLUMN {name} {definition}')
+
+    def _connect(self):
+        return sqlite3.connect(self.db_path, timeout=10, isolation_level=None)
+
+    def create(self, kind, params, priority='batch', owner='', max_queued=0, max_queued_per_owner=0):
+        """새 작업 등록 (대기열 한도를 넘으면 QueueFullError, 0이면 제한 없음)
+
+        대기 작업 수 확인과 등록을 한 트랜잭션에서 해 여러 프로세스가 동시에 등록해도 한도를 지킨다.
+        """
+        job_id = uuid.uuid4().hex
+        owner = owner or ''
+        conn = self._connect()
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            queued = conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (QUEUED,)).fetchone()[0]
+            if max_queued and queued >= max_queued:
+                raise QueueFullError('Render queue is full', queued=queued)
+            if max_queued_per_owner and conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status = ? AND owner = ?', (QUEUED, owner)
+            ).fetchone()[0] >= max_queued_per_owner:
+                raise QueueFullError('Too many queued renders for this user', queued=queued)
+            conn.execute(
+                'INSERT INTO jobs (id, kind, status, params, created_at, priority, owner) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (job_id, kind, QUEUED, json.dumps(params, ensure_ascii=False), time.time(),
+                 PRIORITIES[priority], owner)
+            )
+            conn.execute('COMMIT')
+        except (sqlite3.Error, QueueFullError):
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return self.get(job_id)
+
+    def get(self, job_id):
+        """작업 조회 (없으면 None)"""
+        with self._connect() as conn:
+            conn.row_factory = sqlite3.Row
+            row = conn.execute('SELECT * FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return self._to_dict(row) if row else None
+
+    def claim_next(self, worker, max_running=0, reserved_interactive=0):
+        """다음 대기 작업을 실행 상태로 가져오기 (없으면 None)
+
+        우선순위 → 실행 중 작업이 적은 사용자 → 오래된 순으로 고른다.
+        max_running을 주면 같은 저장소를 쓰는 모든 프로세스의 실행 중 작업 수를 그 이하로 유지하고,
+        남은 슬롯이 reserved_interactive개 이하면 interactive 작업만 가져온다.
+        """
+        conn = self._connect()
+        try:
+            conn.row_factory = sqlite3.Row
+            conn.execute('BEGIN IMMEDIATE')
+            max_priority = max(PRIORITIES.values())
+            if max_running:
+                running = conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (RUNNING,)).fetchone()[0]
+                if running >= max_running:
+                    conn.execute('COMMIT')
+                    return None
+                if running >= max_running - reserved_interactive:
+                    max_priority = PRIORITIES['interactive']
+            row = conn.execute(
+                'SELECT jobs.* FROM jobs LEFT JOIN ('
+                '  SELECT owner, COUNT(*) AS running FROM jobs WHERE status = ? GROUP BY owner'
+                ') AS active ON active.owner = jobs.owner '
+                'WHERE jobs.status = ? AND jobs.priority <= ? '
+                'ORDER BY jobs.priority, COALESCE(active.running, 0), jobs.created_at LIMIT 1',
+                (RUNNING, QUEUED, max_priority)
+            ).fetchone()
+            if row is None:
+                conn.execute('COMMIT')
+                return None
+            now = time.time()
+            conn.execute(
+                'UPDATE jobs SET status = ?, worker = ?, started_at = ?, heartbeat_at = ? WHERE id = ?',
+                (RUNNING, worker, now, now, row['id'])
+            )
+            conn.execute('COMMIT')
+        except sqlite3.Error:
+            conn.execute('ROLLBACK')
+            raise
+        finally:
+            conn.close()
+        return self.get(row['id'])
+
+    def heartbeat(self, job_ids):
+        """실행 중 작업의 생존 신호 갱신"""
+        if not job_ids:
+            return
+        now = time.time()
+        with self._connect() as conn:
+            conn.executemany(
+                'UPDATE jobs SET heartbeat_at = ? WHERE id = ? AND status = ?',
+                [(now, job_id, RUNNING) for job_id in job_ids]
+            )
+
+    def finish(self, job_id, status, result=None, error=None):
+        """작업 종료 상태 기록"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ? WHERE id = ?',
+                (status, json.dumps(result, ensure_ascii=False) if result is not None else None,
+                 error, time.time(), job_id)
+            )
+
+    def update_progress(self, job_id, progress):
+        """실행 중 작업의 진행 상황 기록 (percent, fps, speed 등)"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET progress = ? WHERE id = ? AND status = ?',
+                (json.dumps(progress), job_id, RUNNING)
+            )
+
+    def request_cancel(self, job_id):
+        """취소 요청 (대기 중이면 바로 취소, 실행 중이면 워커가 중단하도록 표시)"""
+        with self._connect() as conn:
+            conn.execute(
+                'UPDATE jobs SET status = ?, finished_at = ?, cancel_requested = 1 WHERE id = ? AND status = ?',
+                (CANCELLED, time.time(), job_id, QUEUED)
+            )
+            conn.execute(
+                'UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?', (job_id, RUNNING)
+            )
+        return self.get(job_id)
+
+    def is_cancel_requested(self, job_id):
+        with self._connect() as conn:
+            row = conn.execute('SELECT cancel_requested FROM jobs WHERE id = ?', (job_id,)).fetchone()
+        return bool(row and row[0])
+
+    def requeue_stale(self, max_age):
+        """생존 신호가 끊긴 실행 작업(죽은 워커)을 다시 대기 상태로"""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                'UPDATE jobs SET status = ?, worker = NULL, started_at = NULL, heartbeat_at = NULL '
+                'WHERE status = ? AND heartbeat_at < ?',
+                (QUEUED, RUNNING, time.time() - max_age)
+            )
+            return cursor.rowcount
+
+    def count(self, status, owner=None):
+        with self._connect() as conn:
+            if owner is None:
+                return conn.execute('SELECT COUNT(*) FROM jobs WHERE status = ?', (status,)).fetchone()[0]
+            return conn.execute(
+                'SELECT COUNT(*) FROM jobs WHERE status = ? AND owner = ?', (status, owner)
+            ).fetchone()[0]
+
+    def timings(self, limit=50):
+        """최근 완료 작업의 평균 대기/실행 시간 (초, 기록이 없으면 None)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT AVG(started_at - created_at), AVG(finished_at - started_at), COUNT(*) FROM ('
+                '  SELECT created_at, started_at, finished_at FROM jobs '
+                '  WHERE status = ? AND started_at IS NOT NULL ORDER BY finished_at DESC LIMIT ?'
+                ')',
+                (SUCCEEDED, limit)
+            ).fetchone()
+        return {
+            'avg_queue_wait': round(row[0], 2) if row[0] is not None else None,
+            'avg_run_time': round(row[1], 2) if row[1] is not None else None,
+            'samples': row[2]
+        }
+
+    @staticmethod
+    def _to_dict(row):
+        job = dict(row)
+        job['params'] = json.loads(job['params'])
+        job['result'] = json.loads(job['result']) if job['result'] else None
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        job['progress'] = json.loads(job['progress']) if job['progress'] else None
+        job['priority'] = next(name for name, value in PRIORITIES.items() if value == job['priority'])
+        now = time.time()
+        # 대기/실행 시간 (진행 중이면 현재까지)
+        job['queue_wait'] = round((job['started_at'] or job['finished_at'] or now) - job['created_at'], 3)
+        job['run_time'] = (
+            round((job['finished_at'] or now) - job['started_at'], 3) if job['started_at'] else None
+        )
+        return job
+
+
+class JobContext:
+    """작업 핸들러에 전달되는 실행 컨텍스트"""
+
+    def __init__(self, store, job, progress_interval=None, threads=None):
+        self.store = store
+        self.job = job
+        self.id = job['id']
+        self.threads = threads  # 이 작업의 ffmpeg 인코더 스레드 수 (None이면 ffmpeg 기본값)
+        self._cancelled = False
+        self.progress_interval = Config.RENDER_PROGRESS_INTERVAL if progress_interval is None else progress_interval
+        self._progress_at = 0
+        self._progress_lock = threading.Lock()
+
+    def thread_budget(self):
+        """여러 인코더를 동시에 띄우는 작업(분할 렌더링)이 나눠 쓸 스레드 수
+
+        사용 가능한 CPU를 호스트 전체 실행 중 작업 수로 나눈 몫 (최소 threads)
+        """
+        running = max(1, self.store.count(RUNNING))
+        return max(self.threads or 1, available_cpus() // running)
+
+    def cancelled(self):
+        """취소 요청 여부 (한 번 확인되면 계속 True)"""
+        if not self._cancelled:
+            self._cancelled = self.store.is_cancel_requested(self.id)
+        return self._cancelled
+
+    def report_progress(self, progress):
+        """진행 상황 기록 (progress_interval 간격으로만 저장, 완료 스냅샷은 항상 저장)"""
+        with self._progress_lock:
+            now = time.monotonic()
+            if not progress.get('done') and now - self._progress_at < self.progress_interval:
+                return
+            self._progress_at = now
+        try:
+            self.store.update_progress(self.id, progress)
+        except sqlite3.Error as e:
+            print(f"❌ 렌더 진행 상황 기록 실패 ({self.id}): {e}")
+
+
+class JobQueue:
+    """저장소를 폴링해 작업을 실행하는 제한된 크기의 워커 풀
+
+    워커 수(동시 렌더 슬롯)마다 인코더 스레드 threads_per_encoder개를 쓴다.
+    슬롯 수와 예약 슬롯은 같은 저장소를 쓰는 모든 프로세스의 실행 중 작업 수에 적용된다.
+    reserved_interactive개 슬롯은 interactive 작업용으로 남겨 batch 작업이 미리보기를 막지 않게 한다.
+    """
+
+    def __init__(self, store, handlers, workers, poll_interval=1.0, stale_after=60,
+                 threads_per_encoder=None, reserved_interactive=0, max_queued=0, max_queued_per_owner=0):
+        self.store = store
+        self.handlers = handlers
+        self.workers = max(1, workers)
+        self.threads_per_encoder = threads_per_encoder
+        self.reserved_interactive = min(max(0, reserved_interactive), self.workers - 1)
+        self.max_queued = max_queued
+        self.max_queued_per_owner = max_queued_per_owner
+        self.poll_interval = poll_interval
+        self.stale_after = stale_after
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._wakeup = threading.Event()
+        self._stop = threading.Event()
+        self._running = set()
+        self._running_lock = threading.Lock()
+        self._threads = []
+
+    def start(self):
+        """워커 스레드 시작"""
+        if self._threads:
+            return
+        self.store.requeue_stale(self.stale_after)
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._worker_loop, name=f'render-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        heartbeat = threading.Thread(target=self._heartbeat_loop, name='render-heartbeat', daemon=True)
+        heartbeat.start()
+        self._threads.append(heartbeat)
+
+    def stop(self):
+        self._stop.set()
+        self._wakeup.set()
+
+    def submit(self, kind, params, priority='batch', owner=''):
+        """작업 등록 후 대기 중인 워커 깨우기 (대기열 한도를 넘으면 QueueFullError)"""
+        if kind not in self.handlers:
+            raise ValueError(f'Unknown job kind: {kind}')
+        if priority not in PRIORITIES:
+            raise ValueError(f"Priority must be one of: {', '.join(PRIORITIES)}")
+
+        try:
+            job = self.store.create(
+                kind, params, priority=priority, owner=owner,
+                max_queued=self.max_queued, max_queued_per_owner=self.max_queued_per_owner
+            )
+        except QueueFullError as e:
+            e.retry_after = self.estimate_wait(e.queued)
+            raise
+        self._wakeup.set()
+        return job
+
+    def estimate_wait(self, queued=None):
+        """앞선 작업이 모두 끝날 때까지 예상 대기 초 (최근 평균 실행 시간 기준)"""
+        queued = self.store.count(QUEUED) if queued is None else queued
+        run_time = self.store.timings()['avg_run_time'] or Config.RENDER_DEFAULT_RUN_SECONDS
+        return max(1, int(run_time * (queued // self.workers + 1)))
+
+    def stats(self):
+        with self._running_lock:
+            busy = len(self._running)
+        return {
+            'slots': self.workers,
+            'threads_per_encoder': self.threads_per_encoder,
+            'reserved_interactive': self.reserved_interactive,
+            'busy_here': busy,
+            'queued': self.store.count(QUEUED),
+            'running': self.store.count(RUNNING),
+            'max_queued': self.max_queued,
+            'estimated_wait': self.estimate_wait(),
+            **self.store.timings()
+        }
+
+    def cancel(self, job_id):
+        return self.store.request_cancel(job_id)
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            # 슬롯 확인은 저장소 트랜잭션 안에서 (다른 프로세스의 실행 중 작업 포함)
+            job = None
+            try:
+                job = self.store.claim_next(
+                    self.worker_id, max_running=self.workers, reserved_interactive=self.reserved_interactive
+                )
+            except sqlite3.Error as e:
+                print(f"❌ 렌더 작업 조회 실패: {e}")
+            if job is not None:
+                with self._running_lock:
+                    self._running.add(job['id'])
+
+            if job is None:
+                self._wakeup.wait(self.poll_interval)
+                self._wakeup.clear()
+                continue
+
+            self._run(job)
+
+    def _run(self, job):
+        context = JobContext(self.store, job, threads=self.threads_per_encoder)
+        try:
+            result = self.handlers[job['kind']](job['params'], context)
+            if result.get('success'):
+                self.store.finish(job['id'], SUCCEEDED, result=result)
+            elif result.get('cancelled') or context.cancelled():
+                self.store.finish(job['id'], CANCELLED, error='Cancelled')
+            else:
+                self.store.finish(job['id'], FAILED, result=result, error=result.get('error'))
+        except Exception as e:
+            print(f"❌ 렌더 작업 실패 ({job['id']}): {e}")
+            self.store.finish(job['id'], FAILED, error=str(e))
+        finally:
+            with self._running_lock:
+                self._running.discard(job['id'])
+
+    def _heartbeat_loop(self):
+        interval = max(1.0, self.stale_after / 4)
+        while not self._stop.wait(interval):
+            with self._running_lock:
+                running = list(self._running)
+            try:
+                self.store.heartbeat(running)
+                # 다른 프로세스에서 죽은 워커가 잡고 있던 작업 회수
+                if self.store.requeue_stale(self.stale_after):
+                    self._wakeup.set()
+            except sqlite3.Error as e:
+                print(f"❌ 렌더 작업 생존 신호 실패: {e}")
+
+
+def _handlers():
+    from utils.renderer import render_video
+    return {'render_video': render_video}
+
+
+_store = None
+_queue = None
+_queue_lock = threading.Lock()
+
+
+def get_job_store():
+    """프로세스 공유 작업 저장소"""
+    global _store
+    if _store is None:
+        with _queue_lock:
+            if _store is None:
+                _store = JobStore(Config.RENDER_JOB_DB_PATH)
+    return _store
+
+
+def get_job_queue(start_workers=None):
+    """프로세스 공유 작업 큐 (RENDER_WORKERS_IN_WEB 이면 이 프로세스에서 워커도 실행)"""
+    global _queue
+    if _queue is None:
+        store = get_job_store()
+        with _queue_lock:
+            if _queue is None:
+                threads = Config.RENDER_THREADS_PER_ENCODER
+                _queue = JobQueue(
+                    store,
+                    _handlers(),
+                    workers=Config.RENDER_WORKERS or render_slots(threads),
+                    stale_after=Config.RENDER_JOB_STALE_SECONDS,
+                    threads_per_encoder=threads,
+                    reserved_interactive=Config.RENDER_RESERVED_INTERACTIVE_SLOTS,
+                    max_queued=Config.RENDER_MAX_QUEUED,
+                    max_queued_per_owner=Config.RENDER_MAX_QUEUED_PER_USER
+                )
+    if start_workers is None:
+        start_workers = Config.RENDER_WORKERS_IN_WEB
+    if start_workers:
+        with _queue_lock:
+            _queue.start()
+    return _queue
+
+
+def _reset_after_fork():
+    global _store, _queue, _queue_lock
+    # 워커 스레드는 fork 되지 않으므로 자식 프로세스에서 새로 시작
+    _queue_lock = threading.Lock()
+    _store = None
+    _queue = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)
@@ -0,0 +1,296 @@
+import os
+import struct
+
+# 정지 이미지 슬라이드쇼용 인코딩 프로필
+RENDER_PROFILES = {
+    'draft': {
+        'preset': 'ultrafast',
+        'tune': 'stillimage',
+        'fps': 15,
+        'width': 854,
+        'height': 480,
+        'crf': 30,
+        'audio_bitrate': '96k'
+    },
+    'standard': {
+        'preset': 'veryfast',
+        'tune': 'stillimage',
+        'fps': 25,
+        'width': 1280,
+        'height': 720,
+        'crf': 23,
+        'audio_bitrate': '128k'
+    },
+    'high': {
+        'preset': 'medium',
+        'tune': 'stillimage',
+        'fps': 30,
+        'width': 1920,
+        'height': 1080,
+        'crf': 18,
+        'audio_bitrate': '192k'
+    }
+}
+
+
+def get_profile(name):
+    """이름으로 프로필 조회 (없으면 ValueError)"""
+    if name not in RENDER_PROFILES:
+        raise ValueError(f"Unknown render profile: {name} (choose from {', '.join(RENDER_PROFILES)})")
+    return RENDER_PROFILES[name]
+
+
+def detect_audio_codec(path):
+    """파일 내용으로 AAC 여부 판별 (ffprobe 실행 없이) - AAC면 'aac', 아니거나 모르면 None
+
+    MP4/M4A는 브랜드만으로는 코덱을 알 수 없으므로(ALAC, MP3, Opus 등도 가능) 오디오 트랙의
+    샘플 설명(stsd)이 mp4a이고 esds의 objectTypeIndication이 AAC일 때만 'aac'로 본다.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(12)
+        # ADTS AAC: 12비트 동기 워드 0xFFF + layer 00
+        if len(header) >= 2 and header[0] == 0xFF and (header[1] & 0xF6) == 0xF0:
+            return 'aac'
+        # MP4/M4A 컨테이너 (ftyp 박스)
+        if header[4:8] == b'ftyp':
+            try:
+                codecs = _mp4_audio_codecs(f, os.fstat(f.fileno()).st_size)
+            except (struct.error, ValueError, IndexError):
+                return None
+            if codecs and all(codec == 'aac' for codec in codecs):
+                return 'aac'
+    return None
+
+
+# 코덱을 찾기 위해 들어가는 MP4 컨테이너 박스 (moov/trak/mdia/minf/stbl/stsd)
+_MP4_CONTAINER_BOXES = (b'moov', b'trak', b'mdia', b'minf', b'stbl')
+# esds objectTypeIndication 중 AAC (MPEG-4 Audio, MPEG-2 AAC Main/LC/SSR)
+_AAC_OBJECT_TYPES = (0x40, 0x66, 0x67, 0x68)
+
+
+def _mp4_boxes(f, start, end):
+    """start~end 구간의 박스 목록 [(종류, 내용 시작, 박스 끝)]"""
+    boxes = []
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        size, box_type = struct.unpack('>I4s', f.read(8))
+        body = pos + 8
+        if size == 1:
+            size = struct.unpack('>Q', f.read(8))[0]
+            body += 8
+        elif size == 0:
+            size = end - pos
+        if size < body - pos:
+            raise ValueError('Invalid MP4 box size')
+        boxes.append((box_type, body, min(pos + size, end)))
+        pos += size
+    return boxes
+
+
+def _mp4_audio_codecs(f, file_size):
+    """오디오 트랙(hdlr 'soun')별 코덱 목록 ('aac' 또는 샘플 설명 종류)"""
+    codecs = []
+
+    def walk(start, end, parent, track):
+        for box_type, body, box_end in _mp4_boxes(f, start, end):
+            if box_type == b'trak':
+                track = {}
+                walk(body, box_end, box_type, track)
+                if track.get('handler') == b'soun':
+                    codecs.append(track.get('codec'))
+            elif box_type in _MP4_CONTAINER_BOXES:
+                walk(body, box_end, box_type, track)
+            elif box_type == b'hdlr' and parent == b'mdia':
+                # version/flags(4) + pre_defined(4) 다음이 handler_type (minf의 hdlr는 데이터 참조용)
+                f.seek(body + 8)
+                track['handler'] = f.read(4)
+            elif box_type == b'stsd' and track is not None:
+                track['codec'] = _stsd_codec(f, body, box_end)
+
+    walk(0, file_size, None, None)
+    return codecs
+
+
+def _stsd_codec(f, start, end):
+    """샘플 설명 첫 항목의 코덱 (mp4a + AAC esds면 'aac', 아니면 항목 종류)"""
+    # version/flags(4) + entry_count(4) 다음이 첫 샘플 항목
+    entries = _mp4_boxes(f, start + 8, end)
+    if not entries:
+        return None
+    entry_type, body, entry_end = entries[0]
+    if entry_type != b'mp4a':
+        return entry_type
+    # AudioSampleEntry 고정 필드 28바이트 (QuickTime 사운드 설명 v1은 16, v2는 36바이트 추가)
+    f.seek(body + 8)
+    version = struct.unpack('>H', f.read(2))[0]
+    children = body + 28 + {1: 16, 2: 36}.get(version, 0)
+    return 'aac' if _esds_object_type(f, children, entry_end) in _AAC_OBJECT_TYPES else entry_type
+
+
+def _esds_object_type(f, start, end):
+    """esds(QuickTime은 wave 박스 안)의 DecoderConfigDescriptor objectTypeIndication"""
+    for box_type, body, box_end in _mp4_boxes(f, start, end):
+        if box_type == b'wave':
+            return _esds_object_type(f, body, box_end)
+        if box_type != b'esds':
+            continue
+        f.seek(body + 4)  # version/flags
+        data = f.read(box_end - body - 4)
+        pos = 0
+        while pos < len(data):
+            tag = data[pos]
+            pos += 1
+            # 설명자 길이: 7비트씩 최대 4바이트
+            for _ in range(4):
+                more = data[pos] & 0x80
+                pos += 1
+                if not more:
+                    break
+            if tag == 0x03:  # ES_Descriptor: ES_ID(2) + 플래그(1) + 선택 필드
+                flags = data[pos + 2]
+                pos += 3
+                if flags & 0x80:
+                    pos += 2
+                if flags & 0x40:
+                    pos += 1 + data[pos]
+                if flags & 0x20:
+                    pos += 2
+            elif tag == 0x04:  # DecoderConfigDescriptor
+                return data[pos]
+            else:
+                return None
+    return None
+
+
+def video_filter(profile):
+    """크기가 제각각인 이미지를 프로필 해상도로 맞추는 필터 (비율 유지 + 여백)
+
+    프레임레이트는 출력 옵션 -r로 맞춘다. concat 입력의 해상도가 바뀔 때마다 필터 그래프가 다시
+    만들어지는데, fps 필터를 넣으면 그때마다 앞 이미지의 프레임이 사라진다.
+    """
+    width, height = profile['width'], profile['height']
+    return (
+        f"scale={width}:{height}:force_original_aspect_ratio=decrease,"
+        f"pad={width}:{height}:(ow-iw)/2:(oh-ih)/2,setsar=1,format=yuv420p"
+    )
+
+
+def video_encoder_args(profile):
+    """프로필의 x264 인코더 인자"""
+    return [
+        '-c:v', 'libx264',
+        '-preset', profile['preset'],
+        '-tune', profile['tune'],
+        '-crf', str(profile['crf']),
+        '-r', str(profile['fps'])
+    ]
+
+
+def audio_encoder_args(profile, audio_codec):
+    """입력이 이미 AAC면 재인코딩 없이 복사"""
+    if audio_codec == 'aac':
+        return ['-c:a', 'copy']
+    return ['-c:a', 'aac', '-b:a', profile['audio_bitrate']]
+
+
+def per_image_durations(durations, count):
+    """이미지별 표시 시간 목록 (숫자 하나면 모든 이미지에 같은 값)"""
+    if isinstance(durations, (list, tuple)):
+        return [float(duration) for duration in durations]
+    return [float(durations)] * count
+
+
+def write_concat_list(image_files, durations, list_path):
+    """concat demuxer 목록 파일 작성
+
+    마지막 항목의 duration은 무시되므로 마지막 이미지를 한 번 더 적는다.
+    """
+    with open(list_path, 'w') as f:
+        for img_file, duration in zip(image_files, durations):
+            f.write(f"file '{img_file}'\n")
+            f.write(f"duration {duration}\n")
+        f.write(f"file '{image_files[-1]}'\n")
+    return list_path
+
+
+def build_slideshow_command(image_files, audio_path, output_path, durations, profile, work_dir,
+                            threads=None):
+    """슬라이드쇼 ffmpeg 명령 생성 (이미지 1장이면 오디오 길이만큼 반복, threads로 인코더 스레드 제한)
+
+    durations: 이미지별 표시 시간(초) 목록 또는 모든 이미지에 같은 값
+    """
+    audio_codec = detect_audio_codec(audio_path)
+
+    if len(image_files) == 1:
+        inputs = ['-loop', '1', '-framerate', str(profile['fps']), '-i', image_files[0]]
+        limit = []
+    else:
+        durations = per_image_durations(durations, len(image_files))
+        list_path = write_concat_list(image_files, durations, os.path.join(work_dir, 'image_list.txt'))
+        inputs = ['-f', 'concat', '-safe', '0', '-i', list_path]
+        # -shortest만으로는 오디오가 더 길 때 인코더에 남은 마지막 프레임이 잘리므로 영상 길이도 지정
+        limit = ['-t', f"{sum(durations):.3f}"]
+
+    return [
+        'ffmpeg',
+        '-y',  # 기존 파일 덮어쓰기
+        *inputs,
+        '-i', audio_path,
+        '-map', '0:v', '-map', '1:a',
+        '-vf', video_filter(profile),
+        *video_encoder_args(profile),
+        *(['-threads', str(threads)] if threads else []),
+        *audio_encoder_args(profile, audio_codec),
+        '-shortest',
+        *limit,
+        '-movflags', '+faststart',
+        output_path
+    ]
+
+
+def clip_frames(duration, profile):
+    """분할 렌더링 클립 하나의 프레임 수"""
+    return max(1, round(duration * profile['fps']))
+
+
+def build_segment_command(image_file, duration, output_path, profile, threads=None):
+    """이미지 한 장을 독립 클립으로 인코딩 (모든 클립이 같은 인코더 설정을 써야 stream copy로 이어붙일 수 있음)"""
+    frames = clip_frames(duration, profile)
+    return [
+        'ffmpeg',
+        '-y',
+        '-loop', '1',
+        '-framerate', str(profile['fps']),
+        '-i', image_file,
+        '-vf', video_filter(profile),
+        *video_encoder_args(profile),
+        *(['-threads', str(threads)] if threads else []),
+        '-frames:v', str(frames),
+        '-an',
+        output_path
+    ]
+
+
+def build_join_command(clip_files, audio_path, output_path, profile, work_dir, duration=None):
+    """클립을 재인코딩 없이(stream copy) 이어붙이고 오디오와 합치기 (duration: 영상 전체 길이 초)"""
+    list_path = os.path.join(work_dir, 'clip_list.txt')
+    with open(list_path, 'w') as f:
+        for clip_file in clip_files:
+            f.write(f"file '{clip_file}'\n")
+
+    return [
+        'ffmpeg',
+        '-y',
+        '-f', 'concat',
+        '-safe', '0',
+        '-i', list_path,
+        '-i', audio_path,
+        '-map', '0:v', '-map', '1:a',
+        '-c:v', 'copy',
+        *audio_encoder_args(profile, detect_audio_codec(audio_path)),
+        '-shortest',
+        *(['-t', f"{duration:.3f}"] if duration else []),
+        '-movflags', '+faststart',
+        output_path
+    ]
@@ -0,0 +1,266 @@
+import os
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import Config
+from utils.content_index import get_content_index
+from utils.downloader import download_all
+from utils.ffmpeg_progress import ProgressParser
+from utils.render_cache import get_render_cache, render_cache_key
+from utils.render_jobs import available_cpus
+from utils.render_profiles import (
+    build_join_command, build_segment_command, build_slideshow_command, clip_frames, get_profile,
+    per_image_durations
+)
+from utils.webdav import file_sha256, get_webdav_manager
+
+
+def render_video(params, job=None):
+    """이미지 + 오디오로 슬라이드쇼 영상 렌더링 후 WebDAV 업로드
+
+    params: image_urls, audio_url, filename, duration_per_image, profile(draft/standard/high),
+            render_mode(single/segmented/auto), durations(이미지별 표시 시간, 주면 duration_per_image 대신 사용)
+    job: 작업 컨텍스트 (cancelled()로 취소 확인, report_progress()로 진행 상황 기록, 없으면 둘 다 생략)
+    """
+    image_urls = params['image_urls']
+    audio_url = params['audio_url']
+    output_filename = params['filename']
+    duration_per_image = params.get('duration_per_image', 5)  # 초
+    durations = per_image_durations(params.get('durations') or duration_per_image, len(image_urls))
+    profile_name = params.get('profile', Config.RENDER_DEFAULT_PROFILE)
+    profile = get_profile(profile_name)
+    render_mode = params.get('render_mode', Config.RENDER_MODE)
+
+    def cancelled():
+        return job is not None and job.cancelled()
+
+    webdav = get_webdav_manager()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        if cancelled():
+            return {'success': False, 'error': 'Cancelled', 'cancelled': True}
+
+        # 이미지 + 오디오 동시 다운로드 (청크 단위로 디스크에 저장)
+        audio_path = os.path.join(temp_dir, "audio.mp3")
+        items = [(url, os.path.join(temp_dir, f"image_{i:03d}.jpg")) for i, url in enumerate(image_urls)]
+        items.append((audio_url, audio_path))
+        downloads = download_all(items)
+
+        # 실패한 이미지는 건너뛰고 순서 유지 (표시 시간도 같이)
+        succeeded = [i for i, download in enumerate(downloads[:-1]) if download['success']]
+        image_files = [downloads[i]['path'] for i in succeeded]
+        durations = [durations[i] for i in succeeded]
+        if not downloads[-1]['success']:
+            return {'success': False, 'error': 'Failed to download audio'}
+        if not image_files:
+            return {'success': False, 'error': 'Failed to download images'}
+        asset_cache_hits = sum(1 for download in downloads if download.get('cache') in ('hit', 'revalidated'))
+
+        # 같은 입력 내용 + 파라미터로 이미 렌더링한 영상이 남아 있으면 그대로 반환
+        render_cache = get_render_cache()
+        cache_key = None
+        if render_cache is not None:
+            cache_key = render_cache_key(
+                [file_sha256(path) for path in image_files], file_sha256(audio_path),
+                durations, profile_name
+            )
+            cached = render_cache.get(cache_key, exists=webdav.exists)
+            if cached is not None and not _add_cached_ref(cached['remote_path']):
+                # 조회와 참조 추가 사이에 마지막 참조가 해제된 경우
+                render_cache.forget(cache_key)
+                cached = None
+            if cached is not None:
+                return {
+                    'success': True,
+                    'video_url': cached['video_url'],
+                    'remote_path': cached['remote_path'],
+                    'filename': output_filename,
+                    'profile': profile_name,
+                    'duration': cached['duration'],
+                    'cached': True,
+                    'asset_cache_hits': asset_cache_hits
+                }
+
+        output_path = os.path.join(temp_dir, output_filename)
+        render_mode = resolve_render_mode(render_mode, len(image_files))
+        expected_duration = sum(durations)
+        report = job.report_progress if job is not None else None
+        threads = job.threads if job is not None else None
+        if render_mode == 'segmented':
+            # 이미지별 클립을 CPU 코어에 나눠 인코딩한 뒤 stream copy로 연결
+            # (인코더 하나 몫이 아니라 다른 실행 중 작업과 나눈 CPU 전체를 예산으로)
+            returncode, stderr, progress = render_segmented(
+                image_files, audio_path, output_path, durations, profile, temp_dir, cancelled, report,
+                threads=job.thread_budget() if job is not None else None
+            )
+        else:
+            # FFmpeg 명령어 생성 (프로필별 해상도/프레임레이트/인코더 설정)
+            ffmpeg_cmd = build_slideshow_command(
+                image_files, audio_path, output_path, durations, profile, temp_dir, threads=threads
+            )
+
+            # FFmpeg 실행 (진행 상황 보고, 취소 요청 시 프로세스 종료)
+            returncode, stderr, progress = run_ffmpeg(
+                ffmpeg_cmd, temp_dir, cancelled, on_progress=report, expected_duration=expected_duration
+            )
+        if returncode is None:
+            return {'success': False, 'error': 'Cancelled', 'cancelled': True}
+        if returncode != 0:
+            return {
+                'success': False,
+                'error': 'FFmpeg execution failed',
+                'details': stderr
+            }
+
+        # 생성된 비디오를 WebDAV에 업로드
+        upload_result = webdav.upload_file(output_path)
+        if not upload_result['success']:
+            return {'success': False, 'error': 'Failed to upload video'}
+
+        # ffmpeg가 마지막으로 기록한 출력 시각 (별도 ffprobe 실행 없이)
+        duration = progress['out_time'] if progress and progress['out_time'] is not None else 0
+        if cache_key is not None:
+            render_cache.put(cache_key, upload_result['remote_path'], upload_result['url'], duration, profile_name)
+
+        return {
+            'success': True,
+            'video_url': upload_result['url'],
+            'remote_path': upload_result['remote_path'],
+            'filename': output_filename,
+            'profile': profile_name,
+            'render_mode': render_mode,
+            'duration': duration,
+            'cached': False,
+            'asset_cache_hits': asset_cache_hits
+        }
+
+
+def _add_cached_ref(remote_path):
+    """캐시된 영상이 중복 제거 저장 객체면 이 작업 몫의 참조 추가 (먼저 렌더한 쪽이 삭제해도 URL 유지)
+
+    객체가 색인에서 이미 사라졌으면 False.
+    """
+    if not remote_path.startswith(Config.WEBDAV_OBJECTS_ROOT.rstrip('/') + '/'):
+        return True
+    index = get_content_index()
+    entry = index.get_by_path(remote_path)
+    return entry is not None and index.add_ref(entry['digest']) is not None
+
+
+def resolve_render_mode(render_mode, image_count):
+    """auto면 이미지 수와 사용 가능한 CPU 수로 단일/분할 렌더링 선택"""
+    if image_count < 2:
+        return 'single'
+    if render_mode == 'auto':
+        workers = Config.RENDER_SEGMENT_WORKERS or available_cpus()
+        return 'segmented' if workers > 1 and image_count >= Config.RENDER_SEGMENT_MIN_IMAGES else 'single'
+    return render_mode
+
+
+def render_segmented(image_files, audio_path, output_path, durations, profile, work_dir,
+                     cancelled=None, on_progress=None, threads=None):
+    """이미지별 클립 병렬 인코딩 → stream copy 연결 + 오디오 합성 (returncode, stderr, 마지막 진행 상황) 반환
+
+    각 클립은 별도 ffmpeg 프로세스이며, 스레드 풀은 프로세스 실행/대기만 맡는다.
+    durations는 이미지별 표시 시간 목록 또는 모든 이미지에 같은 값.
+    threads(작업이 쓸 수 있는 스레드 예산, 기본값은 사용 가능한 CPU 수)를 동시 클립 수와 클립당 스레드 수로 나눈다.
+    진행률은 클립 인코딩을 95%, 연결 단계를 나머지 5%로 계산한다.
+    """
+    budget = threads or available_cpus()
+    workers = max(1, min(Config.RENDER_SEGMENT_WORKERS or budget, len(image_files)))
+    # 스레드 예산을 클립 인코더끼리 나눠 쓰도록 인코더당 스레드 수 제한
+    threads = max(1, budget // workers)
+    clip_files = [os.path.join(work_dir, f"clip_{i:03d}.mp4") for i in range(len(image_files))]
+    durations = per_image_durations(durations, len(image_files))
+    expected_duration = sum(durations)
+    clip_progress = {}
+    progress_lock = threading.Lock()
+
+    def report_clip(index, progress):
+        if on_progress is None:
+            return
+        with progress_lock:
+            clip_progress[index] = progress
+            encoded = sum(p['out_time'] or 0 for p in clip_progress.values())
+            running = [p for p in clip_progress.values() if not p['done']]
+            on_progress({
+                'out_time': round(encoded, 3),
+                'fps': round(sum(p['fps'] or 0 for p in running), 2),
+                'speed': round(sum(p['speed'] or 0 for p in running), 2),
+                'percent': round(min(95.0, encoded / expected_duration * 95), 1),
+                'stage': 'encode',
+                'done': False
+            })
+
+    # 클립 하나가 실패/취소되면 나머지 클립도 중단
+    aborted = threading.Event()
+
+    def stopped():
+        return aborted.is_set() or (cancelled is not None and cancelled())
+
+    def encode(index):
+        cmd = build_segment_command(image_files[index], durations[index], clip_files[index], profile, threads)
+        return run_ffmpeg(
+            cmd, work_dir, stopped, log_name=f"clip_{index:03d}.log",
+            on_progress=lambda progress: report_clip(index, progress)
+        )
+
+    executor = ThreadPoolExecutor(max_workers=workers)
+    try:
+        for returncode, stderr, progress in executor.map(encode, range(len(image_files))):
+            if returncode is None or returncode != 0:
+                aborted.set()
+                return returncode, stderr, progress
+    finally:
+        # 대기 중인 클립은 시작하지 않고, 실행 중인 ffmpeg는 stopped()로 종료되기만 기다림 (작업 폴더 정리 전)
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    def report_join(progress):
+        if on_progress is not None:
+            percent = progress['percent']
+            on_progress(dict(progress, stage='join', percent=100.0 if progress['done'] else 95 + (percent or 0) * 0.05))
+
+    video_duration = sum(clip_frames(duration, profile) for duration in durations) / profile['fps']
+    join_cmd = build_join_command(clip_files, audio_path, output_path, profile, work_dir, duration=video_duration)
+    return run_ffmpeg(
+        join_cmd, work_dir, cancelled, log_name='join.log',
+        on_progress=report_join, expected_duration=expected_duration
+    )
+
+
+def run_ffmpeg(cmd, work_dir, cancelled=None, poll_interval=0.5, log_name='ffmpeg.log',
+               on_progress=None, expected_duration=None):
+    """ffmpeg 실행 (returncode, stderr, 마지막 진행 상황) 반환, 취소되면 returncode None
+
+    -progress 출력(stdout)을 줄 단위로 읽어 on_progress(스냅샷)으로 넘기고,
+    stderr는 메모리 대신 작업 폴더의 로그 파일로 받는다.
+    """
+    cmd = [cmd[0], '-progress', 'pipe:1', '-nostats', *cmd[1:]]
+    parser = ProgressParser(expected_duration)
+    log_path = os.path.join(work_dir, log_name)
+    with open(log_path, 'w+') as log_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=log_file, text=True, bufsize=1)
+
+        def read_progress():
+            for line in process.stdout:
+                progress = parser.feed(line)
+                if progress is not None and on_progress is not None:
+                    on_progress(progress)
+
+        reader = threading.Thread(target=read_progress, daemon=True)
+        reader.start()
+        while True:
+            try:
+                process.wait(timeout=poll_interval)
+                break
+            except subprocess.TimeoutExpired:
+                if cancelled is not None and cancelled():
+                    process.kill()
+                    process.wait()
+                    reader.join()
+                    return None, '', parser.last
+
+        reader.join()
+        log_file.seek(0)
+        return process.returncode, log_file.read(), parser.last
@@ -0,0 +1,147 @@
+import re
+from utils.speech_duration import estimate_durations
+
+# 문장 끝: 마침표/물음표/느낌표(전각 포함)와 말줄임표 뒤의 닫는 따옴표·괄호, 또는 줄바꿈
+SENTENCE_PATTERN = re.compile(r'[^.!?。！？…\n]+(?:[.!?。！？…]+["\'”’」』)\]]*|\n|$)|[.!?。！？…]+')
+WORD_PATTERN = re.compile(r'\S+')
+
+
+def split_sentences(script):
+    """문장 단위 (시작, 끝) 구간 목록 (원문 한 번 훑기)"""
+    spans = []
+    for match in SENTENCE_PATTERN.finditer(script):
+        start, end = match.span()
+        # 앞뒤 공백 제외
+        while start < end and script[start].isspace():
+            start += 1
+        while end > start and script[end - 1].isspace():
+            end -= 1
+        if start < end:
+            spans.append((start, end))
+    return spans
+
+
+def segment_script(script, segment_count, estimate=None, language=None):
+    """스크립트를 발화 시간이 고르게 나뉘도록 segment_count개 세그먼트로 분할
+
+    문장 경계에서만 자르고, 가장 긴 세그먼트의 발화 시간이 최소가 되는 분할 중
+    남은 시간을 남은 세그먼트 수로 나눈 값에 가장 가깝게 자른다.
+    문장이 세그먼트보다 적으면 단어, 그래도 적으면 글자 단위로 나눈다.
+    estimate(텍스트 목록) → 초 목록 (기본값은 언어별 TTS 발화 시간 모델)
+
+    반환값: [{'text', 'duration'}] (항상 segment_count개, 나눌 글자가 모자라면 빈 세그먼트)
+    """
+    if segment_count <= 0:
+        return []
+    estimate = estimate or (lambda texts: estimate_durations(texts, language))
+
+    spans = split_sentences(script)
+    if len(spans) < segment_count:
+        spans = [m.span() for s, e in spans for m in WORD_PATTERN.finditer(script, s, e)]
+    if len(spans) < segment_count:
+        spans = [(i, i + 1) for s, e in spans for i in range(s, e) if not script[i].isspace()]
+
+    if not spans:
+        return [{'text': '', 'duration': 0.0} for _ in range(segment_count)]
+
+    seconds = estimate([script[s:e] for s, e in spans])
+    # 정수(밀리초) 누적합으로 계산해 부동소수점 오차 없이 이분 탐색
+    prefix = [0]
+    for value in seconds:
+        prefix.append(prefix[-1] + max(1, round(value * 1000)))
+
+    bounds = partition(prefix, min(segment_count, len(spans)))
+    segments = []
+    for start, end in zip(bounds, bounds[1:]):
+        segments.append({
+            'text': script[spans[start][0]:spans[end - 1][1]],
+            'duration': round((prefix[end] - prefix[start]) / 1000, 3)
+        })
+    segments += [{'text': '', 'duration': 0.0} for _ in range(segment_count - len(segments))]
+    return segments
+
+
+def partition(prefix, k):
+    """누적합 prefix(길이 n+1)를 비어 있지 않은 연속 구간 k개로 나눈 경계 인덱스 [0, ..., n]
+
+    1) 구간 합 최댓값의 최솟값 T를 이분 탐색 (탐욕 검사는 구간마다 이분 탐색이라 O(k log n))
+    2) T 안에서 각 구간을 남은 평균에 가장 가깝게 자른다 (뒤 구간이 T를 넘지 않는 범위 안에서)
+    """
+    n = len(prefix) - 1
+    k = max(1, min(k, n))
+    low = max(prefix[i + 1] - prefix[i] for i in range(n))
+    high = prefix[n]
+    while low < high:
+        mid = (low + high) // 2
+        if _groups_needed(prefix, mid, k) <= k:
+            high = mid
+        else:
+            low = mid + 1
+    limit = low
+
+    # reach[i]: i에서 시작한 구간이 limit 안에서 끝날 수 있는 가장 먼 위치
+    # need[i]: i부터 끝까지 limit 안으로 나누는 데 필요한 최소 구간 수
+    reach = [0] * n
+    end = 0
+    for i in range(n):
+        end = max(end, i + 1)
+        while end < n and prefix[end + 1] - prefix[i] <= limit:
+            end += 1
+        reach[i] = end
+    need = [0] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        need[i] = 1 + need[reach[i]]
+
+    bounds = [0]
+    start = 0
+    for remaining in range(k, 1, -1):
+        # 뒤의 remaining-1개 구간이 limit 안에 들어가고 비어 있지 않은 범위
+        latest = min(reach[start], n - (remaining - 1))
+        earliest = _first_at_most(need, start + 1, latest, remaining - 1)
+        target = prefix[start] + (prefix[n] - prefix[start]) / remaining
+        cut = _closest(prefix, earliest, latest, target)
+        bounds.append(cut)
+        start = cut
+    bounds.append(n)
+    return bounds
+
+
+def _groups_needed(prefix, limit, k):
+    """합이 limit 이하인 구간으로 앞에서부터 탐욕적으로 나눌 때의 구간 수 (k를 넘으면 중단)"""
+    n = len(prefix) - 1
+    start = 0
+    groups = 0
+    while start < n and groups <= k:
+        start = _last_at_most(prefix, start + 1, n, prefix[start] + limit)
+        groups += 1
+    return groups
+
+
+def _last_at_most(prefix, low, high, value):
+    """prefix[j] <= value인 가장 큰 j (low <= j <= high, prefix는 증가)"""
+    while low < high:
+        mid = (low + high + 1) // 2
+        if prefix[mid] <= value:
+            low = mid
+        else:
+            high = mid - 1
+    return low
+
+
+def _first_at_most(need, low, high, value):
+    """need[j] <= value인 가장 작은 j (need는 뒤로 갈수록 줄거나 같음), 없으면 high"""
+    while low < high:
+        mid = (low + high) // 2
+        if need[mid] <= value:
+            high = mid
+        else:
+            low = mid + 1
+    return low
+
+
+def _closest(prefix, low, high, target):
+    """low..high 중 prefix 값이 target에 가장 가까운 위치"""
+    j = _last_at_most(prefix, low, high, target)
+    if j < high and abs(prefix[j + 1] - target) < abs(prefix[j] - target):
+        return j + 1
+    return j
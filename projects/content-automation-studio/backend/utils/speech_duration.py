@@ -0,0 +1,120 @@
+import numpy as np
+from config import Config
+
+# 글자 종류
+OTHER, SPACE, HANGUL, KANA, HAN, LATIN, DIGIT, SENTENCE_END, CLAUSE, NEWLINE = range(10)
+PAUSE_CLASSES = (SPACE, SENTENCE_END, CLAUSE, NEWLINE)
+
+# 언어별 글자 종류당 발화 시간 (초, TTS 기본 속도 기준)
+# 한글/가나는 음절(모라) 단위, 한자는 평균 음절 수, 라틴 문자는 글자 단위, 문장부호는 쉼 길이
+LANGUAGE_PROFILES = {
+    'ko': {SPACE: 0.03, HANGUL: 0.15, KANA: 0.12, HAN: 0.30, LATIN: 0.07, DIGIT: 0.30,
+           SENTENCE_END: 0.50, CLAUSE: 0.25, NEWLINE: 0.70},
+    'ja': {SPACE: 0.00, HANGUL: 0.15, KANA: 0.125, HAN: 0.25, LATIN: 0.07, DIGIT: 0.30,
+           SENTENCE_END: 0.50, CLAUSE: 0.25, NEWLINE: 0.70},
+    'zh': {SPACE: 0.00, HANGUL: 0.15, KANA: 0.12, HAN: 0.22, LATIN: 0.07, DIGIT: 0.25,
+           SENTENCE_END: 0.45, CLAUSE: 0.20, NEWLINE: 0.60},
+    'en': {SPACE: 0.065, HANGUL: 0.15, KANA: 0.12, HAN: 0.30, LATIN: 0.065, DIGIT: 0.25,
+           SENTENCE_END: 0.45, CLAUSE: 0.20, NEWLINE: 0.60}
+}
+LANGUAGES = list(LANGUAGE_PROFILES)
+CLASS_COUNT = 10
+
+# 언어 × 글자 종류 가중치 행렬
+WEIGHTS = np.array(
+    [[LANGUAGE_PROFILES[language].get(cls, 0.0) for cls in range(CLASS_COUNT)] for language in LANGUAGES]
+)
+
+
+def _class_table():
+    """BMP 코드 포인트 → 글자 종류 조회 표"""
+    table = np.full(0x10000, OTHER, dtype=np.uint8)
+    table[0xAC00:0xD7A4] = HANGUL
+    table[0x1100:0x1200] = HANGUL
+    table[0x3131:0x318F] = HANGUL
+    table[0x3040:0x3100] = KANA
+    table[0x31F0:0x3200] = KANA
+    table[0xFF66:0xFF9E] = KANA
+    table[0x4E00:0xA000] = HAN
+    table[0x3400:0x4DC0] = HAN
+    table[ord('A'):ord('Z') + 1] = LATIN
+    table[ord('a'):ord('z') + 1] = LATIN
+    table[0xC0:0x250] = LATIN
+    table[0xFF21:0xFF3B] = LATIN
+    table[0xFF41:0xFF5B] = LATIN
+    table[ord('0'):ord('9') + 1] = DIGIT
+    table[0xFF10:0xFF1A] = DIGIT
+    for char in ' \t\u00a0\u3000':
+        table[ord(char)] = SPACE
+    for char in '.!?。！？…':
+        table[ord(char)] = SENTENCE_END
+    for char in ',;:、，；：·—':
+        table[ord(char)] = CLAUSE
+    table[ord('\n')] = NEWLINE
+    return table
+
+
+CLASS_TABLE = _class_table()
+
+
+def estimate_durations(texts, language=None, speaking_rate=None):
+    """텍스트 목록의 TTS 발화 시간 추정 (초, numpy 배열)
+
+    모든 텍스트를 코드 포인트 배열 하나로 이어 붙여 글자 종류별 개수를 한 번에 세고,
+    언어별 가중치 행렬과 곱한다. 연속된 문장부호/공백은 쉼 한 번으로 친다.
+    language: 'ko', 'ja', 'zh', 'en' 또는 'auto'(텍스트마다 문자 종류로 판별)
+    """
+    language = language or Config.TTS_LANGUAGE
+    speaking_rate = speaking_rate or Config.TTS_SPEAKING_RATE
+    if language != 'auto' and language not in LANGUAGE_PROFILES:
+        raise ValueError(f"Language must be one of: auto, {', '.join(LANGUAGES)}")
+
+    count = len(texts)
+    if count == 0:
+        return np.zeros(0)
+
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=count)
+    # surrogatepass: JSON '\ud800' 같은 짝 없는 서로게이트도 글자 하나(OTHER)로 (lengths와 위치 일치)
+    codes = np.frombuffer(''.join(texts).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    classes = np.where(codes < 0x10000, CLASS_TABLE[np.minimum(codes, 0xFFFF)], OTHER)
+
+    owners = np.repeat(np.arange(count), lengths)
+    if len(classes) > 1:
+        # 같은 텍스트 안에서 바로 앞 글자와 같은 쉼 종류면 세지 않음 ('...', '?!', 연속 공백)
+        repeated = (
+            (classes[1:] == classes[:-1]) & np.isin(classes[1:], PAUSE_CLASSES) & (owners[1:] == owners[:-1])
+        )
+        classes[1:][repeated] = OTHER
+
+    counts = np.bincount(owners * CLASS_COUNT + classes, minlength=count * CLASS_COUNT)
+    counts = counts.reshape(count, CLASS_COUNT)
+
+    if language == 'auto':
+        language_index = detect_languages(counts)
+    else:
+        language_index = np.full(count, LANGUAGES.index(language))
+
+    return (counts * WEIGHTS[language_index]).sum(axis=1) / speaking_rate
+
+
+def detect_languages(counts):
+    """글자 종류 개수(텍스트 × 종류)로 언어 판별 → LANGUAGES 인덱스 배열
+
+    한글이 있으면 ko, 가나가 있으면 ja, 한자만 있으면 zh, 그 밖에는 en
+    """
+    return np.select(
+        [counts[:, HANGUL] > 0, counts[:, KANA] > 0, counts[:, HAN] > 0],
+        [LANGUAGES.index('ko'), LANGUAGES.index('ja'), LANGUAGES.index('zh')],
+        default=LANGUAGES.index('en')
+    )
+
+
+def segment_timings(durations, start=0.0):
+    """세그먼트 길이 목록 → [{'start', 'end', 'duration'}] (이어 붙인 타임라인)"""
+    durations = np.asarray(durations, dtype=float)
+    ends = start + np.cumsum(durations)
+    starts = ends - durations
+    return [
+        {'start': round(float(s), 3), 'end': round(float(e), 3), 'duration': round(float(d), 3)}
+        for s, e, d in zip(starts, ends, durations)
+    ]
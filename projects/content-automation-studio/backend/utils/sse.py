@@ -0,0 +1,18 @@
+import json
+
+
+def format_sse(event, data):
+    """Server-Sent Events 메시지 한 건 생성 (data는 JSON 직렬화)"""
+    payload = json.dumps(data, ensure_ascii=False)
+    return f"event: {event}\ndata: {payload}\n\n"
+
+
+# 이벤트가 없을 때 연결 유지용 주석 (클라이언트는 무시, 끊긴 연결은 쓰기 실패로 감지)
+SSE_KEEPALIVE = ": keep-alive\n\n"
+
+
+# 프록시(nginx 등)가 응답을 모아두지 않도록 하는 헤더
+SSE_HEADERS = {
+    'Cache-Control': 'no-cache',
+    'X-Accel-Buffering': 'no'
+}
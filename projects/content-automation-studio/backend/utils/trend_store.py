@@ -0,0 +1,285 @@
+import csv
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+import numpy as np
+from config import Config
+
+# Google Trends timeframe → 일 수
+TIMEFRAME_DAYS = {
+    'now 7-d': 7,
+    'today 1-m': 30,
+    'today 3-m': 90,
+    'today 12-m': 365,
+    'today 5-y': 365 * 5
+}
+
+
+def timeframe_days(timeframe):
+    """timeframe 문자열의 일 수 (모르는 값이면 30일)"""
+    return TIMEFRAME_DAYS.get(timeframe, 30)
+
+
+def date_range(days, end=None):
+    """end(기본 오늘)까지 days일의 datetime64[D] 배열 (오래된 날짜부터)"""
+    end = np.datetime64(end or date.today(), 'D')
+    return end - np.arange(days - 1, -1, -1)
+
+
+class SimulatedTrendProvider:
+    """시뮬레이션 트렌드 (키워드/지역/기간/날짜별로 같은 값이 나오도록 시드 고정)"""
+
+    name = 'simulated'
+
+    def fetch(self, keyword, timeframe, geo):
+        days = timeframe_days(timeframe)
+        dates = date_range(days)
+        seed = hashlib.sha256(f"{keyword}\x00{timeframe}\x00{geo}\x00{dates[-1]}".encode('utf-8')).digest()
+        rng = np.random.default_rng(int.from_bytes(seed[:8], 'big'))
+
+        # 기준값 + 기울기(상승/하락/유지) + 잡음, 0~100 범위
+        level = rng.uniform(30, 70)
+        slope = rng.uniform(-40, 40) / days
+        t = np.arange(days) - (days - 1) / 2
+        values = np.clip(np.rint(level + slope * t + rng.normal(0, 8, days)), 0, 100)
+        return dates, values
+
+
+class FileTrendProvider:
+    """로컬 CSV 트렌드 ({root}/{geo}/{keyword}.csv, 'date,value' 행)
+
+    timeframe 기간에 해당하는 마지막 행들만 사용하며, 파일이 없으면 None.
+    """
+
+    name = 'file'
+
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, keyword, geo):
+        # 키워드/지역 값이 경로를 벗어나지 않도록
+        safe_geo, safe_name = (value.replace('/', '_').replace('\\', '_').lstrip('.') for value in (geo, keyword))
+        return os.path.join(self.root, safe_geo, f"{safe_name}.csv")
+
+    def fetch(self, keyword, timeframe, geo):
+        path = self.path(keyword, geo)
+        if not os.path.exists(path):
+            return None
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = [row for row in csv.reader(f) if len(row) >= 2 and row[0] != 'date']
+        if not rows:
+            return None
+
+        rows = sorted(rows)[-timeframe_days(timeframe):]
+        dates = np.array([row[0] for row in rows], dtype='datetime64[D]')
+        values = np.array([float(row[1]) for row in rows])
+        return dates, values
+
+
+def compute_aggregates(values, window):
+    """시계열 행렬(키워드 × 날짜)의 평균/최고/현재값, 이동 평균, 기울기(하루당 변화량)
+
+    1차원 배열이면 한 행으로 계산한다.
+    """
+    values = np.atleast_2d(np.asarray(values, dtype=float))
+    days = values.shape[1]
+
+    # 누적합으로 구간 평균 (앞쪽 window-1일은 있는 날짜만)
+    cumsum = np.cumsum(values, axis=1)
+    shifted = np.zeros_like(cumsum)
+    if days > window:
+        shifted[:, window:] = cumsum[:, :-window]
+    counts = np.minimum(np.arange(1, days + 1), window)
+    rolling = (cumsum - shifted) / counts
+
+    mean = values.mean(axis=1)
+    # 최소제곱 기울기: sum((t - t̄)(v - v̄)) / sum((t - t̄)²)
+    t = np.arange(days) - (days - 1) / 2
+    denominator = float((t * t).sum()) or 1.0
+    slope = (values - mean[:, None]) @ t / denominator
+
+    return {
+        'mean': mean,
+        'peak': values.max(axis=1),
+        'current': values[:, -1],
+        'rolling': rolling,
+        'slope': slope
+    }
+
+
+class TrendStore:
+    """(키워드, 기간, 지역)별 트렌드 시계열 + 미리 계산한 집계값 메모리 캐시 (TTL, LRU)
+
+    provider가 None을 반환하면 fallback(시뮬레이션) 데이터를 쓴다.
+    """
+
+    def __init__(self, provider, ttl, max_entries, rolling_window, fallback=None):
+        self.provider = provider
+        self.fallback = fallback or SimulatedTrendProvider()
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.rolling_window = rolling_window
+        self._entries = OrderedDict()  # (keyword, timeframe, geo) -> series
+        self._lock = threading.Lock()
+        self._stats = {'hits': 0, 'misses': 0, 'expirations': 0, 'evictions': 0}
+
+    def get(self, keyword, timeframe, geo):
+        """시계열 + 집계값 (TTL 안이면 메모리에서 바로 반환)"""
+        key = (keyword, timeframe, geo)
+        now = time.time()
+        with self._lock:
+            series = self._entries.get(key)
+            if series is not None:
+                if series['expires_at'] > now:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    return series
+                del self._entries[key]
+                self._stats['expirations'] += 1
+            self._stats['misses'] += 1
+
+        series = self._load([keyword], timeframe, geo, now)[0]
+        self._put([series])
+        return series
+
+    def get_many(self, keywords, timeframe, geo):
+        """여러 키워드의 시계열 + 집계값 (입력 순서대로, 캐시에 없는 것만 한 번에 불러와 행렬로 집계)"""
+        now = time.time()
+        results = [None] * len(keywords)
+        missing = []
+        with self._lock:
+            for i, keyword in enumerate(keywords):
+                key = (keyword, timeframe, geo)
+                series = self._entries.get(key)
+                if series is not None and series['expires_at'] <= now:
+                    del self._entries[key]
+                    self._stats['expirations'] += 1
+                    series = None
+                if series is None:
+                    missing.append(i)
+                    self._stats['misses'] += 1
+                else:
+                    self._entries.move_to_end(key)
+                    self._stats['hits'] += 1
+                    results[i] = series
+
+        if missing:
+            loaded = self._load([keywords[i] for i in missing], timeframe, geo, now)
+            for i, series in zip(missing, loaded):
+                results[i] = series
+            self._put(loaded)
+        return results
+
+    def _put(self, entries):
+        with self._lock:
+            for series in entries:
+                key = (series['keyword'], series['timeframe'], series['geo'])
+                self._entries[key] = series
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def _load(self, keywords, timeframe, geo, now):
+        """제공자에서 불러온 뒤 길이가 같은 시계열끼리 행렬 하나로 집계"""
+        fetched = []
+        for keyword in keywords:
+            source = self.provider
+            result = self.provider.fetch(keyword, timeframe, geo)
+            if result is None:
+                source = self.fallback
+                result = self.fallback.fetch(keyword, timeframe, geo)
+            fetched.append((source.name, *result))
+
+        entries = [None] * len(keywords)
+        groups = {}
+        for i, (_, _, values) in enumerate(fetched):
+            groups.setdefault(len(values), []).append(i)
+        for indexes in groups.values():
+            aggregates = compute_aggregates(np.stack([fetched[i][2] for i in indexes]), self.rolling_window)
+            aggregates['rolling'].flags.writeable = False
+            for row, i in enumerate(indexes):
+                source, dates, values = fetched[i]
+                entries[i] = self._build(keywords[i], timeframe, geo, source, dates, values, aggregates, row, now)
+        return entries
+
+    def _build(self, keyword, timeframe, geo, source, dates, values, aggregates, row, now):
+        # 캐시된 배열을 여러 요청이 공유하므로 읽기 전용으로
+        for array in (dates, values):
+            array.flags.writeable = False
+        series = {
+            'keyword': keyword,
+            'timeframe': timeframe,
+            'geo': geo,
+            'source': source,
+            'dates': dates,
+            'values': values,
+            'mean': float(aggregates['mean'][row]),
+            'peak': float(aggregates['peak'][row]),
+            'current': float(aggregates['current'][row]),
+            'rolling': aggregates['rolling'][row],
+            'slope': float(aggregates['slope'][row]),
+            'fetched_at': now,
+            'expires_at': now + self.ttl
+        }
+        # API 응답용 목록도 한 번만 만든다
+        series['payload'] = {
+            'dates': np.datetime_as_string(dates, unit='D').tolist(),
+            'values': [int(value) if float(value).is_integer() else float(value) for value in values],
+            'average': series['mean'],
+            'peak': series['peak'],
+            'current': series['current'],
+            'rolling_average': np.round(series['rolling'], 2).tolist(),
+            'rolling_window': self.rolling_window,
+            'slope': round(series['slope'], 4),
+            'source': source
+        }
+        return series
+
+    def invalidate(self, keyword=None):
+        """캐시 비우기 (keyword를 주면 그 키워드만)"""
+        with self._lock:
+            if keyword is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == keyword]:
+                    del self._entries[key]
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats['entries'] = len(self._entries)
+        stats['max_entries'] = self.max_entries
+        stats['provider'] = self.provider.name
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_ratio'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+def get_trend_provider():
+    """TREND_PROVIDER 설정에 맞는 데이터 제공자"""
+    if Config.TREND_PROVIDER == 'file':
+        return FileTrendProvider(Config.TREND_DATA_DIR)
+    return SimulatedTrendProvider()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_trend_store():
+    """프로세스 공유 트렌드 시계열 캐시"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = TrendStore(
+                    get_trend_provider(),
+                    ttl=Config.TREND_CACHE_TTL,
+                    max_entries=Config.TREND_CACHE_MAX_ENTRIES,
+                    rolling_window=Config.TREND_ROLLING_WINDOW
+                )
+    return _store
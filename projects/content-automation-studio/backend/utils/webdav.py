@@ -1,98 +1,358 @@
-import webdavclient
+import hashlib
 import requests
-from urllib.parse import urljoin
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote, unquote, urlparse
 import os
-import tempfile
+import threading
+import time
 import uuid
+import xml.etree.ElementTree as ET
 from datetime import datetime
+from email.utils import parsedate_to_datetime
 from config import Config
+from utils.content_index import get_content_index
+from utils.file_index import get_file_index
+from utils.render_cache import get_render_cache
+from utils.downloader import download_to_file
+
+DAV_NS = '{DAV:}'
+
+PROPFIND_BODY = (
+    '<?xml version="1.0" encoding="utf-8"?>'
+    '<d:propfind xmlns:d="DAV:"><d:prop>'
+    '<d:resourcetype/><d:getcontentlength/><d:getlastmodified/><d:getetag/>'
+    '</d:prop></d:propfind>'
+)
+
+
+class WebDAVError(Exception):
+    """WebDAV 요청 실패 (status에 HTTP 상태 코드)"""
+
+    def __init__(self, message, status=None):
+        super().__init__(message)
+        self.status = status
+
+
+class ChecksumError(Exception):
+    """업로드 내용이 클라이언트가 보낸 SHA-256과 다름"""
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """로컬 파일 SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class HashingReader:
+    """읽는 대로 바이트 수와 SHA-256을 계산하는 업로드 본문 (requests에 iterable로 전달)"""
+
+    def __init__(self, stream, content_length=None, chunk_size=256 * 1024):
+        self.stream = stream
+        self.content_length = content_length
+        self.chunk_size = chunk_size
+        self.size = 0
+        self._hash = hashlib.sha256()
+        try:
+            self._start = stream.tell()
+        except (AttributeError, OSError, ValueError):
+            self._start = None
+
+    def __iter__(self):
+        while True:
+            chunk = self.stream.read(self.chunk_size)
+            if not chunk:
+                break
+            self.size += len(chunk)
+            self._hash.update(chunk)
+            yield chunk
+
+    def __len__(self):
+        # 길이를 알면 Content-Length, 모르면(0) chunked 전송
+        return self.content_length or 0
+
+    def rewind(self):
+        """재전송을 위해 처음으로 되돌리기 (되돌릴 수 없는 스트림이면 False)"""
+        if self._start is None:
+            return False
+        try:
+            self.stream.seek(self._start)
+        except (AttributeError, OSError, ValueError):
+            return False
+        self.size = 0
+        self._hash = hashlib.sha256()
+        return True
+
+    def hexdigest(self):
+        return self._hash.hexdigest()
+
 
 class WebDAVManager:
-    def __init__(self):
+    """WebDAV 클라이언트 (keep-alive 연결 풀을 쓰는 requests 세션 기반)"""
+
+    def __init__(self, pool_size=None, timeout=None, transfer_timeout=None):
         self.webdav_url = Config.WEBDAV_URL
         self.username = Config.WEBDAV_USERNAME
         self.password = Config.WEBDAV_PASSWORD
-        self.client = None
+        self.pool_size = pool_size or Config.WEBDAV_POOL_SIZE
+        self.timeout = timeout or Config.WEBDAV_TIMEOUT  # PROPFIND/MKCOL/DELETE 등 메타데이터 요청
+        self.transfer_timeout = transfer_timeout or Config.WEBDAV_TRANSFER_TIMEOUT  # PUT/GET 파일 전송
+        self._base_path = urlparse(self.webdav_url).path.rstrip('/')
+        self._session = None
+        self._session_lock = threading.Lock()
+        self._session_pid = None
+        self.last_check = None
+        # 존재가 확인된 폴더 (중복 MKCOL 방지, PUT 409 시 무효화)
+        self._known_folders = set()
+        self._folders_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """연결 풀 세션 (fork 이후 자식 프로세스에서는 새로 생성)"""
+        if self._session is None or self._session_pid != os.getpid():
+            with self._session_lock:
+                if self._session is None or self._session_pid != os.getpid():
+                    session = requests.Session()
+                    session.auth = (self.username, self.password)
+                    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size, max_retries=1)
+                    session.mount('http://', adapter)
+                    session.mount('https://', adapter)
+                    self._session = session
+                    self._session_pid = os.getpid()
+        return self._session
+
+    def _url(self, remote_path):
+        return self.webdav_url.rstrip('/') + quote('/' + remote_path.lstrip('/'))
+
+    def _request(self, method, remote_path, timeout=None, **kwargs):
+        return self.session.request(method, self._url(remote_path), timeout=timeout or self.timeout, **kwargs)
 
     def connect(self):
-        """WebDAV 연결"""
-        try:
-            self.client = webdavclient.Client(
-                url=self.webdav_url,
-                username=self.username,
-                password=self.password
-            )
+        """WebDAV 연결 (연결 풀 준비 + 연결 확인)"""
+        if self.check_connection():
             print("✅ WebDAV 연결 성공")
             return True
-        except Exception as e:
-            print(f"❌ WebDAV 연결 실패: {e}")
-            return False
+        print(f"❌ WebDAV 연결 실패: {self.last_check['error']}")
+        return False
+
+    def check_connection(self, timeout=None):
+        """루트 PROPFIND(Depth 0)로 연결 상태 확인 (지연 시간/오류 기록)"""
+        started = time.monotonic()
+        error = None
+        try:
+            response = self._request(
+                'PROPFIND', '/', timeout=timeout, data=PROPFIND_BODY,
+                headers={'Depth': '0', 'Content-Type': 'application/xml'}
+            )
+            if response.status_code not in (200, 207):
+                error = f"HTTP {response.status_code}"
+        except requests.RequestException as e:
+            error = str(e)
+
+        self.last_check = {
+            'ok': error is None,
+            'latency_ms': round((time.monotonic() - started) * 1000, 1),
+            'error': error,
+            'checked_at': time.time()
+        }
+        return error is None
 
-    def upload_file(self, local_path, remote_path=None):
+    def upload_file(self, local_path, remote_path=None, dedup=None):
         """파일 업로드"""
+        dedup = Config.WEBDAV_DEDUP_ENABLED if dedup is None else dedup
+        try:
+            # 내용 해시 모드: 로컬에서 먼저 해시를 구해 이미 있는 내용이면 전송 생략
+            digest = file_sha256(local_path) if dedup and not remote_path else None
+            with open(local_path, 'rb') as f:
+                return self.upload_stream(
+                    f, os.path.basename(local_path), remote_path=remote_path,
+                    content_length=os.path.getsize(local_path), digest=digest, dedup=dedup
+                )
+        except OSError as e:
+            print(f"❌ 파일 업로드 실패: {e}")
+            return {'success': False, 'error': str(e)}
+
+    def upload_stream(self, stream, filename, remote_path=None, content_length=None, digest=None,
+                      expected_sha256=None, dedup=None):
+        """스트림을 임시 파일 없이 바로 PUT으로 업로드 (전송하면서 크기/SHA-256 계산)
+
+        content_length를 모르면 chunked 전송을 사용한다. dedup(기본값 WEBDAV_DEDUP_ENABLED)이면
+        내용 해시 경로에 저장하며, 서버가 직접 계산한 digest로 이미 저장된 내용이면 전송하지 않는다.
+        expected_sha256(클라이언트가 보낸 값)은 믿지 않고 전송한 내용의 해시와 비교만 한다
+        (다르면 올린 사본을 지우고 status 400 실패).
+        """
+        dedup = Config.WEBDAV_DEDUP_ENABLED if dedup is None else dedup
         try:
-            if not self.client:
-                self.connect()
+            if dedup and not remote_path:
+                return self._upload_deduplicated(stream, filename, content_length, digest, expected_sha256)
 
             if not remote_path:
-                # 고유 파일명 생성
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                unique_id = str(uuid.uuid4())[:8]
-                filename = os.path.basename(local_path)
-                name, ext = os.path.splitext(filename)
-                remote_filename = f"{timestamp}_{unique_id}_{name}{ext}"
-
-                # 월별 폴더 구조
-                folder_path = f"/uploads/{datetime.now().strftime('%Y/%m')}"
-                remote_path = f"{folder_path}/{remote_filename}"
-
-                # 폴더 생성
+                folder_path, remote_path = self._unique_remote_path(filename)
+
+                # 폴더 생성 (이미 확인된 폴더면 요청 없음)
                 self.create_folder(folder_path)
 
-            self.client.upload_sync(local_path, remote_path)
+            body = HashingReader(stream, content_length)
+            self._put(remote_path, body)
+            self._verify_checksum(remote_path, body, expected_sha256)
+            get_file_index().record_file(remote_path, body.size)
+
             public_url = f"{self.webdav_url}{remote_path}"
             print(f"✅ 파일 업로드 성공: {public_url}")
             return {
                 'success': True,
                 'url': public_url,
-                'remote_path': remote_path
+                'remote_path': remote_path,
+                'size': body.size,
+                'sha256': body.hexdigest()
             }
+        except ChecksumError as e:
+            print(f"❌ 파일 업로드 실패: {e}")
+            return {'success': False, 'error': str(e), 'status': 400}
         except Exception as e:
             print(f"❌ 파일 업로드 실패: {e}")
             return {'success': False, 'error': str(e)}
 
-    def download_file(self, remote_path, local_path):
-        """파일 다운로드"""
-        try:
-            if not self.client:
-                self.connect()
+    def _upload_deduplicated(self, stream, filename, content_length, digest, expected_sha256=None):
+        """내용 해시 경로({objects}/ab/cd/<sha256><ext>)에 저장 (같은 내용은 한 번만 저장)
+
+        digest는 서버가 계산한 값일 때만 넘긴다 (색인에 있으면 전송 없이 참조만 추가).
+        """
+        index = get_content_index()
+        if digest:
+            entry = index.add_ref(digest.lower())
+            if entry:
+                print(f"✅ 중복 내용, 전송 생략: {entry['remote_path']}")
+                return self._object_result(entry, deduplicated=True)
+
+        # 해시를 모르면 임시 경로로 전송하면서 해시 계산
+        ext = os.path.splitext(filename)[1].lower()
+        objects_root = Config.WEBDAV_OBJECTS_ROOT.rstrip('/')
+        incoming_path = f"{objects_root}/incoming/{uuid.uuid4().hex}{ext}"
+        self.create_folder(os.path.dirname(incoming_path))
+        body = HashingReader(stream, content_length)
+        self._put(incoming_path, body)
+        self._verify_checksum(incoming_path, body, expected_sha256)
+        digest = body.hexdigest()
+
+        entry = index.add_ref(digest)
+        if entry:
+            # 이미 저장된 내용: 방금 올린 사본은 삭제
+            self._request('DELETE', incoming_path)
+            return self._object_result(entry, deduplicated=True)
+
+        object_path = f"{objects_root}/{digest[:2]}/{digest[2:4]}/{digest}{ext}"
+        self.create_folder(os.path.dirname(object_path))
+        self._move(incoming_path, object_path)
+        entry = index.insert(digest, object_path, body.size)
+        if entry['remote_path'] != object_path:
+            # 동시에 같은 내용이 다른 확장자로 먼저 등록된 경우
+            self._request('DELETE', object_path)
+        else:
+            get_file_index().record_file(object_path, body.size)
+        print(f"✅ 파일 업로드 성공: {self.webdav_url}{entry['remote_path']}")
+        return self._object_result(entry, deduplicated=entry['remote_path'] != object_path)
+
+    def _object_result(self, entry, deduplicated):
+        return {
+            'success': True,
+            'url': f"{self.webdav_url}{entry['remote_path']}",
+            'remote_path': entry['remote_path'],
+            'size': entry['size'],
+            'sha256': entry['digest'],
+            'deduplicated': deduplicated
+        }
+
+    def _verify_checksum(self, remote_path, body, expected_sha256):
+        """전송한 내용의 해시가 클라이언트 값과 다르면 올린 사본을 지우고 ChecksumError"""
+        if expected_sha256 and body.hexdigest() != expected_sha256.strip().lower():
+            self._request('DELETE', remote_path)
+            raise ChecksumError('Content checksum mismatch')
+
+    def _put(self, remote_path, body):
+        """PUT 전송 (409면 상위 폴더 캐시를 무효화하고 다시 만든 뒤 한 번 재시도)"""
+        response = self._request('PUT', remote_path, timeout=self.transfer_timeout, data=body)
+        if response.status_code == 409:
+            folder_path = os.path.dirname(remote_path.rstrip('/'))
+            # 어느 단계의 폴더가 지워졌는지 모르므로 조상 폴더까지 모두 잊고 위에서부터 다시 MKCOL
+            self.forget_folder(folder_path, ancestors=True)
+            if self.create_folder(folder_path) and body.rewind():
+                response = self._request('PUT', remote_path, timeout=self.transfer_timeout, data=body)
+        if response.status_code not in (200, 201, 204):
+            raise WebDAVError(f"PUT failed: HTTP {response.status_code}", response.status_code)
+
+    def _move(self, source_path, destination_path):
+        response = self._request(
+            'MOVE', source_path, headers={'Destination': self._url(destination_path), 'Overwrite': 'T'}
+        )
+        if response.status_code not in (201, 204):
+            raise WebDAVError(f"MOVE failed: HTTP {response.status_code}", response.status_code)
 
-            self.client.download_sync(remote_path, local_path)
+    def release_file(self, remote_path):
+        """참조 수 기반 삭제 (내용 해시 저장 객체는 마지막 참조가 해제될 때만 원격 삭제)"""
+        released = None
+        if remote_path.startswith(Config.WEBDAV_OBJECTS_ROOT.rstrip('/') + '/'):
+            released = get_content_index().release(remote_path)
+        if released is False:
+            return {'success': True, 'deleted': False}
+
+        deleted = self.delete_file(remote_path)
+        return {'success': deleted, 'deleted': deleted}
+
+    def _unique_remote_path(self, filename):
+        """(월별 폴더, 고유 원격 경로) 생성"""
+        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+        unique_id = str(uuid.uuid4())[:8]
+        name, ext = os.path.splitext(os.path.basename(filename))
+        remote_filename = f"{timestamp}_{unique_id}_{name}{ext}"
+
+        # 월별 폴더 구조
+        folder_path = f"/uploads/{datetime.now().strftime('%Y/%m')}"
+        return folder_path, f"{folder_path}/{remote_filename}"
+
+    def download_file(self, remote_path, local_path, use_cache=True):
+        """파일 다운로드 (자산 캐시를 거쳐 같은 파일은 재검증만)"""
+        result = download_to_file(
+            self._url(remote_path), local_path, timeout=self.transfer_timeout,
+            use_cache=use_cache, session=self.session
+        )
+        if result['success']:
             print(f"✅ 파일 다운로드 성공: {local_path}")
             return True
-        except Exception as e:
-            print(f"❌ 파일 다운로드 실패: {e}")
-            return False
+        print(f"❌ 파일 다운로드 실패: {result['error']}")
+        return False
 
     def list_files(self, path="/"):
-        """파일 목록 조회"""
+        """파일 목록 조회 (이름 목록, 폴더는 '/'로 끝남)"""
         try:
-            if not self.client:
-                self.connect()
-
-            files = self.client.list(path)
-            return files
+            folder = '/' + path.strip('/')
+            entries = self._propfind(path, depth=1)
+            return [entry['name'] + ('/' if entry['is_directory'] else '')
+                    for entry in entries if entry['path'] != folder]
         except Exception as e:
             print(f"❌ 파일 목록 조회 실패: {e}")
             return []
 
+    def list_entries(self, path="/"):
+        """Depth:1 PROPFIND 한 번으로 하위 항목 메타데이터(이름/크기/수정 시각/종류) 조회 후 색인 갱신"""
+        folder = '/' + path.strip('/')
+        entries = [entry for entry in self._propfind(path, depth=1) if entry['path'] != folder]
+        get_file_index().replace_folder(folder, entries)
+        return entries
+
     def delete_file(self, remote_path):
         """파일 삭제"""
         try:
-            if not self.client:
-                self.connect()
-
-            self.client.unlink(remote_path)
+            response = self._request('DELETE', remote_path)
+            if response.status_code not in (200, 204):
+                raise WebDAVError(f"DELETE failed: HTTP {response.status_code}", response.status_code)
+            self.forget_folder(remote_path)
+            get_file_index().remove(remote_path)
+            render_cache = get_render_cache()
+            if render_cache is not None:
+                render_cache.forget_path(remote_path)
             print(f"✅ 파일 삭제 성공: {remote_path}")
             return True
         except Exception as e:
@@ -100,35 +360,114 @@ class WebDAVManager:
             return False
 
     def create_folder(self, folder_path):
-        """폴더 생성"""
-        try:
-            if not self.client:
-                self.connect()
+        """폴더 생성 (없는 상위 폴더도 위에서부터 순서대로 생성, 확인된 폴더는 건너뜀)"""
+        parts = [part for part in folder_path.split('/') if part]
+        paths = ['/' + '/'.join(parts[:i + 1]) for i in range(len(parts))]
+        with self._folders_lock:
+            missing = [path for path in paths if path not in self._known_folders]
 
-            self.client.mkdir(folder_path)
-            print(f"✅ 폴더 생성 성공: {folder_path}")
+        try:
+            for path in missing:
+                response = self._request('MKCOL', path)
+                # 405: 폴더가 이미 존재하면 성공으로 처리
+                if response.status_code not in (201, 405):
+                    raise WebDAVError(f"MKCOL failed: HTTP {response.status_code}", response.status_code)
+                if response.status_code == 201:
+                    get_file_index().record_file(path, 0, is_directory=True)
+                    print(f"✅ 폴더 생성 성공: {path}")
+                with self._folders_lock:
+                    self._known_folders.add(path)
             return True
         except Exception as e:
-            # 폴더가 이미 존재하면 성공으로 처리
-            if "already exists" in str(e).lower():
-                return True
             print(f"❌ 폴더 생성 실패: {e}")
             return False
 
+    def forget_folder(self, folder_path, ancestors=False):
+        """폴더와 하위 폴더를 확인된 폴더 캐시에서 제거 (ancestors면 상위 폴더도)"""
+        folder = '/' + folder_path.strip('/')
+        with self._folders_lock:
+            self._known_folders = {
+                path for path in self._known_folders
+                if path != folder and not path.startswith(folder.rstrip('/') + '/')
+                and not (ancestors and folder.startswith(path.rstrip('/') + '/'))
+            }
+
     def get_file_info(self, remote_path):
         """파일 정보 조회"""
         try:
-            if not self.client:
-                self.connect()
-
-            info = self.client.info(remote_path)
-            return {
-                'name': info.name,
-                'size': info.size,
-                'modified': info.modified,
-                'is_directory': info.is_dir(),
-                'path': info.path
-            }
+            entries = self._propfind(remote_path, depth=0)
+            return entries[0] if entries else None
         except Exception as e:
             print(f"❌ 파일 정보 조회 실패: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def exists(self, remote_path):
+        """원격 파일 존재 여부 (404면 False, 그 밖의 실패는 WebDAVError)"""
+        response = self._request(
+            'PROPFIND', remote_path, data=PROPFIND_BODY,
+            headers={'Depth': '0', 'Content-Type': 'application/xml'}
+        )
+        if response.status_code == 404:
+            return False
+        if response.status_code != 207:
+            raise WebDAVError(f"PROPFIND failed: HTTP {response.status_code}", response.status_code)
+        return True
+
+    def _propfind(self, remote_path, depth):
+        """PROPFIND 응답을 항목 dict 목록으로 (Depth 1이면 요청 경로 자신도 포함)"""
+        response = self._request(
+            'PROPFIND', remote_path, data=PROPFIND_BODY,
+            headers={'Depth': str(depth), 'Content-Type': 'application/xml'}
+        )
+        if response.status_code != 207:
+            raise WebDAVError(f"PROPFIND failed: HTTP {response.status_code}", response.status_code)
+        return [self._parse_entry(node) for node in ET.fromstring(response.content).iter(f'{DAV_NS}response')]
+
+    def _parse_entry(self, node):
+        href = unquote(urlparse(node.findtext(f'{DAV_NS}href', '')).path)
+        # 서버 URL의 기본 경로(/dav)를 떼어낸 원격 경로
+        path = href[len(self._base_path):] if href.startswith(self._base_path) else href
+        prop = node.find(f'{DAV_NS}propstat/{DAV_NS}prop')
+        is_directory = prop is not None and prop.find(f'{DAV_NS}resourcetype/{DAV_NS}collection') is not None
+        size = prop.findtext(f'{DAV_NS}getcontentlength') if prop is not None else None
+        modified = prop.findtext(f'{DAV_NS}getlastmodified') if prop is not None else None
+        etag = prop.findtext(f'{DAV_NS}getetag') if prop is not None else None
+        try:
+            modified = parsedate_to_datetime(modified).isoformat() if modified else None
+        except (TypeError, ValueError):
+            pass
+
+        path = path.rstrip('/') or '/'
+        return {
+            'name': os.path.basename(path) or '/',
+            'size': int(size) if size and size.isdigit() else 0,
+            'modified': modified,
+            'etag': etag,
+            'is_directory': is_directory,
+            'path': path
+        }
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_webdav_manager():
+    """프로세스 공유 WebDAVManager (연결 풀 재사용)"""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = WebDAVManager()
+    return _manager
+
+
+def _reset_after_fork():
+    global _manager, _manager_lock
+    # 부모의 소켓/락을 물려받지 않도록 자식 프로세스에서 새로 생성
+    _manager_lock = threading.Lock()
+    _manager = None
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_reset_after_fork)